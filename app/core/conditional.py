@@ -0,0 +1,55 @@
+# app/core/conditional.py
+import hashlib
+from datetime import datetime
+from typing import Iterable, Mapping, Optional
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+CACHE_CONTROL_HEADER = "Cache-Control"
+
+def _version(updated_at: Optional[datetime]) -> str:
+    # Rows written before updated_at had a server default have no version yet
+    return updated_at.isoformat() if updated_at is not None else "-"
+
+def row_etag(row_id: int, updated_at: Optional[datetime]) -> str:
+    """Strong ETag for a single row; updated_at changes on every write"""
+    digest = hashlib.blake2b(f"{row_id}:{_version(updated_at)}".encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def rows_etag(rows: Iterable) -> str:
+    """
+    Strong ETag for a page of rows, from each row's id and updated_at in
+    order, so an edit, insert or delete within the page changes it.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(f"{row.id}:{_version(row.updated_at)};".encode())
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names this ETag (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+def set_validators(response: Response, etag: str, cache_control: str):
+    response.headers[ETAG_HEADER] = etag
+    if cache_control:
+        response.headers[CACHE_CONTROL_HEADER] = cache_control
+
+def not_modified(etag: str, cache_control: str, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Empty 304 carrying the headers the 200 would have had. Pass the injected
+    Response's headers along, since FastAPI only merges them into responses
+    it builds.
+    """
+    response = Response(status_code=304, headers=dict(headers) if headers else None)
+    set_validators(response, etag, cache_control)
+    return response
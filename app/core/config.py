@@ -20,10 +20,53 @@ class Settings(BaseSettings):
     
     DATABASE_URL: Optional[PostgresDsn] = None
     
+    # Use the asyncpg-backed AsyncSession and async routers instead of the sync ones
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "False").lower() == "true"
+    
+    # Connection Pool Configuration
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    # Total connection budget shared by all worker processes (0 = no cap)
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # Pool telemetry thresholds
+    DB_POOL_WAIT_WARN_MS: float = float(os.getenv("DB_POOL_WAIT_WARN_MS", "100"))
+    DB_POOL_USAGE_WARN_RATIO: float = float(os.getenv("DB_POOL_USAGE_WARN_RATIO", "0.8"))
+    
     @property
     def get_database_url(self) -> str:
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
     
+    @property
+    def get_async_database_url(self) -> str:
+        return str(self.DATABASE_URL).replace("postgresql://", "postgresql+asyncpg://", 1)
+    
+    # Serve list endpoints as projected rows encoded with orjson, skipping response_model validation
+    FAST_JSON_ENABLED: bool = os.getenv("FAST_JSON_ENABLED", "False").lower() == "true"
+    
+    # HTTP Caching Configuration: Cache-Control per route; ETags are always sent
+    CACHE_CONTROL_NGO_LIST: str = os.getenv("CACHE_CONTROL_NGO_LIST", "public, max-age=15")
+    CACHE_CONTROL_NGO_DETAIL: str = os.getenv("CACHE_CONTROL_NGO_DETAIL", "public, max-age=60")
+    # Donations carry donor details: shared caches must not store them, clients always revalidate
+    CACHE_CONTROL_DONATION_DETAIL: str = os.getenv("CACHE_CONTROL_DONATION_DETAIL", "private, no-cache")
+    
+    # Bulk Create Configuration
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+    BULK_INSERT_CHUNK_SIZE: int = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "1000"))
+    
+    # Auto-Matching Configuration
+    AUTO_MATCH_MAX_DISTANCE_KM: float = float(os.getenv("AUTO_MATCH_MAX_DISTANCE_KM", "50"))
+    # Nearest compatible NGOs considered per donation in the first round
+    AUTO_MATCH_CANDIDATES: int = int(os.getenv("AUTO_MATCH_CANDIDATES", "16"))
+    
+    # Donation Stats Configuration
+    # Each API worker folds pending stats deltas into the summaries this often; 0 disables,
+    # and then `python -m app.services.stats_service --rollup --interval N` must run instead
+    DONATION_STATS_ROLLUP_INTERVAL_SECONDS: float = float(os.getenv("DONATION_STATS_ROLLUP_INTERVAL_SECONDS", "10"))
+    
     # Email Configuration
     EMAIL_ENABLED: bool = os.getenv("EMAIL_ENABLED", "False").lower() == "true"
     EMAIL_FROM: EmailStr = os.getenv("EMAIL_FROM", "noreply@donationapp.com")
@@ -32,10 +75,91 @@ class Settings(BaseSettings):
     SMTP_USER: Optional[str] = os.getenv("SMTP_USER")
     SMTP_PASSWORD: Optional[str] = os.getenv("SMTP_PASSWORD")
     SMTP_TLS: bool = os.getenv("SMTP_TLS", "True").lower() == "true"
+    # Long-lived connections, one per outbox worker thread
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "500"))
+    SMTP_IDLE_TIMEOUT_SECONDS: float = float(os.getenv("SMTP_IDLE_TIMEOUT_SECONDS", "60"))
+    SMTP_TIMEOUT_SECONDS: float = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+    SMTP_MAX_RETRIES: int = int(os.getenv("SMTP_MAX_RETRIES", "5"))
+    SMTP_BACKOFF_BASE_SECONDS: float = float(os.getenv("SMTP_BACKOFF_BASE_SECONDS", "1"))
+    SMTP_BACKOFF_MAX_SECONDS: float = float(os.getenv("SMTP_BACKOFF_MAX_SECONDS", "60"))
+    
+    # Notification Outbox Worker Configuration
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_CONCURRENCY: int = int(os.getenv("OUTBOX_CONCURRENCY", "4"))
+    OUTBOX_POLL_INTERVAL_SECONDS: float = float(os.getenv("OUTBOX_POLL_INTERVAL_SECONDS", "1"))
+    # A claimed row becomes claimable again after this long if its worker dies
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+    OUTBOX_BACKOFF_BASE_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "30"))
+    OUTBOX_BACKOFF_MAX_SECONDS: float = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+    # Gather an NGO's assignment emails into one digest once the oldest has waited this long; 0 sends each at once
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: float = float(os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", "0"))
     
     # Nominatim API Configuration
     NOMINATIM_USER_AGENT: str = "DonationApp/1.0"
-    NOMINATIM_BASE_URL: str = "https://nominatim.openstreetmap.org"
+    NOMINATIM_BASE_URL: str = os.getenv("NOMINATIM_BASE_URL", "https://nominatim.openstreetmap.org")
+    NOMINATIM_TIMEOUT_SECONDS: float = float(os.getenv("NOMINATIM_TIMEOUT_SECONDS", "10"))
+    NOMINATIM_MAX_CONNECTIONS: int = int(os.getenv("NOMINATIM_MAX_CONNECTIONS", "10"))
+    NOMINATIM_MAX_CONCURRENCY: int = int(os.getenv("NOMINATIM_MAX_CONCURRENCY", "2"))
+    # Upstream rate limit (Nominatim's public policy is 1 request/second); 0 disables
+    NOMINATIM_RATE_PER_SECOND: float = float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1"))
+    NOMINATIM_BURST: float = float(os.getenv("NOMINATIM_BURST", "1"))
+    # Longest an interactive lookup waits for a rate-limit token before answering 503
+    NOMINATIM_MAX_WAIT_SECONDS: float = float(os.getenv("NOMINATIM_MAX_WAIT_SECONDS", "5"))
+    
+    # Background Geocoding Queue Configuration
+    GEOCODE_QUEUE_ENABLED: bool = os.getenv("GEOCODE_QUEUE_ENABLED", "False").lower() == "true"
+    GEOCODE_QUEUE_WRITE_BATCH: int = int(os.getenv("GEOCODE_QUEUE_WRITE_BATCH", "100"))
+    GEOCODE_VERIFY_MAX_DISTANCE_M: float = float(os.getenv("GEOCODE_VERIFY_MAX_DISTANCE_M", "1000"))
+    
+    # Reverse Geocoding Cache Configuration
+    GEOCODE_CACHE_PRECISION: int = int(os.getenv("GEOCODE_CACHE_PRECISION", "4"))
+    GEOCODE_CACHE_MAX_ENTRIES: int = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "50000"))
+    GEOCODE_CACHE_TTL_SECONDS: int = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    GEOCODE_CACHE_NEGATIVE_TTL_SECONDS: int = int(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_SECONDS", "300"))
+    GEOCODE_CACHE_SQLITE_PATH: Optional[str] = os.getenv("GEOCODE_CACHE_SQLITE_PATH")
+    
+    # Offline Reverse Geocoding Configuration
+    # GeoNames dump (.txt/.tsv) or CSV with latitude/longitude columns; unset disables.
+    # State, county and country names of a GeoNames dump come from admin1CodesASCII.txt,
+    # admin2Codes.txt and countryInfo.txt in the same directory
+    GAZETTEER_PATH: Optional[str] = os.getenv("GAZETTEER_PATH")
+    # Farther than this from every known place falls back to Nominatim
+    GAZETTEER_MAX_DISTANCE_KM: float = float(os.getenv("GAZETTEER_MAX_DISTANCE_KM", "5"))
+    
+    # Vector Tile Configuration (GET /tiles/{z}/{x}/{y}.mvt)
+    TILE_MAX_ZOOM: int = int(os.getenv("TILE_MAX_ZOOM", "22"))
+    TILE_EXTENT: int = int(os.getenv("TILE_EXTENT", "4096"))
+    # Pixels (in tile units) drawn past the edge so markers are not cut off between tiles
+    TILE_BUFFER: int = int(os.getenv("TILE_BUFFER", "64"))
+    # Cap per layer and tile, so a low-zoom tile costs the same as any other; denser
+    # tiles keep the rows with the lowest ids and drop the rest (zoom in to see them)
+    TILE_MAX_FEATURES: int = int(os.getenv("TILE_MAX_FEATURES", "5000"))
+    CACHE_CONTROL_TILES: str = os.getenv("CACHE_CONTROL_TILES", "public, max-age=60")
+    
+    # Response Cache Configuration (GET /ngos/, /ngos/nearby/, /donations/ and vector tiles)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "False").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+    # Other workers' memory tiers may serve a response this long after a write
+    RESPONSE_CACHE_MEMORY_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_MEMORY_TTL_SECONDS", "10"))
+    # Optional shared tier: any Redis-protocol server, e.g. redis://localhost:6379/0
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = os.getenv("RESPONSE_CACHE_REDIS_URL")
+    RESPONSE_CACHE_SHARED_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_SHARED_TTL_SECONDS", "120"))
+    # Nearby searches always run on the requested point. 0 keys them on it exactly; a positive grid
+    # (0.001 degrees is about 110 m) lets a cell share one entry, so hits may be computed from a
+    # point up to half a cell away, shifting distances and radius edges by that much
+    RESPONSE_CACHE_GRID_DEGREES: float = float(os.getenv("RESPONSE_CACHE_GRID_DEGREES", "0"))
+    
+    # Clustered Nearby Search Configuration (GET /ngos/nearby/clusters)
+    # Cells per 256 px map tile width, i.e. about 64 px per cluster
+    NEARBY_CLUSTER_CELLS_PER_TILE: int = int(os.getenv("NEARBY_CLUSTER_CELLS_PER_TILE", "4"))
+    # Upper bound on the cells covering one search, so the payload size is bounded
+    NEARBY_CLUSTER_MAX_CELLS: int = int(os.getenv("NEARBY_CLUSTER_MAX_CELLS", "1024"))
+    
+    # NGO Catalog Cache Configuration
+    NGO_CATALOG_ENABLED: bool = os.getenv("NGO_CATALOG_ENABLED", "False").lower() == "true"
+    NGO_CATALOG_MAX_AGE_SECONDS: int = int(os.getenv("NGO_CATALOG_MAX_AGE_SECONDS", "300"))
+    NGO_CATALOG_CELL_DEGREES: float = float(os.getenv("NGO_CATALOG_CELL_DEGREES", "0.5"))
     
     class Config:
         case_sensitive = True
@@ -1,15 +1,55 @@
 # app/core/database.py
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_metrics
+
+def pool_options() -> dict:
+    """
+    Pool settings for one worker process.
+
+    When DB_MAX_CONNECTIONS is set, the budget is split evenly across
+    WEB_CONCURRENCY workers and each worker's pool_size + max_overflow is
+    capped to its share.
+    """
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS > 0:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY))
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
 # Create PostgreSQL engine with PostGIS support
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options())
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory (asyncpg), only built when async mode is on
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.get_async_database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **pool_options()
+    )
+    AsyncSessionLocal = sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
 # Base class for models
 Base = declarative_base()
 
@@ -19,4 +59,16 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Async database dependency for the async routers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_status() -> list:
+    """Live pool usage and checkout telemetry for each engine in this worker"""
+    status = [pool_metrics["sync"].snapshot(engine.pool)]
+    if async_engine is not None:
+        status.append(pool_metrics["async"].snapshot(async_engine.pool))
+    return status
@@ -0,0 +1,86 @@
+# app/core/geometry.py
+import binascii
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# WKB geometry type flags (EWKB high bits and ISO dimension offsets)
+EWKB_Z_FLAG = 0x80000000
+EWKB_M_FLAG = 0x40000000
+EWKB_SRID_FLAG = 0x20000000
+WKB_POINT = 1
+
+# Precompiled point layouts keyed by the header bytes that determine them
+_POINT_STRUCTS: Dict[bytes, Tuple[struct.Struct, int]] = {}
+
+class GeometryDecodeError(ValueError):
+    pass
+
+def _raw_bytes(value) -> bytes:
+    """Accept a geoalchemy2 WKBElement, bytes/memoryview or a hex string"""
+    data = getattr(value, "data", value)
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    if isinstance(data, str):
+        try:
+            return binascii.unhexlify(data)
+        except binascii.Error as e:
+            raise GeometryDecodeError(f"Invalid hex WKB: {e}")
+    raise GeometryDecodeError(f"Unsupported geometry value: {type(value).__name__}")
+
+def _point_struct(data: bytes) -> Tuple[struct.Struct, int]:
+    """Return the struct for the x/y pair and its offset, cached per header"""
+    header = data[:5]
+    cached = _POINT_STRUCTS.get(header)
+    if cached is not None:
+        return cached
+
+    if len(data) < 5:
+        raise GeometryDecodeError("Geometry is too short to be WKB")
+    endian = "<" if data[0] == 1 else ">"
+    (geom_type,) = struct.unpack(endian + "I", data[1:5])
+
+    offset = 5
+    if geom_type & EWKB_SRID_FLAG:
+        offset += 4
+    base_type = geom_type & 0x0FFFFFFF
+    # ISO WKB encodes Z/M as +1000/+2000/+3000 on the base type
+    if base_type % 1000 != WKB_POINT:
+        raise GeometryDecodeError(f"Expected a POINT geometry, got WKB type {geom_type}")
+
+    result = (struct.Struct(endian + "dd"), offset)
+    _POINT_STRUCTS[header] = result
+    return result
+
+def decode_point(value) -> Optional[Tuple[float, float]]:
+    """
+    Decode a WKB or EWKB point into (x, y), i.e. (longitude, latitude).
+    Returns None for NULL or empty points.
+    """
+    if value is None:
+        return None
+    data = _raw_bytes(value)
+    unpacker, offset = _point_struct(data)
+    if len(data) < offset + 16:
+        raise GeometryDecodeError("Truncated WKB point")
+    x, y = unpacker.unpack_from(data, offset)
+    # Empty points are encoded as NaN coordinates
+    if x != x or y != y:
+        return None
+    return x, y
+
+def decode_points(values: Iterable) -> List[Optional[Tuple[float, float]]]:
+    """Decode a whole result set of point geometries without touching the database"""
+    return [decode_point(value) for value in values]
+
+def point_to_geojson(value):
+    """Convert a stored point into a GeoJSON Point dict; other values pass through"""
+    if value is None or isinstance(value, dict):
+        return value
+    if not isinstance(value, (bytes, bytearray, memoryview, str)) and not hasattr(value, "data"):
+        return value
+    coords = decode_point(value)
+    if coords is None:
+        return None
+    return {"type": "Point", "coordinates": [coords[0], coords[1]]}
\ No newline at end of file
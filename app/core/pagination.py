@@ -0,0 +1,45 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the (created_at, id) position of a row"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(query, model, cursor: Optional[str], skip: int, limit: int):
+    """
+    Order a Query or select() by (created_at, id) and apply either keyset
+    pagination (when a cursor is given) or the legacy offset.
+
+    The keyset predicate is a row comparison, which Postgres answers with a
+    range scan on the matching (created_at, id) composite index, so deep
+    pages cost the same as the first one.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+    query = query.order_by(model.created_at, model.id)
+    if not cursor and skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def set_next_cursor(response: Response, items: Sequence, limit: int):
+    """Expose the cursor for the next page in a header when the page is full"""
+    if items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
\ No newline at end of file
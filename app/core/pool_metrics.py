@@ -0,0 +1,103 @@
+# app/core/pool_metrics.py
+import logging
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class PoolMetrics:
+    """Counters for one connection pool, updated on every checkout"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.slow_waits = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self._saturated = False
+
+    def record_checkout(self, pool: QueuePool, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            slow = wait * 1000 >= settings.DB_POOL_WAIT_WARN_MS
+            if slow:
+                self.slow_waits += 1
+            if overflowed:
+                self.overflow_events += 1
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            saturated = capacity > 0 and pool.checkedout() / capacity >= settings.DB_POOL_USAGE_WARN_RATIO
+            crossed = saturated and not self._saturated
+            recovered = self._saturated and not saturated
+            self._saturated = saturated
+
+        if overflowed:
+            logger.info(f"DB pool '{self.name}' opened an overflow connection ({pool.status()})")
+        if slow:
+            logger.warning(f"DB pool '{self.name}' checkout waited {wait * 1000:.1f} ms ({pool.status()})")
+        if crossed:
+            logger.warning(f"DB pool '{self.name}' above {settings.DB_POOL_USAGE_WARN_RATIO:.0%} usage ({pool.status()})")
+        elif recovered:
+            logger.info(f"DB pool '{self.name}' back below usage threshold ({pool.status()})")
+
+    def record_timeout(self, pool: QueuePool, wait: float):
+        with self._lock:
+            self.timeouts += 1
+        logger.error(f"DB pool '{self.name}' checkout timed out after {wait:.1f} s ({pool.status()})")
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            checkouts = self.checkouts
+            data = {
+                "checkouts": checkouts,
+                "wait_ms_avg": (self.wait_seconds_total / checkouts * 1000) if checkouts else 0.0,
+                "wait_ms_max": self.wait_seconds_max * 1000,
+                "slow_waits": self.slow_waits,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return {"name": self.name, **data}
+
+pool_metrics = {
+    "sync": PoolMetrics("sync"),
+    "async": PoolMetrics("async"),
+}
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the time spent queued for a free connection"""
+    metrics_name = "sync"
+
+    def _do_get(self):
+        metrics = pool_metrics[self.metrics_name]
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record_timeout(self, time.perf_counter() - start)
+            raise
+        # A new connection opened beyond pool_size counts as an overflow event
+        overflowed = self.overflow() > max(overflow_before, 0)
+        metrics.record_checkout(self, time.perf_counter() - start, overflowed)
+        return conn
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_name = "sync"
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
\ No newline at end of file
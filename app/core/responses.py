@@ -0,0 +1,47 @@
+# app/core/responses.py
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Mapping, Optional
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used without it
+    orjson = None
+
+def _default(value):
+    """Types the stdlib encoder does not know, encoded the way orjson and FastAPI do"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """
+    JSON response for content that is already in its response shape.
+
+    Returning a Response from an endpoint skips FastAPI's response_model
+    validation and jsonable_encoder pass, so only use it for rows projected
+    from the database, never for user input.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def fast_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+    """
+    Wrap projected rows in a FastJSONResponse. Pass the injected Response's
+    headers along, since FastAPI only merges them into responses it builds.
+    """
+    return FastJSONResponse(content, headers=dict(headers) if headers else None)
@@ -24,6 +24,13 @@ from app.services.notification import (
     notify_ngo_new_donation
 )
 from app.config import settings
+from app.core.database import SessionLocal
+from app.core.geometry import decode_point, decode_points
+from app.services.gazetteer import gazetteer
+from app.services.geocoding_client import nominatim_client
+from app.services.geocoding_queue import geocoding_queue
+from app.services.ngo_catalog import ngo_catalog
+from app.services.stats_service import stats_rollup
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -34,6 +41,32 @@ app = FastAPI(
     version="1.0.0",
 )
 
+@app.on_event("startup")
+def warm_up_ngo_catalog():
+    ngo_catalog.warm_up(SessionLocal)
+
+@app.on_event("startup")
+def load_gazetteer():
+    gazetteer.warm_up()
+
+@app.on_event("startup")
+async def start_geocoding_client():
+    await nominatim_client.start()
+    await geocoding_queue.start()
+
+@app.on_event("startup")
+async def start_stats_rollup():
+    await stats_rollup.start()
+
+@app.on_event("shutdown")
+async def close_geocoding_client():
+    await geocoding_queue.stop()
+    await nominatim_client.close()
+
+@app.on_event("shutdown")
+async def stop_stats_rollup():
+    await stats_rollup.stop()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -107,15 +140,13 @@ async def create_ngo(
     db.add(db_ngo)
     db.commit()
     db.refresh(db_ngo)
+    ngo_catalog.invalidate()
     
     # Format response
     response = {**db_ngo.__dict__}
     if hasattr(db_ngo, 'location') and db_ngo.location is not None:
-        # Extract coordinates from geography point
-        point_wkb = bytes(db_ngo.location.data)
-        coords = db.execute(text(f"SELECT ST_X('{point_wkb}'::geometry), ST_Y('{point_wkb}'::geometry)")).first()
-        response['longitude'] = coords[0]
-        response['latitude'] = coords[1]
+        # Decode coordinates from the stored point without a round trip
+        response['longitude'], response['latitude'] = decode_point(db_ngo.location)
     
     return response
 
@@ -126,6 +157,16 @@ async def get_ngos(
     radius: Optional[float] = 10000,  # Default 10km radius
     db: Session = Depends(get_db)
 ):
+    # Answer radius searches from the in-memory catalog when it is enabled
+    if ngo_catalog.enabled and latitude is not None and longitude is not None:
+        response = []
+        for record in ngo_catalog.nearby(db, lat=latitude, lng=longitude, radius_km=radius / 1000):
+            ngo_dict = {**record}
+            ngo_dict['longitude'], ngo_dict['latitude'] = record['location']['coordinates']
+            ngo_dict['distance'] = record['distance_km'] * 1000
+            response.append(ngo_dict)
+        return response
+    
     query = db.query(NGO)
     
     # If coordinates provided, find NGOs within radius and add distance
@@ -153,24 +194,19 @@ async def get_ngos(
     
     results = query.all()
     
+    # Decode all coordinates in one pass instead of a query per row
+    ngos = [result[0] if hasattr(result, "distance") else result for result in results]
+    points = decode_points(ngo.location for ngo in ngos)
+    
     # Format response
     response = []
-    for result in results:
-        if hasattr(result, "distance"):
-            ngo = result[0]
-            distance = result[1]
-        else:
-            ngo = result
-            distance = None
+    for result, ngo, point in zip(results, ngos, points):
+        distance = result[1] if hasattr(result, "distance") else None
         
         ngo_dict = {**ngo.__dict__}
         
-        # Extract coordinates from geography point
-        if hasattr(ngo, 'location') and ngo.location is not None:
-            point_wkb = bytes(ngo.location.data)
-            coords = db.execute(text(f"SELECT ST_X('{point_wkb}'::geometry), ST_Y('{point_wkb}'::geometry)")).first()
-            ngo_dict['longitude'] = coords[0]
-            ngo_dict['latitude'] = coords[1]
+        if point is not None:
+            ngo_dict['longitude'], ngo_dict['latitude'] = point
         
         if distance is not None:
             ngo_dict['distance'] = distance
@@ -191,10 +227,8 @@ async def get_ngo(ngo_id: int, db: Session = Depends(get_db)):
     # Format response
     response = {**ngo.__dict__}
     if hasattr(ngo, 'location') and ngo.location is not None:
-        point_wkb = bytes(ngo.location.data)
-        coords = db.execute(text(f"SELECT ST_X('{point_wkb}'::geometry), ST_Y('{point_wkb}'::geometry)")).first()
-        response['longitude'] = coords[0]
-        response['latitude'] = coords[1]
+        # Decode coordinates from the stored point without a round trip
+        response['longitude'], response['latitude'] = decode_point(ngo.location)
     
     return response
 
@@ -228,14 +262,13 @@ async def update_ngo(
     
     db.commit()
     db.refresh(db_ngo)
+    ngo_catalog.invalidate()
     
     # Format response
     response = {**db_ngo.__dict__}
     if hasattr(db_ngo, 'location') and db_ngo.location is not None:
-        point_wkb = bytes(db_ngo.location.data)
-        coords = db.execute(text(f"SELECT ST_X('{point_wkb}'::geometry), ST_Y('{point_wkb}'::geometry)")).first()
-        response['longitude'] = coords[0]
-        response['latitude'] = coords[1]
+        # Decode coordinates from the stored point without a round trip
+        response['longitude'], response['latitude'] = decode_point(db_ngo.location)
     
     return response
 
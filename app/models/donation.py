@@ -1,11 +1,13 @@
 # app/models/donation.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum
+from sqlalchemy import Column, Computed, Integer, String, Boolean, ForeignKey, Text, DateTime, Enum, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
 import enum
 from datetime import datetime
 
-from .ngo import Base
+from .ngo import Base, SEARCH_CONFIG
 
 class DonationStatus(enum.Enum):
     PENDING = "pending"
@@ -36,8 +38,27 @@ class Donation(Base):
     location = Column(Geometry("POINT", srid=4326), nullable=False)
     status = Column(Enum(DonationStatus), default=DonationStatus.PENDING)
     ngo_id = Column(Integer, ForeignKey("ngos.id"), nullable=True)
+    # Filled in by the background geocoding queue
+    geocode_status = Column(String(20))
+    geocoded_address = Column(String(255))
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Maintained by Postgres; deferred so ORM loads do not fetch it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')",
+        persisted=True
+    )))
+    
+    __table_args__ = (
+        # Keyset pagination on (created_at, id), with and without a status filter
+        Index("ix_donations_created_at_id", "created_at", "id"),
+        Index("ix_donations_status_created_at_id", "status", "created_at", "id"),
+        # Radius filter of the donation search, as idx_ngo_location_geography for NGOs
+        Index("idx_donation_location_geography", func.geography(location), postgresql_using="gist"),
+        # Full-text search
+        Index("ix_donations_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     def __repr__(self):
         return f"<Donation {self.title} by {self.donor_name}>"
\ No newline at end of file
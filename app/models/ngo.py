@@ -1,102 +1,51 @@
-# app/schemas/ngo.py
-from pydantic import BaseModel, EmailStr, HttpUrl, Field
-from typing import Optional, List, Tuple
-from datetime import datetime
-from geojson_pydantic import Point
-
-class NGOBase(BaseModel):
-    name: str
-    description: Optional[str] = None
-    address: str
-    email: EmailStr
-    phone: Optional[str] = None
-    website: Optional[HttpUrl] = None
-    location: Point
-
-class NGOCreate(NGOBase):
-    pass
-
-class NGOUpdate(BaseModel):
-    name: Optional[str] = None
-    description: Optional[str] = None
-    address: Optional[str] = None
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = None
-    website: Optional[HttpUrl] = None
-    location: Optional[Point] = None
-    is_available: Optional[bool] = None
-    verified: Optional[bool] = None
-
-class NGOInDB(NGOBase):
-    id: int
-    is_available: bool
-    verified: bool
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        orm_mode = True
-
-class NGO(NGOInDB):
-    pass
-
-class NGONearby(NGO):
-    distance_km: float
-
-# app/schemas/donation.py
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
-from geojson_pydantic import Point
-from enum import Enum
-
-class DonationStatus(str, Enum):
-    PENDING = "pending"
-    ASSIGNED = "assigned"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
-
-class DonationType(str, Enum):
-    CLOTHING = "clothing"
-    FOOD = "food"
-    BOOKS = "books"
-    TOYS = "toys"
-    ELECTRONICS = "electronics"
-    FURNITURE = "furniture"
-    OTHER = "other"
-
-class DonationBase(BaseModel):
-    title: str
-    description: Optional[str] = None
-    donation_type: DonationType
-    donor_name: str
-    donor_email: EmailStr
-    donor_phone: Optional[str] = None
-    address: str
-    location: Point
-
-class DonationCreate(DonationBase):
-    pass
-
-class DonationUpdate(BaseModel):
-    title: Optional[str] = None
-    description: Optional[str] = None
-    donation_type: Optional[DonationType] = None
-    status: Optional[DonationStatus] = None
-    ngo_id: Optional[int] = None
-
-class DonationInDB(DonationBase):
-    id: int
-    status: DonationStatus
-    ngo_id: Optional[int] = None
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        orm_mode = True
-
-class Donation(DonationInDB):
-    pass
-
-class DonationAssign(BaseModel):
-    ngo_id: int
\ No newline at end of file
+# app/models/ngo.py
+from sqlalchemy import Column, Computed, Integer, String, Boolean, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from geoalchemy2 import Geometry
+
+from app.core.database import Base
+
+# Text search configuration of the search_vector columns; queries must use the same one
+SEARCH_CONFIG = "english"
+
+class NGO(Base):
+    __tablename__ = "ngos"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    description = Column(Text)
+    address = Column(String(255), nullable=False)
+    email = Column(String(100), nullable=False)
+    phone = Column(String(20))
+    website = Column(String(255))
+    location = Column(Geometry("POINT", srid=4326), nullable=False)
+    is_available = Column(Boolean, default=True, nullable=False)
+    verified = Column(Boolean, default=False, nullable=False)
+    # Auto-matching limits: most donations assigned at once and accepted types (DonationType values); NULL means no limit
+    capacity = Column(Integer)
+    accepted_donation_types = Column(ARRAY(String(20)))
+    # Filled in by the background geocoding queue
+    geocode_status = Column(String(20))
+    geocoded_address = Column(String(255))
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Maintained by Postgres; deferred so ORM loads do not fetch it
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')",
+        persisted=True
+    )))
+
+    __table_args__ = (
+        # Geography expression index used by the nearby search (radius + KNN)
+        Index("idx_ngo_location_geography", func.geography(location), postgresql_using="gist"),
+        # Keyset pagination on (created_at, id)
+        Index("ix_ngos_created_at_id", "created_at", "id"),
+        # Full-text search
+        Index("ix_ngos_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    def __repr__(self):
+        return f"<NGO {self.name}>"
\ No newline at end of file
@@ -0,0 +1,41 @@
+# app/models/outbox.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from .ngo import Base
+
+class OutboxStatus:
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class NotificationOutbox(Base):
+    """
+    Notifications waiting to be delivered. Rows are written in the same
+    transaction as the change that triggers them and sent by the outbox worker.
+    """
+    __tablename__ = "notification_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    recipient = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), nullable=False, default=OutboxStatus.PENDING, server_default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Earliest time the row may be claimed; pushed forward while a worker holds it and after failures
+    available_at = Column(DateTime, server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Only pending rows are ever claimed, so the index stays small
+        Index(
+            "ix_notification_outbox_pending", "available_at", "id",
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
+    
+    def __repr__(self):
+        return f"<NotificationOutbox {self.kind} to {self.recipient} ({self.status})>"
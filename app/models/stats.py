@@ -0,0 +1,54 @@
+# app/models/stats.py
+from sqlalchemy import Column, Integer, BigInteger, Date, Enum
+
+from .ngo import Base
+from .donation import DonationStatus, DonationType
+
+# ngo_id stored for donations without an NGO; key columns cannot be NULL
+UNASSIGNED_NGO_ID = 0
+
+class DonationStats(Base):
+    """
+    Current donation counts per (status, donation_type, ngo_id), kept up to
+    date by rolling up donation_stats_deltas (app/services/stats_service.py).
+    """
+    __tablename__ = "donation_stats"
+
+    status = Column(Enum(DonationStatus), primary_key=True)
+    donation_type = Column(Enum(DonationType), primary_key=True)
+    ngo_id = Column(Integer, primary_key=True, default=UNASSIGNED_NGO_ID)
+    count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DonationStats {self.status} {self.donation_type} ngo={self.ngo_id}: {self.count}>"
+
+class DonationDailyStats(Base):
+    """Donations created per day, by their current status and type"""
+    __tablename__ = "donation_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(DonationStatus), primary_key=True)
+    donation_type = Column(Enum(DonationType), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DonationDailyStats {self.day} {self.status} {self.donation_type}: {self.count}>"
+
+class DonationStatsDelta(Base):
+    """
+    Pending +1/-1 changes to both summaries. Donation writes only append
+    here, so concurrent writes never wait on the same counter rows; the
+    rollup folds them into donation_stats and donation_daily_stats.
+    """
+    __tablename__ = "donation_stats_deltas"
+
+    id = Column(BigInteger, primary_key=True)
+    day = Column(Date, nullable=False)
+    status = Column(Enum(DonationStatus), nullable=False)
+    donation_type = Column(Enum(DonationType), nullable=False)
+    # NULL for donations without an NGO
+    ngo_id = Column(Integer)
+    delta = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<DonationStatsDelta {self.day} {self.status} {self.donation_type} ngo={self.ngo_id}: {self.delta:+d}>"
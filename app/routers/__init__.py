@@ -0,0 +1,14 @@
+# app/routers/__init__.py
+from app.core.config import settings
+
+# Pick the sync or asyncpg-backed routers according to DATABASE_ASYNC
+if settings.DATABASE_ASYNC:
+    from app.routers.ngos_async import router as ngos_router
+    from app.routers.donations_async import router as donations_router
+    from app.routers.tiles_async import router as tiles_router
+else:
+    from app.routers.ngos import router as ngos_router
+    from app.routers.donations import router as donations_router
+    from app.routers.tiles import router as tiles_router
+
+from app.routers.health import router as health_router
@@ -1,27 +1,46 @@
 # app/routers/donations.py
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from app.core.conditional import etag_matches, not_modified, row_etag, set_validators
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.donation import Donation, DonationStatus
-from app.models.ngo import NGO
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import fast_response
+from app.models.donation import Donation, DonationStatus, DonationType
 from app.schemas.donation import (
     Donation as DonationSchema,
     DonationCreate,
     DonationUpdate,
-    DonationAssign
+    DonationAssign,
+    DonationBulkAssign,
+    DonationSearchResult
 )
-from app.services.notification_service import send_ngo_notification
+from app.schemas.bulk import BulkAssignResult, BulkCreateResult
+from app.schemas.matching import AutoMatchResult
+from app.schemas.stats import DonationStatsPoint, DonationStatsSummary
+from app.services.assignment_service import (
+    assignment_results, assignment_statement, bulk_assignment_pairs, conflict_error, conflict_statement
+)
+from app.services.bulk_service import bulk_insert, validate_items
+from app.services.export_service import csv_lines, iter_donation_rows, ndjson_lines
+from app.services.geocoding_queue import geocoding_queue
+from app.services.matching_service import run_auto_match
+from app.services.projections import DONATION_COLUMNS, project_donation
+from app.services.response_cache import DONATIONS, response_cache
+from app.services.search_service import donation_search_statement, project_donation_result, validate_point
+from app.services.stats_service import record_change, record_inserted, series, stats_key, summary
 
 router = APIRouter(prefix="/donations", tags=["donations"])
 
-@router.post("/", response_model=DonationSchema)
-def create_donation(donation: DonationCreate, db: Session = Depends(get_db)):
-    """Create a new donation"""
+def donation_values(donation: DonationCreate) -> dict:
+    """Column values for a new donation"""
     # Convert GeoJSON Point to PostGIS geometry
     location_geojson = donation.location.dict()
     
-    db_donation = Donation(
+    return dict(
         title=donation.title,
         description=donation.description,
         donation_type=donation.donation_type,
@@ -32,94 +51,212 @@ def create_donation(donation: DonationCreate, db: Session = Depends(get_db)):
         location=f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})",
         status=DonationStatus.PENDING
     )
+
+@router.post("/", response_model=DonationSchema)
+def create_donation(donation: DonationCreate, db: Session = Depends(get_db)):
+    """Create a new donation"""
+    db_donation = Donation(**donation_values(donation))
     
     db.add(db_donation)
+    db.flush()
+    record_inserted(db, [db_donation.id])
     db.commit()
     db.refresh(db_donation)
+    
+    response_cache.invalidate((DONATIONS,))
+    geocoding_queue.enqueue_verify("donations", db_donation.id, db_donation.address)
     return db_donation
 
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_donations_bulk(items: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """Create many donations at once, reporting the outcome of each item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    
+    rows, errors = validate_items(items, DonationCreate, donation_values)
+    result = bulk_insert(db, Donation, rows, errors, on_insert=record_inserted)
+    if result["created"]:
+        response_cache.invalidate((DONATIONS,))
+    
+    geocoding_queue.enqueue_bulk_verify("donations", rows, result)
+    return result
+
+@router.post("/auto-match", response_model=AutoMatchResult)
+def auto_match_donations(
+    max_distance_km: Optional[float] = Query(None, gt=0),
+    limit: Optional[int] = Query(None, gt=0, description="Only consider the oldest N pending donations"),
+    dry_run: bool = False,
+    include_assignments: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Assign pending donations to the nearest available NGOs that accept them and have capacity"""
+    result = run_auto_match(db, max_distance_km, limit, dry_run, include_assignments)
+    if not dry_run:
+        response_cache.invalidate((DONATIONS,))
+    return result
+
 @router.get("/", response_model=List[DonationSchema])
 def get_donations(
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(100, ge=1, le=1000),
     status: str = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
-    """Get all donations with optional status filter"""
-    query = db.query(Donation)
+    """Get all donations with optional status filter, oldest first"""
+    key = response_cache.key("donations", (DONATIONS,), status=status or None, skip=skip, limit=limit, cursor=cursor)
+    cached = response_cache.get(key, request)
+    if cached is not None:
+        return cached
+    
+    projected = settings.FAST_JSON_ENABLED or response_cache.enabled
+    query = db.query(*DONATION_COLUMNS) if projected else db.query(Donation)
     
     if status:
         query = query.filter(Donation.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    donations = paginate(query, Donation, cursor, skip, limit).all()
+    set_next_cursor(response, donations, limit)
+    if response_cache.enabled:
+        return response_cache.store(key, [project_donation(row) for row in donations], response.headers)
+    if settings.FAST_JSON_ENABLED:
+        return fast_response([project_donation(row) for row in donations], response.headers)
+    return donations
+
+@router.get("/export")
+def export_donations(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$", description="ndjson or csv"),
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    ngo_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at"),
+    created_to: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at"),
+):
+    """Stream all matching donations as NDJSON or CSV"""
+    rows = iter_donation_rows(
+        status=status,
+        donation_type=donation_type,
+        ngo_id=ngo_id,
+        created_from=created_from,
+        created_to=created_to
+    )
+    
+    if format == "csv":
+        return StreamingResponse(
+            csv_lines(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=donations.csv"}
+        )
+    return StreamingResponse(ndjson_lines(rows), media_type="application/x-ndjson")
+
+@router.get("/stats", response_model=DonationStatsSummary)
+def get_donation_stats(ngo_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Donation counts by status, type and NGO, read from the incrementally maintained summary"""
+    return summary(db, ngo_id)
+
+@router.get("/stats/series", response_model=List[DonationStatsPoint])
+def get_donation_stats_series(
+    bucket: str = Query("day", regex="^(day|week)$", description="day or week (weeks start on Monday)"),
+    created_from: Optional[date] = Query(None, description="First day to include (defaults to the last 30 days or 12 weeks)"),
+    created_to: Optional[date] = Query(None, description="Exclusive upper bound"),
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    db: Session = Depends(get_db)
+):
+    """Donations created per day or week, by current status and type"""
+    return series(db, bucket, created_from, created_to, status, donation_type)
+
+@router.get("/search", response_model=List[DonationSearchResult])
+def search_donations(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the title or description; supports \"phrases\", or, -word"),
+    lat: Optional[float] = Query(None, description="Latitude; with lng, limits the search to radius_km around the point"),
+    lng: Optional[float] = Query(None, description="Longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km)"),
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over donation titles and descriptions, best match first"""
+    validate_point(lat, lng)
+    stmt = donation_search_statement(
+        q, lat=lat, lng=lng, radius_km=radius_km, status=status, donation_type=donation_type, limit=limit
+    )
+    records = [project_donation_result(row) for row in db.execute(stmt)]
+    return fast_response(records) if settings.FAST_JSON_ENABLED else records
 
 @router.get("/{donation_id}", response_model=DonationSchema)
-def get_donation(donation_id: int, db: Session = Depends(get_db)):
-    """Get a donation by ID"""
+def get_donation(donation_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get a donation by ID; answers 304 when If-None-Match still matches"""
+    if request.headers.get("if-none-match"):
+        # Only the version is read until we know the body is needed
+        version = db.query(Donation.updated_at).filter(Donation.id == donation_id).first()
+        if version is None:
+            raise HTTPException(status_code=404, detail="Donation not found")
+        etag = row_etag(donation_id, version.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag, settings.CACHE_CONTROL_DONATION_DETAIL)
+    
     db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
     if db_donation is None:
         raise HTTPException(status_code=404, detail="Donation not found")
+    set_validators(response, row_etag(db_donation.id, db_donation.updated_at), settings.CACHE_CONTROL_DONATION_DETAIL)
     return db_donation
 
 @router.put("/{donation_id}", response_model=DonationSchema)
 def update_donation(donation_id: int, donation: DonationUpdate, db: Session = Depends(get_db)):
     """Update a donation"""
-    db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
+    # Lock the row so a concurrent change cannot move it between reading and recording ``before``
+    db_donation = (
+        db.query(Donation).filter(Donation.id == donation_id).populate_existing().with_for_update().first()
+    )
     if db_donation is None:
         raise HTTPException(status_code=404, detail="Donation not found")
     
+    before = stats_key(db_donation)
     update_data = donation.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_donation, key, value)
+    record_change(db, before, stats_key(db_donation))
     
     db.commit()
     db.refresh(db_donation)
+    
+    response_cache.invalidate((DONATIONS,))
     return db_donation
 
 @router.post("/{donation_id}/assign", response_model=DonationSchema)
 def assign_donation(
     donation_id: int, 
     assignment: DonationAssign, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Assign a donation to an NGO"""
-    # Check if donation exists
-    db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
-    if db_donation is None:
-        raise HTTPException(status_code=404, detail="Donation not found")
-    
-    # Check if donation is already assigned
-    if db_donation.status != DonationStatus.PENDING:
-        raise HTTPException(status_code=400, detail="Donation is not available for assignment")
-    
-    # Check if NGO exists
-    ngo = db.query(NGO).filter(NGO.id == assignment.ngo_id).first()
-    if ngo is None:
-        raise HTTPException(status_code=404, detail="NGO not found")
-    
-    # Check if NGO is available
-    if not ngo.is_available:
-        raise HTTPException(status_code=400, detail="NGO is not available")
-    
-    # Update donation
-    db_donation.ngo_id = ngo.id
-    db_donation.status = DonationStatus.ASSIGNED
-    
-    # Update NGO availability if needed
-    # ngo.is_available = False  # Optional: mark NGO as busy
-    
+    # One conditional UPDATE checks both rows, assigns and queues the NGO notification
+    pairs = [(donation_id, assignment.ngo_id)]
+    row = db.execute(assignment_statement(pairs)).first()
+    if row is None:
+        db.rollback()
+        conflict = db.execute(conflict_statement(pairs)).first()
+        raise conflict_error(conflict.status, conflict.is_available)
     db.commit()
-    db.refresh(db_donation)
     
-    # Send notification to NGO (background task)
-    background_tasks.add_task(
-        send_ngo_notification,
-        ngo_email=ngo.email,
-        ngo_name=ngo.name,
-        donation_id=db_donation.id,
-        donation_title=db_donation.title,
-        donor_name=db_donation.donor_name
-    )
+    response_cache.invalidate((DONATIONS,))
+    return dict(row._mapping)
+
+@router.post("/assign", response_model=BulkAssignResult)
+def assign_donations_bulk(assignments: List[DonationBulkAssign], db: Session = Depends(get_db)):
+    """Assign many donations at once, reporting the outcome of each item"""
+    pairs = bulk_assignment_pairs(assignments)
+    rows = db.execute(assignment_statement(pairs)).all() if pairs else []
+    conflicts = []
+    if len(rows) < len(pairs):
+        assigned = {row.id for row in rows}
+        conflicts = db.execute(conflict_statement([pair for pair in pairs if pair[0] not in assigned])).all()
+    db.commit()
     
-    return db_donation
\ No newline at end of file
+    if rows:
+        response_cache.invalidate((DONATIONS,))
+    return assignment_results(pairs, rows, conflicts)
\ No newline at end of file
@@ -0,0 +1,232 @@
+# app/routers/donations_async.py
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Any, Dict, List, Optional
+from app.core.conditional import etag_matches, not_modified, row_etag, set_validators
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import fast_response
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.schemas.donation import (
+    Donation as DonationSchema,
+    DonationCreate,
+    DonationUpdate,
+    DonationAssign,
+    DonationBulkAssign,
+    DonationSearchResult
+)
+from app.schemas.bulk import BulkAssignResult, BulkCreateResult
+from app.schemas.matching import AutoMatchResult
+from app.schemas.stats import DonationStatsPoint, DonationStatsSummary
+from app.services.assignment_service import (
+    assignment_results, assignment_statement, bulk_assignment_pairs, conflict_error, conflict_statement
+)
+from app.services.bulk_service import bulk_insert, validate_items
+from app.routers.donations import donation_values, export_donations
+from app.services.geocoding_queue import geocoding_queue
+from app.services.matching_service import run_auto_match
+from app.services.projections import DONATION_COLUMNS, project_donation
+from app.services.response_cache import DONATIONS, response_cache
+from app.services.search_service import donation_search_statement, project_donation_result, validate_point
+from app.services.stats_service import record_change, record_inserted, series, stats_key, summary
+
+# Async twin of app/routers/donations.py, used when DATABASE_ASYNC is on
+router = APIRouter(prefix="/donations", tags=["donations"])
+
+@router.post("/", response_model=DonationSchema)
+async def create_donation(donation: DonationCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new donation"""
+    db_donation = Donation(**donation_values(donation))
+
+    db.add(db_donation)
+    await db.flush()
+    await db.run_sync(lambda session: record_inserted(session, [db_donation.id]))
+    await db.commit()
+    await db.refresh(db_donation)
+
+    await response_cache.ainvalidate((DONATIONS,))
+    geocoding_queue.enqueue_verify("donations", db_donation.id, db_donation.address)
+    return db_donation
+
+@router.post("/bulk", response_model=BulkCreateResult)
+async def create_donations_bulk(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """Create many donations at once, reporting the outcome of each item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+    rows, errors = validate_items(items, DonationCreate, donation_values)
+    result = await db.run_sync(lambda session: bulk_insert(session, Donation, rows, errors, on_insert=record_inserted))
+    if result["created"]:
+        await response_cache.ainvalidate((DONATIONS,))
+
+    geocoding_queue.enqueue_bulk_verify("donations", rows, result)
+    return result
+
+@router.post("/auto-match", response_model=AutoMatchResult)
+async def auto_match_donations(
+    max_distance_km: Optional[float] = Query(None, gt=0),
+    limit: Optional[int] = Query(None, gt=0, description="Only consider the oldest N pending donations"),
+    dry_run: bool = False,
+    include_assignments: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Assign pending donations to the nearest available NGOs that accept them and have capacity"""
+    result = await db.run_sync(
+        lambda session: run_auto_match(session, max_distance_km, limit, dry_run, include_assignments)
+    )
+    if not dry_run:
+        await response_cache.ainvalidate((DONATIONS,))
+    return result
+
+@router.get("/", response_model=List[DonationSchema])
+async def get_donations(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    status: str = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all donations with optional status filter, oldest first"""
+    key = response_cache.key("donations", (DONATIONS,), status=status or None, skip=skip, limit=limit, cursor=cursor)
+    cached = await response_cache.aget(key, request)
+    if cached is not None:
+        return cached
+
+    projected = settings.FAST_JSON_ENABLED or response_cache.enabled
+    stmt = select(*DONATION_COLUMNS) if projected else select(Donation)
+
+    if status:
+        stmt = stmt.where(Donation.status == status)
+
+    result = await db.execute(paginate(stmt, Donation, cursor, skip, limit))
+    if projected:
+        rows = result.all()
+        set_next_cursor(response, rows, limit)
+        records = [project_donation(row) for row in rows]
+        if response_cache.enabled:
+            return await response_cache.astore(key, records, response.headers)
+        return fast_response(records, response.headers)
+
+    donations = result.scalars().all()
+    set_next_cursor(response, donations, limit)
+    return donations
+
+# The export streams through its own server-side cursor session, so the sync
+# handler is shared; it must be registered before /{donation_id}
+router.get("/export")(export_donations)
+
+@router.get("/stats", response_model=DonationStatsSummary)
+async def get_donation_stats(ngo_id: Optional[int] = None, db: AsyncSession = Depends(get_async_db)):
+    """Donation counts by status, type and NGO, read from the incrementally maintained summary"""
+    return await db.run_sync(lambda session: summary(session, ngo_id))
+
+@router.get("/stats/series", response_model=List[DonationStatsPoint])
+async def get_donation_stats_series(
+    bucket: str = Query("day", regex="^(day|week)$", description="day or week (weeks start on Monday)"),
+    created_from: Optional[date] = Query(None, description="First day to include (defaults to the last 30 days or 12 weeks)"),
+    created_to: Optional[date] = Query(None, description="Exclusive upper bound"),
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Donations created per day or week, by current status and type"""
+    return await db.run_sync(
+        lambda session: series(session, bucket, created_from, created_to, status, donation_type)
+    )
+
+@router.get("/search", response_model=List[DonationSearchResult])
+async def search_donations(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the title or description; supports \"phrases\", or, -word"),
+    lat: Optional[float] = Query(None, description="Latitude; with lng, limits the search to radius_km around the point"),
+    lng: Optional[float] = Query(None, description="Longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km)"),
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over donation titles and descriptions, best match first"""
+    validate_point(lat, lng)
+    stmt = donation_search_statement(
+        q, lat=lat, lng=lng, radius_km=radius_km, status=status, donation_type=donation_type, limit=limit
+    )
+    records = [project_donation_result(row) for row in (await db.execute(stmt))]
+    return fast_response(records) if settings.FAST_JSON_ENABLED else records
+
+@router.get("/{donation_id}", response_model=DonationSchema)
+async def get_donation(donation_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Get a donation by ID; answers 304 when If-None-Match still matches"""
+    if request.headers.get("if-none-match"):
+        # Only the version is read until we know the body is needed
+        version = (await db.execute(select(Donation.updated_at).where(Donation.id == donation_id))).first()
+        if version is None:
+            raise HTTPException(status_code=404, detail="Donation not found")
+        etag = row_etag(donation_id, version.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag, settings.CACHE_CONTROL_DONATION_DETAIL)
+
+    db_donation = await db.get(Donation, donation_id)
+    if db_donation is None:
+        raise HTTPException(status_code=404, detail="Donation not found")
+    set_validators(response, row_etag(db_donation.id, db_donation.updated_at), settings.CACHE_CONTROL_DONATION_DETAIL)
+    return db_donation
+
+@router.put("/{donation_id}", response_model=DonationSchema)
+async def update_donation(donation_id: int, donation: DonationUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update a donation"""
+    # Lock the row so a concurrent change cannot move it between reading and recording ``before``
+    db_donation = await db.get(Donation, donation_id, populate_existing=True, with_for_update=True)
+    if db_donation is None:
+        raise HTTPException(status_code=404, detail="Donation not found")
+
+    before = stats_key(db_donation)
+    update_data = donation.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_donation, key, value)
+    after = stats_key(db_donation)
+    await db.run_sync(lambda session: record_change(session, before, after))
+
+    await db.commit()
+    await db.refresh(db_donation)
+
+    await response_cache.ainvalidate((DONATIONS,))
+    return db_donation
+
+@router.post("/{donation_id}/assign", response_model=DonationSchema)
+async def assign_donation(
+    donation_id: int,
+    assignment: DonationAssign,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Assign a donation to an NGO"""
+    # One conditional UPDATE checks both rows, assigns and queues the NGO notification
+    pairs = [(donation_id, assignment.ngo_id)]
+    row = (await db.execute(assignment_statement(pairs))).first()
+    if row is None:
+        await db.rollback()
+        conflict = (await db.execute(conflict_statement(pairs))).first()
+        raise conflict_error(conflict.status, conflict.is_available)
+    await db.commit()
+
+    await response_cache.ainvalidate((DONATIONS,))
+    return dict(row._mapping)
+
+@router.post("/assign", response_model=BulkAssignResult)
+async def assign_donations_bulk(assignments: List[DonationBulkAssign], db: AsyncSession = Depends(get_async_db)):
+    """Assign many donations at once, reporting the outcome of each item"""
+    pairs = bulk_assignment_pairs(assignments)
+    rows = (await db.execute(assignment_statement(pairs))).all() if pairs else []
+    conflicts = []
+    if len(rows) < len(pairs):
+        assigned = {row.id for row in rows}
+        conflicts = (await db.execute(conflict_statement([pair for pair in pairs if pair[0] not in assigned]))).all()
+    await db.commit()
+
+    if rows:
+        await response_cache.ainvalidate((DONATIONS,))
+    return assignment_results(pairs, rows, conflicts)
\ No newline at end of file
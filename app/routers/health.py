@@ -0,0 +1,30 @@
+# app/routers/health.py
+from fastapi import APIRouter
+from app.core.database import pool_options, pool_status
+from app.services.gazetteer import gazetteer
+from app.services.geocoding_cache import geocoding_cache
+from app.services.geocoding_client import nominatim_client
+from app.services.geocoding_queue import geocoding_queue
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/db-pool")
+def get_db_pool_status():
+    """Connection pool configuration and live usage for this worker"""
+    return {"config": pool_options(), "pools": pool_status()}
+
+@router.get("/geocode-cache")
+def get_geocode_cache_stats():
+    """Reverse-geocoding cache size, hit ratio and eviction counters"""
+    return {**geocoding_cache.snapshot(), "gazetteer": gazetteer.stats}
+
+@router.get("/geocode-client")
+def get_geocode_client_stats():
+    """Upstream geocoding calls, coalesced lookups and background queue progress"""
+    return {**nominatim_client.stats, "queue": geocoding_queue.stats}
+
+@router.get("/response-cache")
+def get_response_cache_stats():
+    """Response cache hit ratio per tier, hit and miss latency, and invalidations"""
+    return response_cache.snapshot()
\ No newline at end of file
@@ -1,48 +1,141 @@
 # app/routers/ngos.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
-from geoalchemy2.functions import ST_DWithin, ST_Distance, ST_GeomFromGeoJSON
+from typing import Any, Dict, List, Optional
+from app.core.conditional import etag_matches, not_modified, row_etag, rows_etag, set_validators
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import fast_response
+from app.core.pagination import paginate, set_next_cursor
 from app.models.ngo import NGO
-from app.schemas.ngo import NGOCreate, NGO as NGOSchema, NGOUpdate, NGONearby
+from app.schemas.ngo import NGOCreate, NGO as NGOSchema, NGOUpdate, NGONearby, NGOClusters, NGOSearchResult
+from app.schemas.bulk import BulkCreateResult
+from app.services.bulk_service import bulk_insert, validate_items
+from app.services.geocoding_queue import geocoding_queue
+from app.services.nearby_service import DEFAULT_RADIUS_KM, cluster_cell_degrees, find_nearby_clusters, find_nearby_ngos
+from app.services.ngo_catalog import ngo_catalog, ngo_record
+from app.services.projections import NGO_COLUMNS, project_ngo, project_nearby_ngo
+from app.services.response_cache import NGOS, response_cache
+from app.services.search_service import ngo_search_statement, project_ngo_result, validate_point
 from geojson_pydantic import Point
 
 router = APIRouter(prefix="/ngos", tags=["ngos"])
 
-@router.post("/", response_model=NGOSchema)
-def create_ngo(ngo: NGOCreate, db: Session = Depends(get_db)):
-    """Create a new NGO"""
+def ngo_values(ngo: NGOCreate) -> dict:
+    """Column values for a new NGO"""
     # Convert GeoJSON Point to PostGIS geometry
     location_geojson = ngo.location.dict()
     
-    db_ngo = NGO(
+    return dict(
         name=ngo.name,
         description=ngo.description,
         address=ngo.address,
         email=ngo.email,
         phone=ngo.phone,
         website=str(ngo.website) if ngo.website else None,
-        location=f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})"
+        location=f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})",
+        is_available=True,
+        verified=False,
+        capacity=ngo.capacity,
+        accepted_donation_types=ngo.accepted_donation_types
     )
+
+@router.post("/", response_model=NGOSchema)
+def create_ngo(ngo: NGOCreate, db: Session = Depends(get_db)):
+    """Create a new NGO"""
+    db_ngo = NGO(**ngo_values(ngo))
     
     db.add(db_ngo)
     db.commit()
     db.refresh(db_ngo)
+    
+    ngo_catalog.upsert(ngo_record(db_ngo))
+    response_cache.invalidate((NGOS,))
+    geocoding_queue.enqueue_verify("ngos", db_ngo.id, db_ngo.address)
     return db_ngo
 
+@router.post("/bulk", response_model=BulkCreateResult)
+def create_ngos_bulk(items: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """Create many NGOs at once, reporting the outcome of each item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    
+    rows, errors = validate_items(items, NGOCreate, ngo_values)
+    result = bulk_insert(db, NGO, rows, errors)
+    geocoding_queue.enqueue_bulk_verify("ngos", rows, result)
+    
+    # Reload rather than decode every new row into the catalog
+    if result["created"]:
+        ngo_catalog.invalidate()
+        response_cache.invalidate((NGOS,))
+    return result
+
 @router.get("/", response_model=List[NGOSchema])
-def get_ngos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all NGOs"""
-    return db.query(NGO).offset(skip).limit(limit).all()
+def get_ngos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_db)
+):
+    """Get all NGOs, oldest first; answers 304 when If-None-Match still matches the page"""
+    key = response_cache.key("ngos", (NGOS,), skip=skip, limit=limit, cursor=cursor)
+    cached = response_cache.get(key, request)
+    if cached is not None:
+        return cached
+    
+    if request.headers.get("if-none-match"):
+        # Compare the page's versions before loading and serializing whole rows
+        versions = paginate(db.query(NGO.id, NGO.created_at, NGO.updated_at), NGO, cursor, skip, limit).all()
+        etag = rows_etag(versions)
+        if etag_matches(request, etag):
+            set_next_cursor(response, versions, limit)
+            return not_modified(etag, settings.CACHE_CONTROL_NGO_LIST, response.headers)
+    
+    projected = settings.FAST_JSON_ENABLED or response_cache.enabled
+    query = db.query(*NGO_COLUMNS) if projected else db.query(NGO)
+    ngos = paginate(query, NGO, cursor, skip, limit).all()
+    set_next_cursor(response, ngos, limit)
+    set_validators(response, rows_etag(ngos), settings.CACHE_CONTROL_NGO_LIST)
+    if response_cache.enabled:
+        return response_cache.store(key, [project_ngo(row) for row in ngos], response.headers)
+    if settings.FAST_JSON_ENABLED:
+        return fast_response([project_ngo(row) for row in ngos], response.headers)
+    return ngos
+
+@router.get("/search", response_model=List[NGOSearchResult])
+def search_ngos(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the name or description; supports \"phrases\", or, -word"),
+    lat: Optional[float] = Query(None, description="Latitude; with lng, limits the search to radius_km around the point"),
+    lng: Optional[float] = Query(None, description="Longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km)"),
+    available_only: bool = Query(False, description="Filter only available NGOs"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over NGO names and descriptions, best match first"""
+    validate_point(lat, lng)
+    stmt = ngo_search_statement(q, lat=lat, lng=lng, radius_km=radius_km, available_only=available_only, limit=limit)
+    records = [project_ngo_result(row) for row in db.execute(stmt)]
+    return fast_response(records) if settings.FAST_JSON_ENABLED else records
 
 @router.get("/{ngo_id}", response_model=NGOSchema)
-def get_ngo(ngo_id: int, db: Session = Depends(get_db)):
-    """Get an NGO by ID"""
+def get_ngo(ngo_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get an NGO by ID; answers 304 when If-None-Match still matches"""
+    if request.headers.get("if-none-match"):
+        # Only the version is read until we know the body is needed
+        version = db.query(NGO.updated_at).filter(NGO.id == ngo_id).first()
+        if version is None:
+            raise HTTPException(status_code=404, detail="NGO not found")
+        etag = row_etag(ngo_id, version.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag, settings.CACHE_CONTROL_NGO_DETAIL)
+    
     db_ngo = db.query(NGO).filter(NGO.id == ngo_id).first()
     if db_ngo is None:
         raise HTTPException(status_code=404, detail="NGO not found")
+    set_validators(response, row_etag(db_ngo.id, db_ngo.updated_at), settings.CACHE_CONTROL_NGO_DETAIL)
     return db_ngo
 
 @router.put("/{ngo_id}", response_model=NGOSchema)
@@ -55,10 +148,15 @@ def update_ngo(ngo_id: int, ngo: NGOUpdate, db: Session = Depends(get_db)):
     update_data = ngo.dict(exclude_unset=True)
     
     # Handle location separately if provided
-    if "location" in update_data:
-        location_geojson = update_data.pop("location")
-        if location_geojson:
-            db_ngo.location = f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})"
+    location_geojson = update_data.pop("location", None)
+    if location_geojson:
+        db_ngo.location = f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})"
+    
+    # Re-verify when the address or the point moves
+    reverify = bool(location_geojson) or "address" in update_data
+    if reverify:
+        db_ngo.geocode_status = None
+        db_ngo.geocoded_address = None
     
     # Update other fields
     for key, value in update_data.items():
@@ -66,6 +164,11 @@ def update_ngo(ngo_id: int, ngo: NGOUpdate, db: Session = Depends(get_db)):
     
     db.commit()
     db.refresh(db_ngo)
+    
+    ngo_catalog.upsert(ngo_record(db_ngo))
+    response_cache.invalidate((NGOS,))
+    if reverify:
+        geocoding_queue.enqueue_verify("ngos", db_ngo.id, db_ngo.address)
     return db_ngo
 
 @router.delete("/{ngo_id}", status_code=204)
@@ -77,199 +180,101 @@ def delete_ngo(ngo_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_ngo)
     db.commit()
+    
+    ngo_catalog.remove(ngo_id)
+    response_cache.invalidate((NGOS,))
     return None
 
 @router.get("/nearby/", response_model=List[NGONearby])
 def get_nearby_ngos(
     lat: float = Query(..., description="Latitude"),
     lng: float = Query(..., description="Longitude"),
-    radius_km: float = Query(10.0, description="Search radius in kilometers"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km unless k is given)"),
+    k: Optional[int] = Query(None, ge=1, le=500, description="Return only the k nearest NGOs"),
     available_only: bool = Query(True, description="Filter only available NGOs"),
     db: Session = Depends(get_db)
 ):
-    """Find NGOs within a specified radius"""
-    # Convert km to meters for PostGIS
-    radius_meters = radius_km * 1000
-    
-    # Create user point
-    user_point = f"SRID=4326;POINT({lng} {lat})"
-    
-    # Base query
-    query = db.query(
-        NGO,
-        func.ST_Distance(
-            func.ST_Transform(NGO.location, 3857),
-            func.ST_Transform(func.ST_GeomFromText(user_point, 4326), 3857)
-        ).label("distance_meters")
-    )
-    
-    # Filter by distance
-    query = query.filter(
-        ST_DWithin(
-            func.ST_Transform(NGO.location, 3857),
-            func.ST_Transform(func.ST_GeomFromText(user_point, 4326), 3857),
-            radius_meters
+    """Find NGOs within a specified radius, or the k nearest"""
+    if response_cache.enabled:
+        # Only the key is snapped; the search below always runs from the requested point
+        key = response_cache.key(
+            "ngos/nearby", (NGOS,), lat=response_cache.snap(lat), lng=response_cache.snap(lng),
+            radius_km=radius_km, k=k, available_only=available_only
         )
-    )
-    
-    # Filter by availability if requested
-    if available_only:
-        query = query.filter(NGO.is_available == True)
-    
-    # Order by distance and get results
-    results = query.order_by("distance_meters").all()
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
     
-    # Format results with distance in km
-    nearby_ngos = []
-    for ngo, distance_meters in results:
-        ngo_dict = {
-            "id": ngo.id,
-            "name": ngo.name,
-            "description": ngo.description,
-            "address": ngo.address,
-            "email": ngo.email,
-            "phone": ngo.phone,
-            "website": ngo.website,
-            "location": extract_point_from_wkb(ngo.location),
-            "is_available": ngo.is_available,
-            "verified": ngo.verified,
-            "created_at": ngo.created_at,
-            "updated_at": ngo.updated_at,
-            "distance_km": distance_meters / 1000  # Convert meters to km
-        }
-        nearby_ngos.append(ngo_dict)
+    # Serve from the in-memory catalog when it is enabled
+    if ngo_catalog.enabled:
+        records = ngo_catalog.nearby(
+            db,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            k=k,
+            available_only=available_only
+        )
+        if response_cache.enabled:
+            return response_cache.store(key, records)
+        return fast_response(records) if settings.FAST_JSON_ENABLED else records
     
-    return nearby_ngos
-
-def extract_point_from_wkb(wkb_point):
-    """Extract coordinates from WKB geometry"""
-    # This is a placeholder - in a real implementation,
-    # you'd use proper WKB parsing from PostGIS
-    # For now, we'll return a mock point
-    return {"type": "Point", "coordinates": [0, 0]}
-
-# app/routers/donations.py
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.models.donation import Donation, DonationStatus
-from app.models.ngo import NGO
-from app.schemas.donation import (
-    Donation as DonationSchema,
-    DonationCreate,
-    DonationUpdate,
-    DonationAssign
-)
-from app.services.notification_service import send_ngo_notification
-
-router = APIRouter(prefix="/donations", tags=["donations"])
-
-@router.post("/", response_model=DonationSchema)
-def create_donation(donation: DonationCreate, db: Session = Depends(get_db)):
-    """Create a new donation"""
-    # Convert GeoJSON Point to PostGIS geometry
-    location_geojson = donation.location.dict()
+    if settings.FAST_JSON_ENABLED or response_cache.enabled:
+        results = find_nearby_ngos(
+            db,
+            lat=lat,
+            lng=lng,
+            radius_km=radius_km,
+            k=k,
+            available_only=available_only,
+            columns=NGO_COLUMNS
+        )
+        records = [project_nearby_ngo(row) for row in results]
+        if response_cache.enabled:
+            return response_cache.store(key, records)
+        return fast_response(records)
     
-    db_donation = Donation(
-        title=donation.title,
-        description=donation.description,
-        donation_type=donation.donation_type,
-        donor_name=donation.donor_name,
-        donor_email=donation.donor_email,
-        donor_phone=donation.donor_phone,
-        address=donation.address,
-        location=f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})",
-        status=DonationStatus.PENDING
+    results = find_nearby_ngos(
+        db,
+        lat=lat,
+        lng=lng,
+        radius_km=radius_km,
+        k=k,
+        available_only=available_only
     )
     
-    db.add(db_donation)
-    db.commit()
-    db.refresh(db_donation)
-    return db_donation
-
-@router.get("/", response_model=List[DonationSchema])
-def get_donations(
-    skip: int = 0, 
-    limit: int = 100, 
-    status: str = None,
-    db: Session = Depends(get_db)
-):
-    """Get all donations with optional status filter"""
-    query = db.query(Donation)
-    
-    if status:
-        query = query.filter(Donation.status == status)
-    
-    return query.offset(skip).limit(limit).all()
-
-@router.get("/{donation_id}", response_model=DonationSchema)
-def get_donation(donation_id: int, db: Session = Depends(get_db)):
-    """Get a donation by ID"""
-    db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
-    if db_donation is None:
-        raise HTTPException(status_code=404, detail="Donation not found")
-    return db_donation
-
-@router.put("/{donation_id}", response_model=DonationSchema)
-def update_donation(donation_id: int, donation: DonationUpdate, db: Session = Depends(get_db)):
-    """Update a donation"""
-    db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
-    if db_donation is None:
-        raise HTTPException(status_code=404, detail="Donation not found")
-    
-    update_data = donation.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_donation, key, value)
-    
-    db.commit()
-    db.refresh(db_donation)
-    return db_donation
+    # Format results with distance in km
+    return [
+        {**ngo_record(ngo), "distance_km": distance_meters / 1000}
+        for ngo, distance_meters in results
+    ]
 
-@router.post("/{donation_id}/assign", response_model=DonationSchema)
-def assign_donation(
-    donation_id: int, 
-    assignment: DonationAssign, 
-    background_tasks: BackgroundTasks,
+@router.get("/nearby/clusters", response_model=NGOClusters)
+def get_nearby_clusters(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level the clusters are drawn at"),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, description="Search radius in kilometers"),
+    available_only: bool = Query(True, description="Filter only available NGOs"),
     db: Session = Depends(get_db)
 ):
-    """Assign a donation to an NGO"""
-    # Check if donation exists
-    db_donation = db.query(Donation).filter(Donation.id == donation_id).first()
-    if db_donation is None:
-        raise HTTPException(status_code=404, detail="Donation not found")
-    
-    # Check if donation is already assigned
-    if db_donation.status != DonationStatus.PENDING:
-        raise HTTPException(status_code=400, detail="Donation is not available for assignment")
-    
-    # Check if NGO exists
-    ngo = db.query(NGO).filter(NGO.id == assignment.ngo_id).first()
-    if ngo is None:
-        raise HTTPException(status_code=404, detail="NGO not found")
-    
-    # Check if NGO is available
-    if not ngo.is_available:
-        raise HTTPException(status_code=400, detail="NGO is not available")
-    
-    # Update donation
-    db_donation.ngo_id = ngo.id
-    db_donation.status = DonationStatus.ASSIGNED
-    
-    # Update NGO availability if needed
-    # ngo.is_available = False  # Optional: mark NGO as busy
-    
-    db.commit()
-    db.refresh(db_donation)
+    """Nearby NGOs grouped into grid cells sized for the zoom level, as centroids with counts"""
+    if response_cache.enabled:
+        key = response_cache.key(
+            "ngos/nearby/clusters", (NGOS,), lat=response_cache.snap(lat), lng=response_cache.snap(lng),
+            zoom=zoom, radius_km=radius_km, available_only=available_only
+        )
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
     
-    # Send notification to NGO (background task)
-    background_tasks.add_task(
-        send_ngo_notification,
-        ngo_email=ngo.email,
-        ngo_name=ngo.name,
-        donation_id=db_donation.id,
-        donation_title=db_donation.title,
-        donor_name=db_donation.donor_name
-    )
+    cell_degrees = cluster_cell_degrees(zoom, lat, radius_km)
+    if ngo_catalog.enabled:
+        clusters = ngo_catalog.clusters(db, lat, lng, radius_km, cell_degrees, available_only=available_only)
+    else:
+        clusters = find_nearby_clusters(db, lat, lng, radius_km, cell_degrees, available_only=available_only)
     
-    return db_donation
\ No newline at end of file
+    content = {"cell_degrees": cell_degrees, "total": sum(c["count"] for c in clusters), "clusters": clusters}
+    if response_cache.enabled:
+        return response_cache.store(key, content)
+    return fast_response(content) if settings.FAST_JSON_ENABLED else content
@@ -0,0 +1,266 @@
+# app/routers/ngos_async.py
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from app.core.conditional import etag_matches, not_modified, row_etag, rows_etag, set_validators
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import paginate, set_next_cursor
+from app.core.responses import fast_response
+from app.models.ngo import NGO
+from app.schemas.ngo import NGOCreate, NGO as NGOSchema, NGOUpdate, NGONearby, NGOClusters, NGOSearchResult
+from app.schemas.bulk import BulkCreateResult
+from app.routers.ngos import ngo_values
+from app.services.bulk_service import bulk_insert, validate_items
+from app.services.geocoding_queue import geocoding_queue
+from app.services.nearby_service import DEFAULT_RADIUS_KM, cluster_cell_degrees, nearby_clusters_statement, nearby_ngos_statement
+from app.services.ngo_catalog import ngo_catalog, ngo_record
+from app.services.projections import NGO_COLUMNS, project_ngo, project_nearby_ngo
+from app.services.response_cache import NGOS, response_cache
+from app.services.search_service import ngo_search_statement, project_ngo_result, validate_point
+
+# Async twin of app/routers/ngos.py, used when DATABASE_ASYNC is on
+router = APIRouter(prefix="/ngos", tags=["ngos"])
+
+@router.post("/", response_model=NGOSchema)
+async def create_ngo(ngo: NGOCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new NGO"""
+    db_ngo = NGO(**ngo_values(ngo))
+
+    db.add(db_ngo)
+    await db.commit()
+    await db.refresh(db_ngo)
+
+    ngo_catalog.upsert(ngo_record(db_ngo))
+    await response_cache.ainvalidate((NGOS,))
+    geocoding_queue.enqueue_verify("ngos", db_ngo.id, db_ngo.address)
+    return db_ngo
+
+@router.post("/bulk", response_model=BulkCreateResult)
+async def create_ngos_bulk(items: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """Create many NGOs at once, reporting the outcome of each item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+    rows, errors = validate_items(items, NGOCreate, ngo_values)
+    result = await db.run_sync(lambda session: bulk_insert(session, NGO, rows, errors))
+    geocoding_queue.enqueue_bulk_verify("ngos", rows, result)
+
+    # Reload rather than decode every new row into the catalog
+    if result["created"]:
+        ngo_catalog.invalidate()
+        await response_cache.ainvalidate((NGOS,))
+    return result
+
+@router.get("/", response_model=List[NGOSchema])
+async def get_ngos(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all NGOs, oldest first; answers 304 when If-None-Match still matches the page"""
+    key = response_cache.key("ngos", (NGOS,), skip=skip, limit=limit, cursor=cursor)
+    cached = await response_cache.aget(key, request)
+    if cached is not None:
+        return cached
+
+    if request.headers.get("if-none-match"):
+        # Compare the page's versions before loading and serializing whole rows
+        result = await db.execute(paginate(select(NGO.id, NGO.created_at, NGO.updated_at), NGO, cursor, skip, limit))
+        versions = result.all()
+        etag = rows_etag(versions)
+        if etag_matches(request, etag):
+            set_next_cursor(response, versions, limit)
+            return not_modified(etag, settings.CACHE_CONTROL_NGO_LIST, response.headers)
+
+    if settings.FAST_JSON_ENABLED or response_cache.enabled:
+        result = await db.execute(paginate(select(*NGO_COLUMNS), NGO, cursor, skip, limit))
+        rows = result.all()
+        set_next_cursor(response, rows, limit)
+        set_validators(response, rows_etag(rows), settings.CACHE_CONTROL_NGO_LIST)
+        records = [project_ngo(row) for row in rows]
+        if response_cache.enabled:
+            return await response_cache.astore(key, records, response.headers)
+        return fast_response(records, response.headers)
+
+    result = await db.execute(paginate(select(NGO), NGO, cursor, skip, limit))
+    ngos = result.scalars().all()
+    set_next_cursor(response, ngos, limit)
+    set_validators(response, rows_etag(ngos), settings.CACHE_CONTROL_NGO_LIST)
+    return ngos
+
+@router.get("/search", response_model=List[NGOSearchResult])
+async def search_ngos(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in the name or description; supports \"phrases\", or, -word"),
+    lat: Optional[float] = Query(None, description="Latitude; with lng, limits the search to radius_km around the point"),
+    lng: Optional[float] = Query(None, description="Longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km)"),
+    available_only: bool = Query(False, description="Filter only available NGOs"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over NGO names and descriptions, best match first"""
+    validate_point(lat, lng)
+    stmt = ngo_search_statement(q, lat=lat, lng=lng, radius_km=radius_km, available_only=available_only, limit=limit)
+    records = [project_ngo_result(row) for row in (await db.execute(stmt))]
+    return fast_response(records) if settings.FAST_JSON_ENABLED else records
+
+@router.get("/{ngo_id}", response_model=NGOSchema)
+async def get_ngo(ngo_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Get an NGO by ID; answers 304 when If-None-Match still matches"""
+    if request.headers.get("if-none-match"):
+        # Only the version is read until we know the body is needed
+        version = (await db.execute(select(NGO.updated_at).where(NGO.id == ngo_id))).first()
+        if version is None:
+            raise HTTPException(status_code=404, detail="NGO not found")
+        etag = row_etag(ngo_id, version.updated_at)
+        if etag_matches(request, etag):
+            return not_modified(etag, settings.CACHE_CONTROL_NGO_DETAIL)
+
+    db_ngo = await db.get(NGO, ngo_id)
+    if db_ngo is None:
+        raise HTTPException(status_code=404, detail="NGO not found")
+    set_validators(response, row_etag(db_ngo.id, db_ngo.updated_at), settings.CACHE_CONTROL_NGO_DETAIL)
+    return db_ngo
+
+@router.put("/{ngo_id}", response_model=NGOSchema)
+async def update_ngo(ngo_id: int, ngo: NGOUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update an NGO"""
+    db_ngo = await db.get(NGO, ngo_id)
+    if db_ngo is None:
+        raise HTTPException(status_code=404, detail="NGO not found")
+
+    update_data = ngo.dict(exclude_unset=True)
+
+    # Handle location separately if provided
+    location_geojson = update_data.pop("location", None)
+    if location_geojson:
+        db_ngo.location = f"SRID=4326;POINT({location_geojson['coordinates'][0]} {location_geojson['coordinates'][1]})"
+
+    # Re-verify when the address or the point moves
+    reverify = bool(location_geojson) or "address" in update_data
+    if reverify:
+        db_ngo.geocode_status = None
+        db_ngo.geocoded_address = None
+
+    # Update other fields
+    for key, value in update_data.items():
+        setattr(db_ngo, key, value)
+
+    await db.commit()
+    await db.refresh(db_ngo)
+
+    ngo_catalog.upsert(ngo_record(db_ngo))
+    await response_cache.ainvalidate((NGOS,))
+    if reverify:
+        geocoding_queue.enqueue_verify("ngos", db_ngo.id, db_ngo.address)
+    return db_ngo
+
+@router.delete("/{ngo_id}", status_code=204)
+async def delete_ngo(ngo_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete an NGO"""
+    db_ngo = await db.get(NGO, ngo_id)
+    if db_ngo is None:
+        raise HTTPException(status_code=404, detail="NGO not found")
+
+    await db.delete(db_ngo)
+    await db.commit()
+
+    ngo_catalog.remove(ngo_id)
+    await response_cache.ainvalidate((NGOS,))
+    return None
+
+@router.get("/nearby/", response_model=List[NGONearby])
+async def get_nearby_ngos(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (defaults to 10 km unless k is given)"),
+    k: Optional[int] = Query(None, ge=1, le=500, description="Return only the k nearest NGOs"),
+    available_only: bool = Query(True, description="Filter only available NGOs"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Find NGOs within a specified radius, or the k nearest"""
+    if response_cache.enabled:
+        # Only the key is snapped; the search below always runs from the requested point
+        key = response_cache.key(
+            "ngos/nearby", (NGOS,), lat=response_cache.snap(lat), lng=response_cache.snap(lng),
+            radius_km=radius_km, k=k, available_only=available_only
+        )
+        cached = await response_cache.aget(key)
+        if cached is not None:
+            return cached
+
+    # Serve from the in-memory catalog when it is enabled; a stale catalog
+    # reloads through the session's sync facade
+    if ngo_catalog.enabled:
+        records = await db.run_sync(
+            lambda session: ngo_catalog.nearby(
+                session,
+                lat=lat,
+                lng=lng,
+                radius_km=radius_km,
+                k=k,
+                available_only=available_only
+            )
+        )
+        if response_cache.enabled:
+            return await response_cache.astore(key, records)
+        return fast_response(records) if settings.FAST_JSON_ENABLED else records
+
+    if settings.FAST_JSON_ENABLED or response_cache.enabled:
+        result = await db.execute(
+            nearby_ngos_statement(lat, lng, radius_km=radius_km, k=k, available_only=available_only, columns=NGO_COLUMNS)
+        )
+        records = [project_nearby_ngo(row) for row in result.all()]
+        if response_cache.enabled:
+            return await response_cache.astore(key, records)
+        return fast_response(records)
+
+    result = await db.execute(
+        nearby_ngos_statement(lat, lng, radius_km=radius_km, k=k, available_only=available_only)
+    )
+
+    # Format results with distance in km
+    return [
+        {**ngo_record(ngo), "distance_km": distance_meters / 1000}
+        for ngo, distance_meters in result.all()
+    ]
+
+@router.get("/nearby/clusters", response_model=NGOClusters)
+async def get_nearby_clusters(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level the clusters are drawn at"),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, description="Search radius in kilometers"),
+    available_only: bool = Query(True, description="Filter only available NGOs"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Nearby NGOs grouped into grid cells sized for the zoom level, as centroids with counts"""
+    if response_cache.enabled:
+        key = response_cache.key(
+            "ngos/nearby/clusters", (NGOS,), lat=response_cache.snap(lat), lng=response_cache.snap(lng),
+            zoom=zoom, radius_km=radius_km, available_only=available_only
+        )
+        cached = await response_cache.aget(key)
+        if cached is not None:
+            return cached
+
+    cell_degrees = cluster_cell_degrees(zoom, lat, radius_km)
+    if ngo_catalog.enabled:
+        clusters = await db.run_sync(
+            lambda session: ngo_catalog.clusters(session, lat, lng, radius_km, cell_degrees, available_only=available_only)
+        )
+    else:
+        result = await db.execute(
+            nearby_clusters_statement(lat, lng, radius_km, cell_degrees, available_only=available_only)
+        )
+        clusters = [dict(row._mapping) for row in result]
+
+    content = {"cell_degrees": cell_degrees, "total": sum(c["count"] for c in clusters), "clusters": clusters}
+    if response_cache.enabled:
+        return await response_cache.astore(key, content)
+    return fast_response(content) if settings.FAST_JSON_ENABLED else content
@@ -0,0 +1,53 @@
+# app/routers/tiles_async.py
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.conditional import CACHE_CONTROL_HEADER, ETAG_HEADER, etag_matches, not_modified
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models.donation import DonationStatus, DonationType
+from app.services.response_cache import response_cache
+from app.services.tile_service import (
+    LAYERS, MVT_MEDIA_TYPE, join_tile, parse_layers, tile_etag, tile_statement, validate_tile
+)
+
+# Async twin of app/routers/tiles.py, used when DATABASE_ASYNC is on
+router = APIRouter(prefix="/tiles", tags=["tiles"])
+
+@router.get("/{z}/{x}/{y}.mvt", response_class=Response, responses={200: {"content": {MVT_MEDIA_TYPE: {}}}})
+async def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    layers: str = Query("donations,ngos", description="Comma-separated layers: donations, ngos"),
+    status: Optional[DonationStatus] = Query(None, description="Donations with this status"),
+    donation_type: Optional[DonationType] = Query(None, description="Donations of this type"),
+    ngo_id: Optional[int] = Query(None, description="Donations assigned to this NGO"),
+    available: Optional[bool] = Query(None, description="NGOs that are (or are not) available"),
+    verified: Optional[bool] = Query(None, description="NGOs that are (or are not) verified"),
+    accepts: Optional[DonationType] = Query(None, description="NGOs that accept this donation type"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mapbox vector tile with donation and NGO points, filtered like the list endpoints"""
+    validate_tile(z, x, y)
+    names = parse_layers(layers)
+    filters = dict(
+        status=status, donation_type=donation_type, ngo_id=ngo_id,
+        available=available, verified=verified, accepts=accepts
+    )
+    key = response_cache.key(
+        "tiles", [LAYERS[name] for name in names], z=z, x=x, y=y, layers=",".join(names), **filters
+    )
+    cached = await response_cache.aget(key, request)
+    if cached is not None:
+        return cached
+
+    tile = join_tile((await db.execute(tile_statement(z, x, y, names, **filters))).one())
+    etag = tile_etag(tile)
+    headers = {ETAG_HEADER: etag, CACHE_CONTROL_HEADER: settings.CACHE_CONTROL_TILES}
+    if response_cache.enabled:
+        await response_cache.astore(key, tile, {**headers, "Content-Type": MVT_MEDIA_TYPE})
+    if etag_matches(request, etag):
+        return not_modified(etag, settings.CACHE_CONTROL_TILES)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
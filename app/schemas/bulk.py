@@ -0,0 +1,18 @@
+# app/schemas/bulk.py
+from pydantic import BaseModel
+from typing import Any, List, Optional
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    errors: Optional[List[Any]] = None
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
+
+class BulkAssignResult(BaseModel):
+    assigned: int
+    failed: int
+    results: List[BulkItemResult]
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List
 from datetime import datetime
 from geojson_pydantic import Point
+from app.core.geometry import point_to_geojson
 from enum import Enum
 
 class DonationStatus(str, Enum):
@@ -39,18 +40,38 @@ class DonationUpdate(BaseModel):
     status: Optional[DonationStatus] = None
     ngo_id: Optional[int] = None
 
+    @validator("donation_type", "status", pre=True)
+    def not_null(cls, value):
+        # Omit the field to leave it unchanged; a donation always has a type and status
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 class DonationInDB(DonationBase):
     id: int
     status: DonationStatus
     ngo_id: Optional[int] = None
+    geocode_status: Optional[str] = None
+    geocoded_address: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
+    # ORM rows carry the raw PostGIS point; decode it in Python
+    _decode_location = validator("location", pre=True, allow_reuse=True)(point_to_geojson)
+
     class Config:
         orm_mode = True
 
 class Donation(DonationInDB):
     pass
 
+class DonationSearchResult(Donation):
+    rank: float
+    # Set when the search was limited to a radius around a point
+    distance_km: Optional[float] = None
+
 class DonationAssign(BaseModel):
-    ngo_id: int
\ No newline at end of file
+    ngo_id: int
+
+class DonationBulkAssign(DonationAssign):
+    donation_id: int
\ No newline at end of file
@@ -0,0 +1,17 @@
+# app/schemas/matching.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class AutoMatchAssignment(BaseModel):
+    donation_id: int
+    ngo_id: int
+    distance_km: float
+
+class AutoMatchResult(BaseModel):
+    pending: int
+    matched: int
+    unmatched: int
+    total_distance_km: float
+    dry_run: bool
+    elapsed_ms: float
+    assignments: Optional[List[AutoMatchAssignment]] = None
@@ -1,8 +1,10 @@
 # app/schemas/ngo.py
-from pydantic import BaseModel, EmailStr, HttpUrl, Field
+from pydantic import BaseModel, EmailStr, HttpUrl, Field, validator
 from typing import Optional, List, Tuple
 from datetime import datetime
 from geojson_pydantic import Point
+from app.core.geometry import point_to_geojson
+from app.schemas.donation import DonationType
 
 class NGOBase(BaseModel):
     name: str
@@ -12,6 +14,11 @@ class NGOBase(BaseModel):
     phone: Optional[str] = None
     website: Optional[HttpUrl] = None
     location: Point
+    capacity: Optional[int] = Field(None, ge=0)
+    accepted_donation_types: Optional[List[DonationType]] = None
+
+    class Config:
+        use_enum_values = True
 
 class NGOCreate(NGOBase):
     pass
@@ -26,19 +33,49 @@ class NGOUpdate(BaseModel):
     location: Optional[Point] = None
     is_available: Optional[bool] = None
     verified: Optional[bool] = None
+    capacity: Optional[int] = Field(None, ge=0)
+    accepted_donation_types: Optional[List[DonationType]] = None
+
+    class Config:
+        use_enum_values = True
 
 class NGOInDB(NGOBase):
     id: int
     is_available: bool
     verified: bool
+    geocode_status: Optional[str] = None
+    geocoded_address: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
+    # ORM rows carry the raw PostGIS point; decode it in Python
+    _decode_location = validator("location", pre=True, allow_reuse=True)(point_to_geojson)
+
     class Config:
         orm_mode = True
+        use_enum_values = True
 
 class NGO(NGOInDB):
     pass
 
 class NGONearby(NGO):
-    distance_km: float
\ No newline at end of file
+    distance_km: float
+
+class NGOSearchResult(NGO):
+    rank: float
+    # Set when the search was limited to a radius around a point
+    distance_km: Optional[float] = None
+
+class NGOCluster(BaseModel):
+    # Centroid of the NGOs in the cell
+    latitude: float
+    longitude: float
+    count: int
+    available: int
+    # Set when the cell holds a single NGO
+    ngo_id: Optional[int] = None
+
+class NGOClusters(BaseModel):
+    cell_degrees: float
+    total: int
+    clusters: List[NGOCluster]
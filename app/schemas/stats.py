@@ -0,0 +1,22 @@
+# app/schemas/stats.py
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+
+class NGODonationCount(BaseModel):
+    # None groups the donations without an NGO
+    ngo_id: Optional[int] = None
+    total: int
+    by_status: Dict[str, int]
+
+class DonationStatsSummary(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_type: Dict[str, int]
+    by_ngo: List[NGODonationCount]
+
+class DonationStatsPoint(BaseModel):
+    bucket: date
+    total: int
+    by_status: Dict[str, int]
+    by_type: Dict[str, int]
@@ -0,0 +1,128 @@
+# app/services/assignment_service.py
+from typing import List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Date, Integer, cast, column, func, insert, literal, literal_column, select, union_all, update, values
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus
+from app.models.ngo import NGO
+from app.models.outbox import NotificationOutbox
+from app.services.outbox_service import NGO_ASSIGNMENT
+from app.services.projections import DONATION_COLUMNS
+from app.services.stats_service import delta_insert
+
+def _matches(pairs: Sequence[Tuple[int, int]]):
+    return values(column("donation_id", Integer), column("ngo_id", Integer), name="matches").data(list(pairs))
+
+def assignment_statement(pairs: Sequence[Tuple[int, int]]):
+    """
+    Assign (donation_id, ngo_id) pairs and queue their notifications in one statement.
+
+    The UPDATE only touches donations that are still pending and only joins
+    NGOs that are available, so the check and the write are a single atomic
+    step: of two concurrent requests for the same donation, the second one
+    re-checks the row after the first commits and updates nothing. The
+    outbox rows and the donation stats deltas are written by further CTEs
+    from the RETURNING rows. The statement returns one row per assigned
+    donation with the NGO's name and email and the donation's previous
+    ngo_id appended.
+    """
+    matches = _matches(pairs)
+    # Joining the table to itself exposes the pre-update values to RETURNING
+    previous = Donation.__table__.alias("previous")
+    # Target the Core table: an ORM-enabled UPDATE drops the add_cte() siblings below
+    assigned = (
+        update(Donation.__table__)
+        .where(
+            Donation.id == matches.c.donation_id,
+            Donation.status == DonationStatus.PENDING,
+            previous.c.id == Donation.id,
+            NGO.id == matches.c.ngo_id,
+            NGO.is_available.is_(True)
+        )
+        .values(ngo_id=NGO.id, status=DonationStatus.ASSIGNED)
+        .returning(
+            *DONATION_COLUMNS,
+            NGO.name.label("ngo_name"),
+            NGO.email.label("ngo_email"),
+            previous.c.ngo_id.label("previous_ngo_id")
+        )
+        .cte("assigned")
+    )
+    # Keys are constants; rendered inline so no driver has to guess the type of a bare text parameter
+    payload = func.jsonb_build_object(
+        literal_column("'ngo_id'"), assigned.c.ngo_id,
+        literal_column("'ngo_email'"), assigned.c.ngo_email,
+        literal_column("'ngo_name'"), assigned.c.ngo_name,
+        literal_column("'donation_id'"), assigned.c.id,
+        literal_column("'donation_title'"), assigned.c.title,
+        literal_column("'donor_name'"), assigned.c.donor_name
+    )
+    queued = (
+        insert(NotificationOutbox)
+        .from_select(
+            ["kind", "recipient", "payload"],
+            select(literal_column(f"'{NGO_ASSIGNMENT}'"), assigned.c.ngo_email, payload)
+        )
+        .cte("queued")
+    )
+    # Each assigned donation moves from (pending, previous NGO) to (assigned, new NGO)
+    status_type = Donation.__table__.c.status.type
+    day = cast(assigned.c.created_at, Date).label("day")
+    deltas = union_all(
+        select(
+            day,
+            cast(literal(DonationStatus.PENDING, status_type), status_type).label("status"),
+            assigned.c.donation_type,
+            assigned.c.previous_ngo_id.label("ngo_id"),
+            literal_column("-1").label("delta")
+        ),
+        select(day, assigned.c.status, assigned.c.donation_type, assigned.c.ngo_id, literal_column("1").label("delta"))
+    ).cte("assignment_deltas")
+    return select(assigned).add_cte(queued).add_cte(delta_insert(deltas).cte("counted"))
+
+def conflict_statement(pairs: Sequence[Tuple[int, int]]):
+    """Current donation status and NGO availability for pairs that were not assigned"""
+    matches = _matches(pairs)
+    return (
+        select(matches.c.donation_id, matches.c.ngo_id, Donation.status, NGO.is_available)
+        .select_from(
+            matches
+            .outerjoin(Donation, Donation.id == matches.c.donation_id)
+            .outerjoin(NGO, NGO.id == matches.c.ngo_id)
+        )
+    )
+
+def conflict_error(status: Optional[DonationStatus], ngo_available: Optional[bool]) -> HTTPException:
+    """Why an assignment did not happen, as the error the single-assign endpoint raises"""
+    if status is None:
+        return HTTPException(status_code=404, detail="Donation not found")
+    if ngo_available is None:
+        return HTTPException(status_code=404, detail="NGO not found")
+    if status != DonationStatus.PENDING:
+        return HTTPException(status_code=409, detail="Donation is not available for assignment")
+    if not ngo_available:
+        return HTTPException(status_code=409, detail="NGO is not available")
+    # Both looked fine by the time we checked: another request won the race and then released it
+    return HTTPException(status_code=409, detail="Donation was modified concurrently, retry the assignment")
+
+def assignment_results(pairs: List[Tuple[int, int]], assigned_rows, conflict_rows) -> dict:
+    """Per-item outcome of a bulk assignment, in request order"""
+    assigned = {row.id for row in assigned_rows}
+    conflicts = {row.donation_id: conflict_error(row.status, row.is_available) for row in conflict_rows}
+    results = []
+    for index, (donation_id, ngo_id) in enumerate(pairs):
+        if donation_id in assigned:
+            results.append({"index": index, "id": donation_id})
+        else:
+            error = conflicts[donation_id]
+            results.append({"index": index, "id": donation_id, "errors": [{"status_code": error.status_code, "detail": error.detail}]})
+    return {"assigned": len(assigned), "failed": len(pairs) - len(assigned), "results": results}
+
+def bulk_assignment_pairs(assignments) -> List[Tuple[int, int]]:
+    """(donation_id, ngo_id) pairs from a bulk-assign request, rejecting oversized or ambiguous requests"""
+    if len(assignments) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    pairs = [(item.donation_id, item.ngo_id) for item in assignments]
+    if len({donation_id for donation_id, _ in pairs}) < len(pairs):
+        raise HTTPException(status_code=400, detail="Each donation may appear only once per request")
+    return pairs
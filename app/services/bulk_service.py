@@ -0,0 +1,78 @@
+# app/services/bulk_service.py
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def validate_items(
+    items: List[Dict[str, Any]],
+    schema: Type[BaseModel],
+    to_row: Callable[[BaseModel], dict]
+) -> Tuple[List[Tuple[int, dict]], Dict[int, list]]:
+    """
+    Validate each raw item on its own so one bad item does not reject the batch.
+    Returns the (index, column values) pairs to insert and the errors by index.
+    """
+    rows = []
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            rows.append((index, to_row(schema.parse_obj(item))))
+        except ValidationError as e:
+            errors[index] = e.errors()
+    return rows, errors
+
+def reserve_ids(db: Session, model, count: int) -> List[int]:
+    """Draw ``count`` values from the sequence behind ``model.id``"""
+    sequence = func.pg_get_serial_sequence(model.__tablename__, "id")
+    return list(db.execute(select(func.nextval(sequence)).select_from(func.generate_series(1, count))).scalars())
+
+def bulk_insert(
+    db: Session,
+    model,
+    rows: List[Tuple[int, dict]],
+    errors: Dict[int, list],
+    on_insert: Optional[Callable[[Session, List[int]], None]] = None
+) -> dict:
+    """
+    Insert validated rows with one multi-row INSERT per chunk.
+
+    Ids are drawn from the table's sequence first and written explicitly, so
+    each item's id is known without relying on the order of RETURNING rows,
+    which Postgres does not guarantee. Each chunk runs in a savepoint, so a
+    database error only fails the items of that chunk; the rest of the batch
+    is still committed. ``on_insert`` runs inside the same savepoint with the
+    chunk's new ids.
+    """
+    ids = {}
+    chunk_size = settings.BULK_INSERT_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            with db.begin_nested():
+                chunk_ids = reserve_ids(db, model, len(chunk))
+                db.execute(
+                    insert(model).values([{**values, "id": row_id} for (_, values), row_id in zip(chunk, chunk_ids)])
+                )
+                if on_insert is not None:
+                    on_insert(db, chunk_ids)
+                for (index, _), row_id in zip(chunk, chunk_ids):
+                    ids[index] = row_id
+        except DBAPIError as e:
+            logger.warning(f"Bulk insert into {model.__tablename__} failed for {len(chunk)} rows: {e.orig}")
+            for index, _ in chunk:
+                errors[index] = [{"msg": str(e.orig).strip()}]
+    db.commit()
+
+    results = []
+    for index in sorted(set(ids) | set(errors)):
+        if index in ids:
+            results.append({"index": index, "id": ids[index]})
+        else:
+            results.append({"index": index, "errors": errors[index]})
+    return {"created": len(ids), "failed": len(results) - len(ids), "results": results}
@@ -0,0 +1,97 @@
+# app/services/export_service.py
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+from app.core.database import SessionLocal
+from app.core.geometry import decode_point
+from app.models.donation import Donation, DonationStatus, DonationType
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "id", "title", "description", "donation_type", "donor_name", "donor_email",
+    "donor_phone", "address", "longitude", "latitude", "status", "ngo_id",
+    "created_at", "updated_at",
+]
+
+def _plain(value):
+    if isinstance(value, (DonationStatus, DonationType)):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def iter_donation_rows(
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    ngo_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Iterator[dict]:
+    """
+    Yield matching donations as flat dicts, streamed from a server-side cursor.
+
+    Only the exported columns are selected (no ORM identity map), and rows are
+    pulled EXPORT_BATCH_SIZE at a time, so memory stays flat regardless of how
+    many rows match. The generator owns its session because it outlives the
+    request handler that created the StreamingResponse.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Donation.id, Donation.title, Donation.description, Donation.donation_type,
+            Donation.donor_name, Donation.donor_email, Donation.donor_phone,
+            Donation.address, Donation.location, Donation.status, Donation.ngo_id,
+            Donation.created_at, Donation.updated_at
+        )
+        if status:
+            query = query.filter(Donation.status == status)
+        if donation_type:
+            query = query.filter(Donation.donation_type == donation_type)
+        if ngo_id is not None:
+            query = query.filter(Donation.ngo_id == ngo_id)
+        if created_from:
+            query = query.filter(Donation.created_at >= created_from)
+        if created_to:
+            query = query.filter(Donation.created_at < created_to)
+
+        query = query.order_by(Donation.created_at, Donation.id).yield_per(EXPORT_BATCH_SIZE)
+        for row in query:
+            record = {key: _plain(value) for key, value in row._asdict().items() if key != "location"}
+            point = decode_point(row.location)
+            record["longitude"], record["latitude"] = point if point else (None, None)
+            yield record
+    finally:
+        db.close()
+
+# Flush output in chunks rather than one tiny write per row
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+def ndjson_lines(rows: Iterator[dict]) -> Iterator[str]:
+    chunk = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield "".join(chunk)
+
+def csv_lines(rows: Iterator[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
\ No newline at end of file
@@ -0,0 +1,217 @@
+# app/services/gazetteer.py
+import csv
+import gzip
+import logging
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Address keys kept per place, in the order format_address reads them
+ADDRESS_FIELDS = ("road", "suburb", "city", "town", "county", "state", "postcode", "country", "country_code")
+
+# GeoNames dump columns (cities500.txt, allCountries.txt): tab separated, no header
+GEONAMES_NAME = 1
+GEONAMES_LATITUDE = 4
+GEONAMES_LONGITUDE = 5
+GEONAMES_COUNTRY = 8
+GEONAMES_ADMIN1 = 10
+GEONAMES_ADMIN2 = 11
+
+# GeoNames code -> name tables looked up next to the dump; columns are code, name
+GEONAMES_ADMIN1_NAMES = "admin1CodesASCII.txt"  # "US.CA"
+GEONAMES_ADMIN2_NAMES = "admin2Codes.txt"  # "US.CA.075"
+GEONAMES_COUNTRY_NAMES = "countryInfo.txt"  # "US", name in column 4
+
+def _open(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+def _read_code_names(path: str, name_column: int = 1) -> Dict[str, str]:
+    """Code -> name from a GeoNames lookup table; empty when the file is missing"""
+    if not os.path.exists(path):
+        logger.warning(f"{os.path.basename(path)} not found next to the gazetteer; those address parts stay empty")
+        return {}
+    names = {}
+    with _open(path) as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) > name_column and row[0] and not row[0].startswith("#"):
+                names[row[0]] = row[name_column]
+    return names
+
+def _unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    lat, lng = math.radians(latitude), math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return cos_lat * math.cos(lng), cos_lat * math.sin(lng), math.sin(lat)
+
+def _chord_to_km(chord_squared: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord_squared) / 2))
+
+class Gazetteer:
+    """
+    Offline reverse geocoder over a local list of places.
+
+    Places are stored as unit vectors on the sphere, so straight-line (chord)
+    distance orders them exactly like great-circle distance and there is no
+    special case at the antimeridian. The KD-tree is implicit: coordinates are
+    permuted into tree order in flat ``array('d')`` buffers and the node for a
+    range is its midpoint, so there are no per-node objects. A nearest-place
+    lookup touches a few dozen entries.
+
+    Accepted inputs are GeoNames dumps (``.txt``/``.tsv``, optionally gzipped)
+    or a CSV with a header containing ``latitude``, ``longitude`` and any of
+    ``name``, ``display_name`` and the ADDRESS_FIELDS columns. A GeoNames
+    dump's country and admin codes are resolved to names through the GeoNames
+    lookup tables in the same directory.
+    """
+
+    def __init__(self, path: Optional[str], max_distance_km: float):
+        self.path = path
+        self.max_distance_km = max_distance_km
+        self.loaded = False
+        self._xs = array("d")
+        self._ys = array("d")
+        self._zs = array("d")
+        self._names: List[str] = []
+        self._addresses: List[tuple] = []
+        self.stats = {"places": 0, "hits": 0, "low_confidence": 0, "load_seconds": 0.0}
+
+    def warm_up(self):
+        """Load the configured gazetteer at startup; without GAZETTEER_PATH every lookup goes to Nominatim"""
+        if self.path:
+            self.load(self.path)
+
+    def load(self, path: str):
+        began = time.perf_counter()
+        if path.endswith((".txt", ".tsv", ".txt.gz", ".tsv.gz")):
+            places = self._read_geonames(path)
+        else:
+            places = self._read_csv(path)
+        self._build(places)
+        self.stats["load_seconds"] = round(time.perf_counter() - began, 3)
+        logger.info(f"Loaded {self.stats['places']} gazetteer places in {self.stats['load_seconds']} s")
+
+    def _read_geonames(self, path: str) -> List[tuple]:
+        # The dump only carries codes; names come from the lookup tables beside it
+        directory = os.path.dirname(path)
+        admin1_names = _read_code_names(os.path.join(directory, GEONAMES_ADMIN1_NAMES))
+        admin2_names = _read_code_names(os.path.join(directory, GEONAMES_ADMIN2_NAMES))
+        country_names = _read_code_names(os.path.join(directory, GEONAMES_COUNTRY_NAMES), name_column=4)
+        places = []
+        with _open(path) as f:
+            for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if len(row) <= GEONAMES_ADMIN2:
+                    continue
+                name = row[GEONAMES_NAME]
+                country = row[GEONAMES_COUNTRY]
+                admin1 = f"{country}.{row[GEONAMES_ADMIN1]}"
+                address = {
+                    "city": name,
+                    "county": admin2_names.get(f"{admin1}.{row[GEONAMES_ADMIN2]}"),
+                    "state": admin1_names.get(admin1),
+                    "country": country_names.get(country),
+                    "country_code": country.lower(),
+                }
+                places.append((float(row[GEONAMES_LATITUDE]), float(row[GEONAMES_LONGITUDE]), name, address))
+        return places
+
+    def _read_csv(self, path: str) -> List[tuple]:
+        places = []
+        with _open(path) as f:
+            for row in csv.DictReader(f):
+                address = {key: row[key] for key in ADDRESS_FIELDS if row.get(key)}
+                name = row.get("display_name") or row.get("name") or ""
+                places.append((float(row["latitude"]), float(row["longitude"]), name, address))
+        return places
+
+    def _build(self, places: List[tuple]):
+        vectors = [_unit_vector(lat, lng) for lat, lng, _, _ in places]
+        order = list(range(len(places)))
+
+        # Median split on x, y, z in turn; ranges are processed iteratively
+        stack = [(0, len(order), 0)]
+        while stack:
+            lo, hi, axis = stack.pop()
+            if hi - lo <= 1:
+                continue
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: vectors[i][axis])
+            mid = (lo + hi) // 2
+            next_axis = (axis + 1) % 3
+            stack.append((lo, mid, next_axis))
+            stack.append((mid + 1, hi, next_axis))
+
+        self._xs = array("d", (vectors[i][0] for i in order))
+        self._ys = array("d", (vectors[i][1] for i in order))
+        self._zs = array("d", (vectors[i][2] for i in order))
+        self._names = []
+        self._addresses = []
+        for i in order:
+            _, _, name, address = places[i]
+            self._names.append(name)
+            # Tuples in field order are far smaller than one dict per place
+            self._addresses.append(tuple(address.get(key) or None for key in ADDRESS_FIELDS))
+        self.stats["places"] = len(order)
+        self.loaded = bool(order)
+
+    def nearest(self, latitude: float, longitude: float) -> Optional[Tuple[int, float]]:
+        """Position of the nearest place in tree order and its distance in km"""
+        if not self.loaded:
+            return None
+        query = _unit_vector(latitude, longitude)
+        qx, qy, qz = query
+        axes = (self._xs, self._ys, self._zs)
+        xs, ys, zs = axes
+        best, best_d2 = -1, math.inf
+
+        # (lo, hi, axis, squared distance from the query to this range's half-space)
+        stack = [(0, len(xs), 0, 0.0)]
+        while stack:
+            lo, hi, axis, bound = stack.pop()
+            if lo >= hi or bound >= best_d2:
+                continue
+            mid = (lo + hi) // 2
+            dx, dy, dz = xs[mid] - qx, ys[mid] - qy, zs[mid] - qz
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 < best_d2:
+                best, best_d2 = mid, d2
+            diff = query[axis] - axes[axis][mid]
+            next_axis = (axis + 1) % 3
+            if diff < 0:
+                stack.append((mid + 1, hi, next_axis, diff * diff))
+                stack.append((lo, mid, next_axis, 0.0))
+            else:
+                stack.append((lo, mid, next_axis, diff * diff))
+                stack.append((mid + 1, hi, next_axis, 0.0))
+        return best, _chord_to_km(best_d2)
+
+    def reverse(self, latitude: float, longitude: float) -> Optional[dict]:
+        """
+        Nearest place in the shape returned by Nominatim's reverse endpoint,
+        or None when there is no place within max_distance_km.
+        """
+        found = self.nearest(latitude, longitude)
+        if found is None:
+            return None
+        position, distance_km = found
+        if distance_km > self.max_distance_km:
+            self.stats["low_confidence"] += 1
+            return None
+        self.stats["hits"] += 1
+        address = {key: value for key, value in zip(ADDRESS_FIELDS, self._addresses[position]) if value}
+        display_name = self._names[position]
+        if not display_name or display_name == address.get("city"):
+            parts = [address.get(key) for key in ("city", "town", "county", "state", "country")]
+            display_name = ", ".join(part for part in parts if part)
+        return {"display_name": display_name, "address": address}
+
+gazetteer = Gazetteer(
+    path=settings.GAZETTEER_PATH,
+    max_distance_km=settings.GAZETTEER_MAX_DISTANCE_KM
+)
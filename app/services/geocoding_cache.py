@@ -0,0 +1,155 @@
+# app/services/geocoding_cache.py
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CachedFailure:
+    """Negative cache entry: the upstream error to replay until it expires"""
+
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+
+class GeocodingCache:
+    """
+    Reverse-geocoding results keyed on coordinates quantized to ``precision``
+    decimal places (4 places is roughly an 11 m cell).
+
+    The memory tier is an LRU with a TTL per entry; failures are cached for a
+    shorter ``negative_ttl``. When ``sqlite_path`` is set, successful results
+    are also written to a SQLite file so they survive restarts. Only the
+    memory tier is touched on the event loop; SQLite reads, writes and
+    commits run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        precision: int,
+        max_entries: int,
+        ttl: float,
+        negative_ttl: float,
+        sqlite_path: Optional[str] = None
+    ):
+        self.precision = precision
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection across worker threads
+        self._db_lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        self._db = None
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def quantize(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    def key(self, latitude: float, longitude: float) -> str:
+        lat, lng = self.quantize(latitude, longitude)
+        return f"{lat:.{self.precision}f},{lng:.{self.precision}f}"
+
+    async def get(self, key: str):
+        """Return the cached result, a CachedFailure, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats["negative_hits" if isinstance(value, CachedFailure) else "hits"] += 1
+                    return value
+                del self._entries[key]
+                self.stats["expirations"] += 1
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._load, key)
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                with self._lock:
+                    self._store(key, value, row[1])
+                    self.stats["disk_hits"] += 1
+                return value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._persist, key, json.dumps(value), expires_at)
+
+    def _load(self, key: str):
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT value, expires_at FROM geocode_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _persist(self, key: str, value: str, expires_at: float):
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist geocoding result: {e}")
+
+    def set_failure(self, key: str, status_code: int, detail: str):
+        with self._lock:
+            self._store(key, CachedFailure(status_code, detail), time.time() + self.negative_ttl)
+
+    def _store(self, key: str, value, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["negative_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hit_ratio = (lookups - self.stats["misses"]) / lookups if lookups else 0.0
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_ratio": hit_ratio,
+                "persistent": self._db is not None,
+            }
+
+geocoding_cache = GeocodingCache(
+    precision=settings.GEOCODE_CACHE_PRECISION,
+    max_entries=settings.GEOCODE_CACHE_MAX_ENTRIES,
+    ttl=settings.GEOCODE_CACHE_TTL_SECONDS,
+    negative_ttl=settings.GEOCODE_CACHE_NEGATIVE_TTL_SECONDS,
+    sqlite_path=settings.GEOCODE_CACHE_SQLITE_PATH
+)
\ No newline at end of file
@@ -0,0 +1,193 @@
+# app/services/geocoding_client.py
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import aiohttp
+from fastapi import HTTPException
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class UpstreamError(HTTPException):
+    """An error status answered by Nominatim itself, as opposed to a local timeout or rate-limit rejection"""
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``.
+
+    Background callers only take a token while no interactive caller is
+    waiting, so a queue backlog cannot starve user requests of the shared
+    upstream budget.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._interactive_waiters = 0
+
+    async def acquire(self, background: bool = False):
+        if self.rate <= 0:
+            return
+        if not background:
+            self._interactive_waiters += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # No await between the check and the take, so the loop needs no lock
+                if self._tokens >= 1 and (not background or self._interactive_waiters == 0):
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(max(1 - self._tokens, 1 if background else 0) / self.rate)
+        finally:
+            if not background:
+                self._interactive_waiters -= 1
+
+class NominatimClient:
+    """
+    Application-lifetime HTTP client for Nominatim.
+
+    One aiohttp session keeps connections alive across requests. Identical
+    lookups that are already in flight share the same upstream call. A
+    semaphore bounds how many calls run at once, and every upstream call takes
+    a token from the bucket so the process stays within Nominatim's usage
+    policy. Interactive calls take precedence over ``background`` ones for
+    tokens and wait at most ``max_wait`` seconds for one before failing with
+    503; an interactive call that joins a background lookup in flight waits
+    no longer than its own call could have taken. Point NOMINATIM_BASE_URL at
+    a local stub to run without the public service.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        user_agent: str,
+        timeout: float,
+        max_connections: int,
+        max_concurrency: int,
+        rate_limiter: TokenBucket,
+        max_wait: float
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.max_wait = max_wait
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # key -> (shared lookup, whether it was started at background priority)
+        self._inflight: Dict[str, Tuple[asyncio.Future, bool]] = {}
+        self.stats = {"upstream_requests": 0, "coalesced": 0, "errors": 0, "timeouts": 0, "rate_limited": 0}
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _acquire(self, background: bool):
+        """Wait for a token outside the semaphore, so waiting does not hold a connection slot"""
+        if background:
+            await self.rate_limiter.acquire(background=True)
+            return
+        try:
+            await asyncio.wait_for(self.rate_limiter.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.stats["rate_limited"] += 1
+            raise HTTPException(status_code=503, detail="Geocoding service is busy, try again later")
+
+    async def _get_json(self, path: str, params: dict, error_detail: str, background: bool = False):
+        await self.start()
+        await self._acquire(background)
+        async with self._semaphore:
+            self.stats["upstream_requests"] += 1
+            try:
+                async with self._session.get(f"{self.base_url}{path}", params=params) as response:
+                    if response.status != 200:
+                        self.stats["errors"] += 1
+                        raise UpstreamError(
+                            status_code=response.status,
+                            detail=error_detail
+                        )
+                    return await response.json(content_type=None)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise HTTPException(status_code=504, detail="Geocoding service timed out")
+            except aiohttp.ClientError as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Geocoding request failed: {e}")
+                raise HTTPException(status_code=502, detail="Geocoding service unavailable")
+            except ValueError as e:
+                # A 200 that is not JSON, e.g. a proxy's HTML error page
+                self.stats["errors"] += 1
+                logger.warning(f"Geocoding response was not valid JSON: {e}")
+                raise HTTPException(status_code=502, detail="Geocoding service unavailable")
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable], background: bool):
+        """Run fetch once per key at a time; concurrent callers await the same result"""
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats["coalesced"] += 1
+        else:
+            flight = (asyncio.ensure_future(fetch()), background)
+            self._inflight[key] = flight
+            flight[0].add_done_callback(lambda t: self._finish(key, t))
+        task, flight_background = flight
+        # Shield so one caller disconnecting does not cancel the shared lookup
+        if background or not flight_background:
+            return await asyncio.shield(task)
+        # The background lookup may wait behind every interactive caller for a
+        # token; bound this caller as if it had made the call itself
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.max_wait + self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["rate_limited"] += 1
+            raise HTTPException(status_code=503, detail="Geocoding service is busy, try again later")
+
+    def _finish(self, key: str, task: asyncio.Future):
+        flight = self._inflight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    async def reverse(self, latitude: float, longitude: float, background: bool = False) -> dict:
+        params = {"lat": latitude, "lon": longitude, "format": "json", "addressdetails": 1}
+        return await self._single_flight(
+            f"reverse:{latitude},{longitude}",
+            lambda: self._get_json("/reverse", params, "Failed to retrieve address from coordinates", background),
+            background
+        )
+
+    async def search(self, query: str, background: bool = False) -> list:
+        params = {"q": query, "format": "json", "limit": 1, "addressdetails": 1}
+        return await self._single_flight(
+            f"search:{query}",
+            lambda: self._get_json("/search", params, "Failed to retrieve coordinates for address", background),
+            background
+        )
+
+nominatim_client = NominatimClient(
+    base_url=settings.NOMINATIM_BASE_URL,
+    user_agent=settings.NOMINATIM_USER_AGENT,
+    timeout=settings.NOMINATIM_TIMEOUT_SECONDS,
+    max_connections=settings.NOMINATIM_MAX_CONNECTIONS,
+    max_concurrency=settings.NOMINATIM_MAX_CONCURRENCY,
+    rate_limiter=TokenBucket(settings.NOMINATIM_RATE_PER_SECOND, settings.NOMINATIM_BURST),
+    max_wait=settings.NOMINATIM_MAX_WAIT_SECONDS
+)
\ No newline at end of file
@@ -0,0 +1,196 @@
+# app/services/geocoding_queue.py
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import case, func, update
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.geometry import decode_point
+from app.models.donation import Donation
+from app.models.ngo import NGO
+from app.services.geocoding_cache import geocoding_cache
+from app.services.geocoding_service import (
+    format_address, forward_geocode, normalize_address, reverse_geocode
+)
+from app.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# geocode_status values written back onto donations and NGOs
+GEOCODE_VERIFIED = "verified"
+GEOCODE_MISMATCH = "mismatch"
+GEOCODE_UNMATCHED = "unmatched"
+GEOCODE_FAILED = "failed"
+
+MODELS = {"donations": Donation, "ngos": NGO}
+
+class GeocodingJob:
+    """One upstream lookup and every row waiting on its result"""
+
+    def __init__(self, kind: str, key: str, query):
+        self.kind = kind
+        self.key = key
+        self.query = query
+        self.targets: Dict[str, List[int]] = {}
+
+    def add_target(self, table: str, row_id: int):
+        self.targets.setdefault(table, []).append(row_id)
+
+class GeocodingQueue:
+    """
+    Background geocoding for rows created through the API.
+
+    ``verify`` jobs forward-geocode a row's address and compare the match with
+    the row's stored location; ``reverse`` jobs fill in a canonical address for
+    rows whose address could not be matched. Pending jobs are keyed by the
+    normalized address (or the cache cell for reverse lookups), so a bulk import
+    of 1000 donations from one warehouse costs one upstream call. Upstream calls
+    go through the shared Nominatim client at background priority, so user
+    lookups are served first from the same token bucket; results are
+    written back in batches from a worker thread.
+    """
+
+    def __init__(self, enabled: bool, write_batch: int, max_distance_m: float):
+        self.enabled = enabled
+        self.write_batch = write_batch
+        self.max_distance_m = max_distance_m
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Dict[str, GeocodingJob] = {}
+        self._writes: List[tuple] = []
+        self._worker: Optional[asyncio.Task] = None
+        self.stats = {"enqueued": 0, "deduplicated": 0, "processed": 0, "rows_written": 0}
+
+    async def start(self):
+        if not self.enabled or self._worker is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        await self._flush()
+
+    def enqueue_verify(self, table: str, row_id: int, address: str):
+        """Queue address verification for a row; safe to call from any thread"""
+        self._submit("verify", f"verify:{normalize_address(address)}", address, table, row_id)
+
+    def enqueue_bulk_verify(self, table: str, rows: List[Tuple[int, dict]], result: dict):
+        """Queue address verification for every row a bulk insert created"""
+        addresses = {index: values["address"] for index, values in rows}
+        for item in result["results"]:
+            if item.get("id") is not None:
+                self.enqueue_verify(table, item["id"], addresses[item["index"]])
+
+    def enqueue_reverse(self, table: str, row_id: int, longitude: float, latitude: float):
+        """Queue a reverse lookup that fills geocoded_address; safe to call from any thread"""
+        key = f"reverse:{geocoding_cache.key(latitude, longitude)}"
+        self._submit("reverse", key, (latitude, longitude), table, row_id)
+
+    def _submit(self, kind: str, key: str, query, table: str, row_id: int):
+        if self._loop is None:
+            return
+        # Sync routes run in the threadpool; hop onto the loop that owns the queue
+        self._loop.call_soon_threadsafe(self._add, kind, key, query, table, row_id)
+
+    def _add(self, kind: str, key: str, query, table: str, row_id: int):
+        self.stats["enqueued"] += 1
+        job = self._pending.get(key)
+        if job is not None:
+            self.stats["deduplicated"] += 1
+        else:
+            job = GeocodingJob(kind, key, query)
+            self._pending[key] = job
+            self._queue.put_nowait(key)
+        job.add_target(table, row_id)
+
+    async def _run(self):
+        while True:
+            key = await self._queue.get()
+            job = self._pending.pop(key)
+            try:
+                self._writes.extend(await self._process(job))
+            except Exception:
+                logger.exception(f"Geocoding job {key} failed")
+            self.stats["processed"] += 1
+            if len(self._writes) >= self.write_batch or self._queue.empty():
+                await self._flush()
+
+    async def _process(self, job: GeocodingJob) -> List[tuple]:
+        if job.kind == "verify":
+            try:
+                match = await forward_geocode(job.query, background=True)
+            except HTTPException:
+                return [("status", table, ids, GEOCODE_FAILED) for table, ids in job.targets.items()]
+            if match is None:
+                return [("unmatched", table, ids, None) for table, ids in job.targets.items()]
+            return [("verify", table, ids, match) for table, ids in job.targets.items()]
+
+        latitude, longitude = job.query
+        try:
+            result = await reverse_geocode(latitude, longitude, background=True)
+        except HTTPException:
+            return []
+        address = format_address(result) or result["display_name"]
+        return [("reverse", table, ids, address) for table, ids in job.targets.items()]
+
+    async def _flush(self):
+        if not self._writes:
+            return
+        writes, self._writes = self._writes, []
+        try:
+            follow_ups = await asyncio.to_thread(self._write, writes)
+        except Exception:
+            logger.exception(f"Failed to write {len(writes)} geocoding results")
+            return
+        for table, row_id, longitude, latitude in follow_ups:
+            self._add("reverse", f"reverse:{geocoding_cache.key(latitude, longitude)}", (latitude, longitude), table, row_id)
+
+    def _write(self, writes: List[tuple]) -> List[Tuple[str, int, float, float]]:
+        """Apply results in one transaction; returns rows that need a reverse lookup"""
+        follow_ups = []
+        db = SessionLocal()
+        try:
+            for op, table, ids, value in writes:
+                model = MODELS[table]
+                stmt = update(model).where(model.id.in_(ids))
+                if op == "verify":
+                    point = func.geography(func.ST_SetSRID(func.ST_MakePoint(value["longitude"], value["latitude"]), 4326))
+                    within = func.ST_DWithin(func.geography(model.location), point, self.max_distance_m)
+                    stmt = stmt.values(
+                        geocode_status=case((within, GEOCODE_VERIFIED), else_=GEOCODE_MISMATCH),
+                        geocoded_address=value["display_name"][:255]
+                    )
+                elif op == "reverse":
+                    stmt = stmt.where(model.geocoded_address.is_(None)).values(geocoded_address=value[:255])
+                elif op == "unmatched":
+                    stmt = stmt.values(geocode_status=GEOCODE_UNMATCHED)
+                    for row_id, location in db.query(model.id, model.location).filter(model.id.in_(ids)):
+                        point = decode_point(location)
+                        if point is not None:
+                            follow_ups.append((table, row_id, point[0], point[1]))
+                else:
+                    stmt = stmt.values(geocode_status=value)
+                db.execute(stmt)
+                self.stats["rows_written"] += len(ids)
+            db.commit()
+            # Tags are named after the tables
+            response_cache.invalidate({table for _, table, _, _ in writes})
+        finally:
+            db.close()
+        return follow_ups
+
+geocoding_queue = GeocodingQueue(
+    enabled=settings.GEOCODE_QUEUE_ENABLED,
+    write_batch=settings.GEOCODE_QUEUE_WRITE_BATCH,
+    max_distance_m=settings.GEOCODE_VERIFY_MAX_DISTANCE_M
+)
\ No newline at end of file
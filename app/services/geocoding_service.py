@@ -1,30 +1,79 @@
 # app/services/geocoding.py
-import aiohttp
-import json
 from fastapi import HTTPException
-from app.config import settings
+from app.services.gazetteer import gazetteer
+from app.services.geocoding_cache import CachedFailure, geocoding_cache
+from app.services.geocoding_client import UpstreamError, nominatim_client
 
-async def reverse_geocode(latitude: float, longitude: float):
-    """Convert latitude and longitude to address using Nominatim."""
-    url = f"https://nominatim.openstreetmap.org/reverse?lat={latitude}&lon={longitude}&format=json&addressdetails=1"
-    
-    headers = {
-        "User-Agent": settings.nominatim_user_agent
+def _remember_failure(key: str, error: HTTPException):
+    """
+    Negatively cache answers from Nominatim, but not local rejections (rate
+    limit, timeout, connection failure) or an upstream 429, which say nothing
+    about the lookup and clear up on their own.
+    """
+    if isinstance(error, UpstreamError) and error.status_code != 429:
+        geocoding_cache.set_failure(key, error.status_code, error.detail)
+
+async def _fetch_reverse(latitude: float, longitude: float, background: bool = False):
+    """Call Nominatim's reverse endpoint for one coordinate pair."""
+    data = await nominatim_client.reverse(latitude, longitude, background)
+    return {
+        "display_name": data.get("display_name", ""),
+        "address": data.get("address", {})
     }
+
+def normalize_address(address: str) -> str:
+    """Case- and whitespace-insensitive form of an address, used for dedup and caching."""
+    return " ".join(address.lower().split())
+
+async def forward_geocode(address: str, background: bool = False):
+    """Convert an address to coordinates using Nominatim, through the cache. Returns None if not found."""
+    key = f"search:{normalize_address(address)}"
+    cached = await geocoding_cache.get(key)
+    if isinstance(cached, CachedFailure):
+        raise HTTPException(status_code=cached.status_code, detail=cached.detail)
+    if cached is not None:
+        return cached or None
+    
+    try:
+        results = await nominatim_client.search(normalize_address(address), background)
+    except HTTPException as e:
+        _remember_failure(key, e)
+        raise
+    
+    # An empty dict caches "no match" as well
+    result = {}
+    if results:
+        result = {
+            "display_name": results[0].get("display_name", ""),
+            "latitude": float(results[0]["lat"]),
+            "longitude": float(results[0]["lon"])
+        }
+    await geocoding_cache.set(key, result)
+    return result or None
+
+async def reverse_geocode(latitude: float, longitude: float, background: bool = False):
+    """Convert latitude and longitude to address, from the local gazetteer when it is confident, else Nominatim through the cache."""
+    result = gazetteer.reverse(latitude, longitude)
+    if result is not None:
+        return result
+    
+    key = geocoding_cache.key(latitude, longitude)
+    cached = await geocoding_cache.get(key)
+    if isinstance(cached, CachedFailure):
+        raise HTTPException(status_code=cached.status_code, detail=cached.detail)
+    if cached is not None:
+        return cached
+    
+    # Look up the cell itself so the cached answer is the same for every hit
+    lat, lng = geocoding_cache.quantize(latitude, longitude)
+    try:
+        result = await _fetch_reverse(lat, lng, background)
+    except HTTPException as e:
+        _remember_failure(key, e)
+        raise
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            if response.status == 200:
-                data = await response.json()
-                return {
-                    "display_name": data.get("display_name", ""),
-                    "address": data.get("address", {})
-                }
-            else:
-                raise HTTPException(
-                    status_code=response.status,
-                    detail="Failed to retrieve address from coordinates"
-                )
+    await geocoding_cache.set(key, result)
+    return result
 
 def format_address(geocoding_result):
     """Format address from geocoding result into a readable string."""
@@ -0,0 +1,167 @@
+# app/services/mail_delivery.py
+import logging
+import random
+import smtplib
+import time
+from email.message import Message
+from typing import List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection is dropped and the message retried
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+class PooledSMTPConnection:
+    """One authenticated SMTP session, reopened when it goes stale or has sent enough"""
+
+    def __init__(self, engine: "MailDeliveryEngine"):
+        self.engine = engine
+        self.server: Optional[smtplib.SMTP] = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def ensure_open(self):
+        engine = self.engine
+        if self.server is not None:
+            if self.sent >= engine.max_messages_per_connection:
+                self.close()
+            elif time.monotonic() - self.last_used > engine.idle_timeout:
+                # The server may have dropped an idle session; probe before reusing it
+                try:
+                    if self.server.noop()[0] != 250:
+                        self.close()
+                except TRANSIENT_ERRORS:
+                    self.close()
+        if self.server is None:
+            server = smtplib.SMTP(engine.host, engine.port, timeout=engine.timeout)
+            try:
+                if engine.use_tls:
+                    server.starttls()
+                if engine.user and engine.password:
+                    server.login(engine.user, engine.password)
+            except Exception:
+                server.close()
+                raise
+            self.server = server
+            self.sent = 0
+            engine.stats["connections_opened"] += 1
+
+    def send(self, message: Message):
+        self.ensure_open()
+        self.server.send_message(message)
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = None
+
+class MailDeliveryEngine:
+    """
+    Delivery policy for outgoing email over long-lived SMTP connections.
+
+    Callers own the connections (the outbox worker keeps one per thread), so
+    STARTTLS and AUTH are paid once per connection instead of once per
+    message. A dropped connection or a 4xx reply closes the connection and
+    the message is retried with exponential backoff; 5xx replies and any
+    other error (e.g. a server without STARTTLS) are permanent, and the
+    message is reported as failed. Connections idle for longer than
+    ``idle_timeout`` are probed before reuse.
+
+    Point SMTP_SERVER/SMTP_PORT at a local sink (``python -m aiosmtpd -n -l
+    localhost:8025``, SMTP_TLS=False) to exercise it end to end.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool,
+        user: Optional[str],
+        password: Optional[str],
+        max_messages_per_connection: int,
+        idle_timeout: float,
+        timeout: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.user = user
+        self.password = password
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {"sent": 0, "failed": 0, "retries": 0, "connections_opened": 0, "batches": 0}
+
+    @classmethod
+    def from_settings(cls, **overrides) -> "MailDeliveryEngine":
+        options = dict(
+            host=settings.SMTP_SERVER,
+            port=settings.SMTP_PORT,
+            use_tls=settings.SMTP_TLS,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            max_messages_per_connection=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+            max_retries=settings.SMTP_MAX_RETRIES,
+            backoff_base=settings.SMTP_BACKOFF_BASE_SECONDS,
+            backoff_max=settings.SMTP_BACKOFF_MAX_SECONDS
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    def send_batch(self, connection: PooledSMTPConnection, messages: List[Message]) -> List[bool]:
+        """Deliver messages over one connection; returns per-message success"""
+        self.stats["batches"] += 1
+        return [self._deliver(connection, message) for message in messages]
+
+    def _deliver(self, connection: PooledSMTPConnection, message: Message) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                connection.send(message)
+                self.stats["sent"] += 1
+                return True
+            except smtplib.SMTPRecipientsRefused as e:
+                logger.error(f"Recipients refused for {message['To']}: {e.recipients}")
+                break
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code < 400 or e.smtp_code >= 500:
+                    logger.error(f"Permanent SMTP error {e.smtp_code} sending to {message['To']}: {e.smtp_error!r}")
+                    break
+                error = e
+            except smtplib.SMTPNotSupportedError as e:
+                # STARTTLS/AUTH configured against a server without the extension; retrying cannot help
+                logger.error(f"SMTP server does not support the configured session: {e}")
+                connection.close()
+                break
+            except TRANSIENT_ERRORS as e:
+                error = e
+            except Exception as e:
+                # E.g. a message send_message cannot serialize; never let it kill the caller's thread
+                logger.error(f"Could not send email to {message['To']}: {e!r}")
+                connection.close()
+                break
+            connection.close()
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                logger.warning(f"SMTP delivery to {message['To']} failed ({error}); retrying in {delay:.1f} s")
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            else:
+                logger.error(f"Giving up on email to {message['To']} after {attempt + 1} attempts: {error}")
+        self.stats["failed"] += 1
+        return False
+
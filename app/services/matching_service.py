@@ -0,0 +1,280 @@
+# app/services/matching_service.py
+"""
+Batch auto-matching of pending donations to available NGOs.
+
+    python -m app.services.matching_service [--max-distance-km 25] [--dry-run]
+"""
+import argparse
+import logging
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geometry import decode_points
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.models.ngo import NGO
+from app.services.assignment_service import assignment_statement
+from app.services.ngo_catalog import EARTH_RADIUS_KM
+
+logger = logging.getLogger(__name__)
+
+DONATION_TYPES = list(DonationType)
+
+# Arbitrary constant for pg_try_advisory_xact_lock; one committing run at a time
+AUTO_MATCH_LOCK_KEY = 0x4D41544348
+
+# Donations x NGOs similarities computed per block, bounding the matrix to about 32 MB
+MATRIX_BLOCK_ELEMENTS = 4_000_000
+
+# Assignments per UPDATE ... FROM (VALUES ...) statement
+UPDATE_CHUNK_SIZE = 5000
+
+def _unit_vectors(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """Points on the unit sphere (radians in); a larger dot product means a shorter distance"""
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+def _haversine_km(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Element-wise great-circle distance in km (radians in)"""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def _nearest_candidates(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    donation_xyz: np.ndarray,
+    ngo_xyz: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The k nearest of ``cols`` for every donation in ``rows``, as parallel index arrays"""
+    k = min(k, len(cols))
+    block = max(1, MATRIX_BLOCK_ELEMENTS // len(cols))
+    edge_rows, edge_cols = [], []
+    for start in range(0, len(rows), block):
+        chunk = rows[start:start + block]
+        # One BLAS matrix product ranks every NGO for the whole block
+        similarity = donation_xyz[chunk] @ ngo_xyz[cols].T
+        if k < len(cols):
+            nearest = np.argpartition(similarity, len(cols) - k, axis=1)[:, -k:]
+        else:
+            nearest = np.broadcast_to(np.arange(len(cols)), similarity.shape)
+        edge_rows.append(np.repeat(chunk, k))
+        edge_cols.append(cols[nearest].ravel())
+    return np.concatenate(edge_rows), np.concatenate(edge_cols)
+
+def plan_assignments(
+    donation_lat: np.ndarray,
+    donation_lng: np.ndarray,
+    donation_type: np.ndarray,
+    ngo_lat: np.ndarray,
+    ngo_lng: np.ndarray,
+    ngo_capacity: np.ndarray,
+    ngo_accepts: np.ndarray,
+    max_distance_km: float,
+    candidates: int,
+    max_rounds: int = 4
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Assign donations to NGOs, approximately minimizing total distance.
+
+    Coordinates are in degrees; ``donation_type`` holds indexes into
+    DONATION_TYPES, ``ngo_capacity`` the remaining slots per NGO (negative
+    for unlimited) and ``ngo_accepts`` is an NGOs x types boolean matrix.
+
+    Each round finds the ``candidates`` nearest compatible NGOs with spare
+    capacity for every unmatched donation, then takes candidate pairs in
+    order of increasing distance while capacity lasts (greedy min-cost
+    matching). Donations that lost out to capacity are retried in the next
+    round against the NGOs that still have room, with a wider candidate list.
+    Returns parallel arrays of donation indexes, NGO indexes and distances.
+    """
+    remaining = np.where(ngo_capacity < 0, np.iinfo(np.int64).max, ngo_capacity).astype(np.int64)
+    lat, lng = np.radians(donation_lat), np.radians(donation_lng)
+    ngo_lat, ngo_lng = np.radians(ngo_lat), np.radians(ngo_lng)
+    donation_xyz = _unit_vectors(lat, lng)
+    ngo_xyz = _unit_vectors(ngo_lat, ngo_lng)
+
+    matched_donation, matched_ngo, matched_distance = [], [], []
+    unmatched = np.arange(len(lat))
+    for round_number in range(max_rounds):
+        if len(unmatched) == 0 or not (remaining > 0).any():
+            break
+        k = candidates * 2 ** round_number
+
+        # Candidates per donation type, against only the NGOs that accept it
+        edge_rows, edge_cols = [], []
+        for type_index in np.unique(donation_type[unmatched]):
+            rows = unmatched[donation_type[unmatched] == type_index]
+            cols = np.flatnonzero((remaining > 0) & ngo_accepts[:, type_index])
+            if len(cols):
+                r, c = _nearest_candidates(rows, cols, donation_xyz, ngo_xyz, k)
+                edge_rows.append(r)
+                edge_cols.append(c)
+        if not edge_rows:
+            break
+        edge_rows = np.concatenate(edge_rows)
+        edge_cols = np.concatenate(edge_cols)
+        edge_distance = _haversine_km(lat[edge_rows], lng[edge_rows], ngo_lat[edge_cols], ngo_lng[edge_cols])
+        in_range = edge_distance <= max_distance_km
+        edge_rows, edge_cols, edge_distance = edge_rows[in_range], edge_cols[in_range], edge_distance[in_range]
+        order = np.argsort(edge_distance, kind="stable")
+
+        assigned = np.zeros(len(lat), dtype=bool)
+        round_matches = 0
+        for d, n, dist in zip(edge_rows[order].tolist(), edge_cols[order].tolist(), edge_distance[order].tolist()):
+            if assigned[d] or remaining[n] <= 0:
+                continue
+            assigned[d] = True
+            remaining[n] -= 1
+            matched_donation.append(d)
+            matched_ngo.append(n)
+            matched_distance.append(dist)
+            round_matches += 1
+
+        # Donations with no compatible NGO in range will not match in later rounds either
+        reachable = np.zeros(len(lat), dtype=bool)
+        reachable[edge_rows] = True
+        unmatched = unmatched[reachable[unmatched] & ~assigned[unmatched]]
+        if round_matches == 0:
+            break
+
+    return (
+        np.asarray(matched_donation, dtype=np.int64),
+        np.asarray(matched_ngo, dtype=np.int64),
+        np.asarray(matched_distance, dtype=np.float64),
+    )
+
+def _load_donations(db: Session, limit: Optional[int]):
+    query = (
+        select(Donation.id, Donation.location, Donation.donation_type)
+        .where(Donation.status == DonationStatus.PENDING)
+        .order_by(Donation.created_at, Donation.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return db.execute(query).all()
+
+def _load_ngos(db: Session):
+    rows = db.execute(
+        select(NGO.id, NGO.location, NGO.capacity, NGO.accepted_donation_types)
+        .where(NGO.is_available.is_(True))
+    ).all()
+    active = dict(db.execute(
+        select(Donation.ngo_id, func.count())
+        .where(Donation.status == DonationStatus.ASSIGNED, Donation.ngo_id.isnot(None))
+        .group_by(Donation.ngo_id)
+    ).all())
+    return rows, active
+
+def commit_assignments(db: Session, pairs: List[Tuple[int, int]]) -> List[int]:
+    """
+    Apply (donation_id, ngo_id) pairs and queue the NGO notifications, in
+    chunks of conditional UPDATE ... FROM (VALUES ...) statements inside the
+    caller's transaction. Donations that stopped being pending, or NGOs that
+    became unavailable, since they were read are skipped. Returns the ids
+    that were actually assigned.
+    """
+    assigned_ids = []
+    for start in range(0, len(pairs), UPDATE_CHUNK_SIZE):
+        rows = db.execute(assignment_statement(pairs[start:start + UPDATE_CHUNK_SIZE])).all()
+        assigned_ids.extend(row.id for row in rows)
+    return assigned_ids
+
+def run_auto_match(
+    db: Session,
+    max_distance_km: Optional[float] = None,
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    include_assignments: bool = False
+) -> dict:
+    """Match pending donations to available NGOs and, unless dry_run, commit the result"""
+    started = time.perf_counter()
+    max_distance_km = max_distance_km or settings.AUTO_MATCH_MAX_DISTANCE_KM
+
+    if not dry_run:
+        locked = db.execute(select(func.pg_try_advisory_xact_lock(AUTO_MATCH_LOCK_KEY))).scalar()
+        if not locked:
+            raise HTTPException(status_code=409, detail="Auto-matching is already running")
+
+    donation_rows = _load_donations(db, limit)
+    ngo_rows, active_counts = _load_ngos(db)
+
+    donation_points = decode_points(row.location for row in donation_rows)
+    donation_rows = [row for row, point in zip(donation_rows, donation_points) if point is not None]
+    donation_points = [point for point in donation_points if point is not None]
+    ngo_points = decode_points(row.location for row in ngo_rows)
+    ngo_rows = [row for row, point in zip(ngo_rows, ngo_points) if point is not None]
+    ngo_points = [point for point in ngo_points if point is not None]
+
+    result = {"pending": len(donation_rows), "matched": 0, "unmatched": len(donation_rows),
+              "total_distance_km": 0.0, "dry_run": dry_run, "assignments": None}
+    if donation_rows and ngo_rows:
+        type_index = {member: i for i, member in enumerate(DONATION_TYPES)}
+        accepts = np.ones((len(ngo_rows), len(DONATION_TYPES)), dtype=bool)
+        for i, row in enumerate(ngo_rows):
+            if row.accepted_donation_types is not None:
+                accepts[i] = [member.value in row.accepted_donation_types for member in DONATION_TYPES]
+        capacity = np.array([
+            -1 if row.capacity is None else max(0, row.capacity - active_counts.get(row.id, 0))
+            for row in ngo_rows
+        ], dtype=np.int64)
+        donation_xy = np.array(donation_points, dtype=np.float64)
+        ngo_xy = np.array(ngo_points, dtype=np.float64)
+
+        d_idx, n_idx, distance = plan_assignments(
+            donation_xy[:, 1], donation_xy[:, 0],
+            np.array([type_index[row.donation_type] for row in donation_rows], dtype=np.int64),
+            ngo_xy[:, 1], ngo_xy[:, 0],
+            capacity, accepts, max_distance_km, settings.AUTO_MATCH_CANDIDATES
+        )
+        pairs = [(donation_rows[d].id, ngo_rows[n].id) for d, n in zip(d_idx.tolist(), n_idx.tolist())]
+        distances = dict(zip((donation_id for donation_id, _ in pairs), distance.tolist()))
+
+        if not dry_run and pairs:
+            assigned_ids = set(commit_assignments(db, pairs))
+            db.commit()
+            pairs = [pair for pair in pairs if pair[0] in assigned_ids]
+
+        result["matched"] = len(pairs)
+        result["unmatched"] = len(donation_rows) - len(pairs)
+        result["total_distance_km"] = round(sum(distances[donation_id] for donation_id, _ in pairs), 3)
+        if include_assignments:
+            result["assignments"] = [
+                {"donation_id": donation_id, "ngo_id": ngo_id, "distance_km": round(distances[donation_id], 3)}
+                for donation_id, ngo_id in pairs
+            ]
+
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(
+        f"Auto-match {'planned' if dry_run else 'committed'} {result['matched']} of "
+        f"{result['pending']} pending donations in {result['elapsed_ms']} ms"
+    )
+    return result
+
+def main(argv=None):
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Match pending donations to available NGOs")
+    parser.add_argument("--max-distance-km", type=float, default=settings.AUTO_MATCH_MAX_DISTANCE_KM)
+    parser.add_argument("--limit", type=int, help="Only consider the oldest N pending donations")
+    parser.add_argument("--dry-run", action="store_true", help="Plan without writing anything")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db = SessionLocal()
+    try:
+        result = run_auto_match(db, args.max_distance_km, args.limit, args.dry_run)
+    finally:
+        db.close()
+    print(
+        f"{'Planned' if args.dry_run else 'Assigned'} {result['matched']} of {result['pending']} pending donations "
+        f"({result['unmatched']} unmatched, {result['total_distance_km']:.1f} km total) in {result['elapsed_ms']} ms"
+    )
+
+if __name__ == "__main__":
+    main()
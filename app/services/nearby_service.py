@@ -0,0 +1,134 @@
+# app/services/nearby_service.py
+import math
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.ngo import NGO
+
+# Default search radius when neither a radius nor a top-k limit is given
+DEFAULT_RADIUS_KM = 10.0
+
+# Mean length of one degree of latitude
+KM_PER_DEGREE = 111.195
+
+def user_geography(lat: float, lng: float):
+    """Build a geography point for the given WGS84 coordinates"""
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+
+def nearby_ngos_statement(
+    lat: float,
+    lng: float,
+    radius_km: Optional[float] = None,
+    k: Optional[int] = None,
+    available_only: bool = True,
+    columns: Optional[Sequence] = None
+):
+    """
+    Build the nearby NGO query, nearest first.
+
+    Both sides of the comparison use ``geography(location)`` so Postgres can
+    answer the radius filter and the ``<->`` ordering from the
+    ``idx_ngo_location_geography`` GIST index instead of scanning the table.
+    When ``k`` is given without a radius the query is a pure top-k KNN lookup.
+    Rows are (ngo, distance_meters) pairs, or the given ``columns`` followed
+    by distance_meters. The statement runs unchanged on a sync Session or an
+    AsyncSession.
+    """
+    if radius_km is None and k is None:
+        radius_km = DEFAULT_RADIUS_KM
+
+    ngo_geog = func.geography(NGO.location)
+    point = user_geography(lat, lng)
+
+    # Spheroidal distance is only computed for the rows that are returned
+    stmt = select(*(columns or (NGO,)), func.ST_Distance(ngo_geog, point).label("distance_meters"))
+
+    if radius_km is not None:
+        stmt = stmt.where(func.ST_DWithin(ngo_geog, point, radius_km * 1000))
+
+    if available_only:
+        stmt = stmt.where(NGO.is_available == True)
+
+    # Index-assisted KNN ordering
+    stmt = stmt.order_by(ngo_geog.op("<->")(point))
+
+    if k is not None:
+        stmt = stmt.limit(k)
+
+    return stmt
+
+def find_nearby_ngos(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius_km: Optional[float] = None,
+    k: Optional[int] = None,
+    available_only: bool = True,
+    columns: Optional[Sequence] = None
+) -> List[Tuple[NGO, float]]:
+    """Find NGOs around a point, nearest first, as (ngo, distance_meters) pairs"""
+    stmt = nearby_ngos_statement(lat, lng, radius_km=radius_km, k=k, available_only=available_only, columns=columns)
+    return db.execute(stmt).all()
+
+def cluster_cell_degrees(zoom: int, lat: float, radius_km: float) -> float:
+    """
+    Grid cell size in degrees for clustering at the given map zoom.
+
+    A cell is 1/NEARBY_CLUSTER_CELLS_PER_TILE of a web map tile wide. It is
+    widened when the search circle would cover more than
+    NEARBY_CLUSTER_MAX_CELLS cells, so the number of clusters returned stays
+    bounded whatever the zoom and radius.
+    """
+    cell = 360.0 / (1 << zoom) / settings.NEARBY_CLUSTER_CELLS_PER_TILE
+    # The circle spans more degrees of longitude than of latitude away from the equator
+    height = 2 * radius_km / KM_PER_DEGREE
+    width = min(height / max(math.cos(math.radians(lat)), 0.01), 360.0)
+    return max(cell, math.sqrt(height * width / settings.NEARBY_CLUSTER_MAX_CELLS))
+
+def nearby_clusters_statement(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    cell_degrees: float,
+    available_only: bool = True
+):
+    """
+    Build the clustered nearby query, largest cluster first.
+
+    NGOs within the radius are grouped by ``ST_SnapToGrid(location, cell)``;
+    each row is one cell with the centroid of its members (latitude,
+    longitude), count, how many of them are available and, for single-NGO
+    cells, the ngo_id. The radius filter uses the same geography GIST index
+    as ``nearby_ngos_statement``.
+    """
+    count = func.count()
+    stmt = (
+        select(
+            func.avg(func.ST_Y(NGO.location)).label("latitude"),
+            func.avg(func.ST_X(NGO.location)).label("longitude"),
+            count.label("count"),
+            func.count().filter(NGO.is_available == True).label("available"),
+            case((count == 1, func.min(NGO.id))).label("ngo_id")
+        )
+        .where(func.ST_DWithin(func.geography(NGO.location), user_geography(lat, lng), radius_km * 1000))
+        .group_by(func.ST_SnapToGrid(NGO.location, cell_degrees))
+        .order_by(count.desc())
+    )
+
+    if available_only:
+        stmt = stmt.where(NGO.is_available == True)
+
+    return stmt
+
+def find_nearby_clusters(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius_km: float,
+    cell_degrees: float,
+    available_only: bool = True
+) -> List[dict]:
+    """NGOs around a point grouped into grid cells, largest cluster first"""
+    stmt = nearby_clusters_statement(lat, lng, radius_km, cell_degrees, available_only=available_only)
+    return [dict(row._mapping) for row in db.execute(stmt)]
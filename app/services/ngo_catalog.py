@@ -0,0 +1,278 @@
+# app/services/ngo_catalog.py
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geometry import decode_point
+from app.models.ngo import NGO
+from app.services.nearby_service import DEFAULT_RADIUS_KM
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points (all in radians)"""
+    dlat = lats - lat
+    dlng = lngs - lng
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat) * np.cos(lats) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def ngo_record(ngo: NGO) -> dict:
+    """Compact response record for an NGO, shaped like the NGO schema"""
+    lng, lat = decode_point(ngo.location)
+    return {
+        "id": ngo.id,
+        "name": ngo.name,
+        "description": ngo.description,
+        "address": ngo.address,
+        "email": ngo.email,
+        "phone": ngo.phone,
+        "website": ngo.website,
+        "location": {"type": "Point", "coordinates": [lng, lat]},
+        "is_available": ngo.is_available,
+        "verified": ngo.verified,
+        "capacity": ngo.capacity,
+        "accepted_donation_types": ngo.accepted_donation_types,
+        "created_at": ngo.created_at,
+        "updated_at": ngo.updated_at,
+    }
+
+class NGOCatalog:
+    """
+    In-memory copy of the NGO table for nearby lookups.
+
+    Coordinates live in NumPy arrays bucketed into a uniform lat/lng grid, so a
+    radius query only computes haversine distances for the cells overlapping
+    the search box. Writes made through this process are applied to the record
+    map straight away and the arrays are rebuilt lazily on the next query.
+    Writes from other workers become visible once the snapshot is older than
+    ``max_age`` seconds and is reloaded.
+
+    Distances are spherical, so they can differ from PostGIS spheroidal
+    distances by up to about 0.5%.
+    """
+
+    def __init__(self, enabled: bool, max_age: int, cell_degrees: float):
+        self.enabled = enabled
+        self.max_age = max_age
+        self.cell_degrees = cell_degrees
+        self._lock = threading.RLock()
+        self._records: Dict[int, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._dirty = True
+        self._rows: List[dict] = []
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lat = np.empty(0)
+        self._lng = np.empty(0)
+        self._available = np.empty(0, dtype=bool)
+        self._cells: Dict[tuple, np.ndarray] = {}
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    def load(self, db: Session):
+        """Replace the snapshot with the current contents of the NGO table"""
+        records = {ngo.id: ngo_record(ngo) for ngo in db.query(NGO).all()}
+        with self._lock:
+            self._records = records
+            self._loaded_at = time.monotonic()
+            self._dirty = True
+        logger.info(f"NGO catalog loaded with {len(records)} NGOs")
+
+    def warm_up(self, session_factory):
+        """Load the catalog at startup so the first request does not pay for it"""
+        if not self.enabled:
+            return
+        db = session_factory()
+        try:
+            self.load(db)
+        finally:
+            db.close()
+
+    def invalidate(self):
+        """Force a reload on the next query"""
+        with self._lock:
+            self._loaded_at = None
+
+    def upsert(self, record: dict):
+        """Insert or replace one NGO record after a committed write"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._records[record["id"]] = record
+            self._dirty = True
+
+    def remove(self, ngo_id: int):
+        """Drop one NGO record after a committed delete"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._records.pop(ngo_id, None) is not None:
+                self._dirty = True
+
+    def _cell_of(self, lat_deg, lng_deg):
+        return (
+            np.floor(np.asarray(lat_deg) / self.cell_degrees).astype(np.int64),
+            np.floor(np.asarray(lng_deg) / self.cell_degrees).astype(np.int64),
+        )
+
+    def _rebuild(self):
+        rows = list(self._records.values())
+        lng_deg = np.array([r["location"]["coordinates"][0] for r in rows], dtype=np.float64)
+        lat_deg = np.array([r["location"]["coordinates"][1] for r in rows], dtype=np.float64)
+        self._rows = rows
+        self._ids = np.array([r["id"] for r in rows], dtype=np.int64)
+        self._lat = np.radians(lat_deg)
+        self._lng = np.radians(lng_deg)
+        self._available = np.array([bool(r["is_available"]) for r in rows], dtype=bool)
+
+        # Group row indices by grid cell
+        cells = {}
+        if rows:
+            ci, cj = self._cell_of(lat_deg, lng_deg)
+            keys = ci * 1_000_003 + cj
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts, ends):
+                idx = order[start]
+                cells[(int(ci[idx]), int(cj[idx]))] = order[start:end]
+        self._cells = cells
+        self._dirty = False
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Row indices in the grid cells overlapping the search bounding box"""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = math.cos(math.radians(lat))
+        if abs(lat) + dlat >= 90 or cos_lat < 1e-6:
+            return np.arange(len(self._rows))
+        dlng = min(dlat / cos_lat, 180.0)
+
+        i0, i1 = self._cell_of([lat - dlat, lat + dlat], 0)[0]
+        j0, j1 = self._cell_of(0, [lng - dlng, lng + dlng])[1]
+        lng_cells = int(round(360 / self.cell_degrees))
+        if (i1 - i0 + 1) * (j1 - j0 + 1) >= len(self._cells):
+            return np.arange(len(self._rows))
+
+        parts = []
+        for i in range(int(i0), int(i1) + 1):
+            for j in range(int(j0), int(j1) + 1):
+                # Wrap around the antimeridian
+                jj = (j + lng_cells // 2) % lng_cells - lng_cells // 2
+                cell = self._cells.get((i, jj))
+                if cell is not None:
+                    parts.append(cell)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def nearby(
+        self,
+        db: Session,
+        lat: float,
+        lng: float,
+        radius_km: Optional[float] = None,
+        k: Optional[int] = None,
+        available_only: bool = True
+    ) -> List[dict]:
+        """
+        Same contract as ``find_nearby_ngos`` but answered from memory.
+        Returns NGO records with a ``distance_km`` key, nearest first.
+        """
+        if self.is_stale:
+            self.load(db)
+        if radius_km is None and k is None:
+            radius_km = DEFAULT_RADIUS_KM
+
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            if radius_km is not None:
+                idx = self._candidates(lat, lng, radius_km)
+            else:
+                idx = np.arange(len(self._rows))
+            if available_only:
+                idx = idx[self._available[idx]]
+
+            distances = haversine_km(math.radians(lat), math.radians(lng), self._lat[idx], self._lng[idx])
+            if radius_km is not None:
+                within = distances <= radius_km
+                idx, distances = idx[within], distances[within]
+
+            if k is not None and k < len(idx):
+                top = np.argpartition(distances, k - 1)[:k]
+                idx, distances = idx[top], distances[top]
+            order = np.argsort(distances, kind="stable")
+
+            return [
+                {**self._rows[i], "distance_km": float(d)}
+                for i, d in zip(idx[order], distances[order])
+            ]
+
+    def clusters(
+        self,
+        db: Session,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        cell_degrees: float,
+        available_only: bool = True
+    ) -> List[dict]:
+        """
+        Same contract as ``find_nearby_clusters`` but answered from memory.
+        Members are bucketed with the rounding ``ST_SnapToGrid`` uses and
+        aggregated with bincount, so no Python loop runs per NGO.
+        """
+        if self.is_stale:
+            self.load(db)
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+
+            idx = self._candidates(lat, lng, radius_km)
+            if available_only:
+                idx = idx[self._available[idx]]
+            distances = haversine_km(math.radians(lat), math.radians(lng), self._lat[idx], self._lng[idx])
+            idx = idx[distances <= radius_km]
+            if not len(idx):
+                return []
+
+            lat_deg = np.degrees(self._lat[idx])
+            lng_deg = np.degrees(self._lng[idx])
+            available = self._available[idx]
+            ids = self._ids[idx]
+
+        cells = np.stack([np.round(lat_deg / cell_degrees), np.round(lng_deg / cell_degrees)], axis=1)
+        _, members, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        members = members.ravel()
+        latitudes = np.bincount(members, weights=lat_deg) / counts
+        longitudes = np.bincount(members, weights=lng_deg) / counts
+        available_counts = np.bincount(members, weights=available)
+        # Only read for single-member cells, where the one write is the member's id
+        cell_ids = np.zeros(len(counts), dtype=np.int64)
+        cell_ids[members] = ids
+
+        order = np.argsort(-counts, kind="stable")
+        return [
+            {
+                "latitude": float(latitudes[c]),
+                "longitude": float(longitudes[c]),
+                "count": int(counts[c]),
+                "available": int(available_counts[c]),
+                "ngo_id": int(cell_ids[c]) if counts[c] == 1 else None,
+            }
+            for c in order
+        ]
+
+ngo_catalog = NGOCatalog(
+    enabled=settings.NGO_CATALOG_ENABLED,
+    max_age=settings.NGO_CATALOG_MAX_AGE_SECONDS,
+    cell_degrees=settings.NGO_CATALOG_CELL_DEGREES,
+)
\ No newline at end of file
@@ -1,61 +1,92 @@
 # app/services/notification_service.py
-import smtplib
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from html import escape
+from string import Template
+from typing import List
 import logging
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-def send_ngo_notification(ngo_email: str, ngo_name: str, donation_id: int, donation_title: str, donor_name: str):
+# Templates are parsed once at import; rendering is a single substitute() per email
+ASSIGNMENT_TEMPLATE = Template("""
+    <html>
+    <body>
+        <h2>New Donation Assignment</h2>
+        <p>Hello $ngo_name,</p>
+        <p>A new donation has been assigned to your organization:</p>
+        <ul>
+            <li><strong>Donation ID:</strong> $donation_id</li>
+            <li><strong>Title:</strong> $donation_title</li>
+            <li><strong>Donor:</strong> $donor_name</li>
+        </ul>
+        <p>Please log in to your account to view the details and contact the donor.</p>
+        <p>Thank you for your valuable service!</p>
+        <p>Best regards,<br>The DonationApp Team</p>
+    </body>
+    </html>
+    """)
+
+DIGEST_TEMPLATE = Template("""
+    <html>
+    <body>
+        <h2>New Donation Assignments</h2>
+        <p>Hello $ngo_name,</p>
+        <p>$count new donations have been assigned to your organization:</p>
+        <table>
+            <tr><th>Donation ID</th><th>Title</th><th>Donor</th></tr>
+$rows
+        </table>
+        <p>Please log in to your account to view the details and contact the donors.</p>
+        <p>Thank you for your valuable service!</p>
+        <p>Best regards,<br>The DonationApp Team</p>
+    </body>
+    </html>
+    """)
+
+DIGEST_ROW_TEMPLATE = Template(
+    "            <tr><td>$donation_id</td><td>$donation_title</td><td>$donor_name</td></tr>"
+)
+
+def _html_message(to: str, subject: str, body: str) -> MIMEText:
+    message = MIMEText(body, "html")
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    return message
+
+def render_ngo_notification(ngo_name: str, donation_id: int, donation_title: str, donor_name: str) -> str:
+    return ASSIGNMENT_TEMPLATE.substitute(
+        ngo_name=escape(ngo_name),
+        donation_id=donation_id,
+        donation_title=escape(donation_title),
+        donor_name=escape(donor_name)
+    )
+
+def build_ngo_notification(ngo_email: str, ngo_name: str, donation_id: int, donation_title: str, donor_name: str):
     """
-    Send email notification to NGO when a donation is assigned to them
+    Build the email sent to an NGO when a donation is assigned to them
+    """
+    body = render_ngo_notification(ngo_name, donation_id, donation_title, donor_name)
+    return _html_message(ngo_email, f"New Donation Assignment - {donation_title}", body)
+
+def build_ngo_digest(ngo_email: str, ngo_name: str, donations: List[dict]):
+    """
+    Build one email covering several assignments to the same NGO.
+
+    ``donations`` are outbox payloads with donation_id, donation_title and
+    donor_name. A single donation gets the regular assignment email.
     """
-    try:
-        # Create email
-        message = MIMEMultipart()
-        message["From"] = settings.EMAIL_FROM
-        message["To"] = ngo_email
-        message["Subject"] = f"New Donation Assignment - {donation_title}"
-        
-        # Email body
-        body = f"""
-        <html>
-        <body>
-            <h2>New Donation Assignment</h2>
-            <p>Hello {ngo_name},</p>
-            <p>A new donation has been assigned to your organization:</p>
-            <ul>
-                <li><strong>Donation ID:</strong> {donation_id}</li>
-                <li><strong>Title:</strong> {donation_title}</li>
-                <li><strong>Donor:</strong> {donor_name}</li>
-            </ul>
-            <p>Please log in to your account to view the details and contact the donor.</p>
-            <p>Thank you for your valuable service!</p>
-            <p>Best regards,<br>The DonationApp Team</p>
-        </body>
-        </html>
-        """
-        
-        message.attach(MIMEText(body, "html"))
-        
-        # Connect to SMTP server and send email
-        if settings.EMAIL_ENABLED:
-            with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-                if settings.SMTP_TLS:
-                    server.starttls()
-                
-                if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                    server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                
-                server.send_message(message)
-                
-            logger.info(f"Notification sent to NGO {ngo_name} (ID: {ngo_email}) for donation {donation_id}")
-        else:
-            # Log email content in development mode
-            logger.info(f"Email notification would be sent to {ngo_email}")
-            logger.info(f"Subject: {message['Subject']}")
-            logger.info(f"Body: {body}")
-            
-    except Exception as e:
-        logger.error(f"Failed to send notification to NGO: {str(e)}")
\ No newline at end of file
+    if len(donations) == 1:
+        item = donations[0]
+        return build_ngo_notification(ngo_email, ngo_name, item["donation_id"], item["donation_title"], item["donor_name"])
+    rows = "\n".join(
+        DIGEST_ROW_TEMPLATE.substitute(
+            donation_id=item["donation_id"],
+            donation_title=escape(item["donation_title"]),
+            donor_name=escape(item["donor_name"])
+        )
+        for item in donations
+    )
+    body = DIGEST_TEMPLATE.substitute(ngo_name=escape(ngo_name), count=len(donations), rows=rows)
+    return _html_message(ngo_email, f"{len(donations)} New Donation Assignments", body)
@@ -0,0 +1,108 @@
+# app/services/outbox_service.py
+import logging
+from datetime import timedelta
+from typing import List, Tuple
+from sqlalchemy import Text, case, cast, func, select, update
+from sqlalchemy.orm import Session
+from app.models.outbox import NotificationOutbox, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+NGO_ASSIGNMENT = "ngo_assignment"
+
+def digest_key(row: dict):
+    """Rows with the same key go out as one digest: assignment rows per NGO, anything else on its own"""
+    if row["kind"] == NGO_ASSIGNMENT:
+        return row["kind"], row["payload"].get("ngo_id", row["recipient"])
+    return row["kind"], row["id"]
+
+def claim_batch(db: Session, limit: int, lease_seconds: float, digest_window: float = 0) -> List[dict]:
+    """
+    Claim up to ``limit`` due rows (or, with digests, digests) for this worker.
+
+    SKIP LOCKED lets several workers claim concurrently without blocking on
+    each other. Claimed rows have available_at pushed out by the lease, so a
+    worker that dies mid-delivery only delays its rows instead of losing them.
+    Returns plain dicts so nothing is lazily reloaded after the commit.
+
+    With a ``digest_window``, rows are grouped as in ``digest_key`` (the NGO
+    for assignment rows). A group is ready once its oldest due row has waited
+    that long; up to ``limit`` ready groups are chosen oldest first, so a
+    backlog cannot starve anyone, and all of their due rows are claimed
+    together so each group goes out as one digest.
+    """
+    due = (
+        NotificationOutbox.status == OutboxStatus.PENDING,
+        NotificationOutbox.available_at <= func.now()
+    )
+    query = select(NotificationOutbox).where(*due).order_by(NotificationOutbox.available_at, NotificationOutbox.id)
+    if digest_window > 0:
+        # SQL form of digest_key
+        group = case(
+            (
+                NotificationOutbox.kind == NGO_ASSIGNMENT,
+                func.coalesce(NotificationOutbox.payload["ngo_id"].astext, NotificationOutbox.recipient)
+            ),
+            else_=cast(NotificationOutbox.id, Text)
+        )
+        oldest = func.min(NotificationOutbox.created_at)
+        ready_groups = (
+            select(group)
+            .where(*due)
+            .group_by(group)
+            .having(oldest <= func.now() - timedelta(seconds=digest_window))
+            .order_by(oldest)
+            .limit(limit)
+            # Same table as the outer query; keep this an independent subquery
+            .correlate(None)
+        )
+        query = query.where(group.in_(ready_groups))
+    else:
+        query = query.limit(limit)
+    rows = db.execute(query.with_for_update(skip_locked=True)).scalars().all()
+    claimed = []
+    for row in rows:
+        row.attempts += 1
+        row.available_at = func.now() + timedelta(seconds=lease_seconds)
+        claimed.append({
+            "id": row.id,
+            "kind": row.kind,
+            "recipient": row.recipient,
+            "payload": row.payload,
+            "attempts": row.attempts,
+        })
+    db.commit()
+    return claimed
+
+def retry_delay(attempts: int, backoff_base: float, backoff_max: float) -> float:
+    """Seconds before a row that has failed ``attempts`` times is tried again"""
+    return min(backoff_max, backoff_base * 2 ** (attempts - 1))
+
+def record_results(
+    db: Session,
+    results: List[Tuple[dict, bool, str]],
+    max_attempts: int,
+    backoff_base: float,
+    backoff_max: float
+):
+    """Mark delivered rows sent; reschedule failures with backoff until max_attempts"""
+    # Timestamps come from the database clock, like the server defaults
+    sent_ids = [row["id"] for row, ok, _ in results if ok]
+    if sent_ids:
+        db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(sent_ids))
+            .values(status=OutboxStatus.SENT, sent_at=func.now(), last_error=None)
+        )
+    for row, ok, error in results:
+        if ok:
+            continue
+        values = {"last_error": error}
+        if row["attempts"] >= max_attempts:
+            values["status"] = OutboxStatus.FAILED
+            logger.error(f"Giving up on outbox row {row['id']} to {row['recipient']} after {row['attempts']} attempts: {error}")
+        else:
+            delay = retry_delay(row["attempts"], backoff_base, backoff_max)
+            values["available_at"] = func.now() + timedelta(seconds=delay)
+        db.execute(update(NotificationOutbox).where(NotificationOutbox.id == row["id"]).values(**values))
+    db.commit()
@@ -0,0 +1,35 @@
+# app/services/projections.py
+from typing import Callable, Sequence
+from app.core.geometry import point_to_geojson
+from app.models.donation import Donation
+from app.models.ngo import NGO
+
+# Every column the response schemas expose, in table order
+NGO_COLUMNS = tuple(column for column in NGO.__table__.columns if column.name != "search_vector")
+DONATION_COLUMNS = tuple(column for column in Donation.__table__.columns if column.name != "search_vector")
+
+def _projector(columns: Sequence) -> Callable[[tuple], dict]:
+    """
+    Row -> response dict for a fixed column list.
+
+    Keys are resolved once, so a row costs one zip and one point decode.
+    Enum and datetime values are left as they are for the JSON encoder.
+    """
+    keys = tuple(column.name for column in columns)
+    location = keys.index("location")
+
+    def project(row) -> dict:
+        record = dict(zip(keys, row))
+        record["location"] = point_to_geojson(row[location])
+        return record
+
+    return project
+
+project_ngo = _projector(NGO_COLUMNS)
+project_donation = _projector(DONATION_COLUMNS)
+
+def project_nearby_ngo(row) -> dict:
+    """Row from nearby_ngos_statement(columns=NGO_COLUMNS): NGO columns then distance_meters"""
+    record = project_ngo(row)
+    record["distance_km"] = row[-1] / 1000
+    return record
@@ -0,0 +1,377 @@
+# app/services/response_cache.py
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+from fastapi import Request, Response
+from app.core.conditional import ETAG_HEADER, etag_matches
+from app.core.config import settings
+from app.core.responses import dumps
+
+try:
+    import redis
+except ImportError:  # optional; only needed for the shared tier
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Invalidation tags; named after the tables whose writes make entries stale
+NGOS = "ngos"
+DONATIONS = "donations"
+
+class CacheKey:
+    """
+    A normalized request key plus what is needed to store its response
+    safely: the tags it depends on, their generations when the key was made
+    (before the database was read) and when the lookup started. A shared
+    tier lookup records the shared generations it saw in ``shared_version``.
+    """
+    __slots__ = ("text", "tags", "generations", "started", "shared_version")
+
+    def __init__(self, text: str, tags: Tuple[str, ...], generations: Tuple[int, ...], started: float):
+        self.text = text
+        self.tags = tags
+        self.generations = generations
+        self.started = started
+        self.shared_version: Optional[str] = None
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+    def encode(self) -> bytes:
+        return json.dumps(self.headers, separators=(",", ":")).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        headers, body = data.split(b"\n", 1)
+        return cls(body, json.loads(headers))
+
+def _entry(content: Any, headers: Optional[Mapping[str, str]]) -> CachedResponse:
+    """Bytes are cached as they are (with their Content-Type in ``headers``); anything else is encoded as JSON"""
+    body = content if isinstance(content, bytes) else dumps(content)
+    return CachedResponse(body, dict(headers) if headers else {})
+
+def _normalize(value) -> str:
+    if isinstance(value, float):
+        # repr is the shortest exact form, so equal floats always match
+        return repr(value)
+    return str(value)
+
+class SharedTier:
+    """
+    Responses in a Redis-protocol server shared by every worker.
+
+    Each tag has a generation counter in the server, and entries are stored
+    under the request key plus the generations of its tags as read by the
+    lookup (before the database was). Invalidating a tag INCRs its counter,
+    so every worker moves to new keys at once. A response computed from data
+    read before a write lands under the old generations, where no reader
+    looks anymore, and expires with its TTL. Any server error is logged and
+    treated as a miss; the cache never fails a request.
+    """
+
+    # The tags' generations and the entry stored under them, in one round trip
+    LOOKUP_SCRIPT = """
+    local generations = {}
+    for i, key in ipairs(KEYS) do
+        generations[i] = redis.call('GET', key) or '0'
+    end
+    local version = table.concat(generations, ',')
+    return {version, redis.call('GET', ARGV[1] .. '@' .. version)}
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "response-cache:"):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self._lookup = self.client.register_script(self.LOOKUP_SCRIPT)
+
+    def _tag_keys(self, tags: Sequence[str]) -> list:
+        return [f"{self.prefix}tag:{tag}" for tag in tags]
+
+    def get(self, key: str, tags: Sequence[str]) -> Tuple[str, Optional[bytes]]:
+        """The current version of ``tags`` and the entry stored for ``key`` under it"""
+        version, data = self._lookup(keys=self._tag_keys(tags), args=[self.prefix + key])
+        return version.decode() if isinstance(version, bytes) else str(version), data
+
+    def set(self, key: str, version: str, data: bytes):
+        self.client.set(f"{self.prefix}{key}@{version}", data, ex=max(1, math.ceil(self.ttl)))
+
+    def invalidate(self, tags: Sequence[str]):
+        pipe = self.client.pipeline(transaction=False)
+        for tag_key in self._tag_keys(tags):
+            pipe.incr(tag_key)
+        pipe.execute()
+
+class ResponseCache:
+    """
+    Encoded responses of hot read endpoints, keyed on their normalized query
+    parameters.
+
+    The memory tier is a per-process LRU with a short TTL; the optional
+    shared tier (``redis_url``) lets workers reuse each other's responses
+    for longer. Writes invalidate by tag: in this process the memory tier is
+    cleared at once and the shared tier's tag generations move on; other
+    workers' memory tiers catch up within ``memory_ttl``.
+
+    A request that read the database before a concurrent write cannot put
+    the old result back: the memory tier skips the store if one of its tags
+    was invalidated in this process after the key was made, and the shared
+    tier files it under the tag generations seen before the read, which a
+    write in any worker has already retired.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_entries: int,
+        memory_ttl: float,
+        shared_ttl: float,
+        grid_degrees: float,
+        redis_url: Optional[str] = None
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.memory_ttl = memory_ttl
+        self.grid_degrees = grid_degrees
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[str, ...], CachedResponse]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.shared: Optional[SharedTier] = None
+        if enabled and redis_url:
+            if redis is None:
+                logger.warning("RESPONSE_CACHE_REDIS_URL is set but the redis package is not installed; using the memory tier only")
+            else:
+                self.shared = SharedTier(redis_url, shared_ttl)
+        self.stats = {
+            "memory_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "stores": 0,
+            "stale_stores_skipped": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "shared_errors": 0,
+            "hit_seconds_total": 0.0,
+            "hit_seconds_max": 0.0,
+            "miss_seconds_total": 0.0,
+            "miss_seconds_max": 0.0,
+        }
+
+    def snap(self, degrees: float) -> float:
+        """
+        A coordinate as it appears in cache keys. With a positive grid, requests
+        a few metres apart share an entry, and a hit returns the response
+        computed for whichever point in the cell was searched first.
+        """
+        if self.grid_degrees <= 0:
+            return degrees
+        return round(round(degrees / self.grid_degrees) * self.grid_degrees, 7)
+
+    def key(self, name: str, tags: Sequence[str], **params) -> CacheKey:
+        """Key for an endpoint and its parameters; None-valued parameters are dropped"""
+        query = "&".join(f"{k}={_normalize(v)}" for k, v in sorted(params.items()) if v is not None)
+        tags = tuple(tags)
+        with self._lock:
+            generations = tuple(self._generations.get(tag, 0) for tag in tags)
+        return CacheKey(f"{name}?{query}", tags, generations, time.perf_counter())
+
+    def get(self, key: CacheKey, request: Optional[Request] = None) -> Optional[Response]:
+        """The cached response for ``key`` (a 304 when If-None-Match matches it), or None"""
+        if not self.enabled:
+            return None
+        entry = self._memory_get(key.text)
+        if entry is not None:
+            return self._hit(key, entry, request, "memory_hits")
+        if self.shared is not None:
+            try:
+                key.shared_version, data = self.shared.get(key.text, key.tags)
+            except Exception as e:
+                self._shared_error(e)
+                self._miss()
+                return None
+            return self._shared_result(key, data, request)
+        self._miss()
+        return None
+
+    async def aget(self, key: CacheKey, request: Optional[Request] = None) -> Optional[Response]:
+        """get() for async routers; the shared tier is called off the event loop"""
+        if not self.enabled:
+            return None
+        entry = self._memory_get(key.text)
+        if entry is not None:
+            return self._hit(key, entry, request, "memory_hits")
+        if self.shared is not None:
+            try:
+                key.shared_version, data = await asyncio.to_thread(self.shared.get, key.text, key.tags)
+            except Exception as e:
+                self._shared_error(e)
+                self._miss()
+                return None
+            return self._shared_result(key, data, request)
+        self._miss()
+        return None
+
+    def store(self, key: CacheKey, content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+        """Encode ``content`` once, cache it under ``key`` and return it as the response"""
+        entry = _entry(content, headers)
+        # Without a version from the lookup there is no safe place to store it
+        if self._memory_set(key, entry) and key.shared_version is not None:
+            try:
+                self.shared.set(key.text, key.shared_version, entry.encode())
+            except Exception as e:
+                self._shared_error(e)
+        return self._response(entry)
+
+    async def astore(self, key: CacheKey, content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+        entry = _entry(content, headers)
+        if self._memory_set(key, entry) and key.shared_version is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key.text, key.shared_version, entry.encode())
+            except Exception as e:
+                self._shared_error(e)
+        return self._response(entry)
+
+    def invalidate(self, tags: Sequence[str]):
+        """Drop every response that depends on any of ``tags``; call after the write commits"""
+        if not self.enabled:
+            return
+        self._memory_invalidate(tags)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate(tags)
+            except Exception as e:
+                self._shared_error(e)
+
+    async def ainvalidate(self, tags: Sequence[str]):
+        if not self.enabled:
+            return
+        self._memory_invalidate(tags)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.invalidate, tags)
+            except Exception as e:
+                self._shared_error(e)
+
+    def _memory_get(self, text: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is None:
+                return None
+            expires_at, _, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[text]
+                return None
+            self._entries.move_to_end(text)
+            return response
+
+    def _memory_set(self, key: CacheKey, entry: CachedResponse) -> bool:
+        """Store unless a tag was invalidated since the key was made; returns whether it was stored"""
+        elapsed = time.perf_counter() - key.started
+        with self._lock:
+            self.stats["miss_seconds_total"] += elapsed
+            self.stats["miss_seconds_max"] = max(self.stats["miss_seconds_max"], elapsed)
+            if tuple(self._generations.get(tag, 0) for tag in key.tags) != key.generations:
+                self.stats["stale_stores_skipped"] += 1
+                return False
+            self._entries[key.text] = (time.monotonic() + self.memory_ttl, key.tags, entry)
+            self._entries.move_to_end(key.text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            self.stats["stores"] += 1
+            return True
+
+    def _memory_invalidate(self, tags: Sequence[str]):
+        tags = set(tags)
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [text for text, (_, entry_tags, _) in self._entries.items() if tags.intersection(entry_tags)]
+            for text in stale:
+                del self._entries[text]
+            self.stats["invalidations"] += 1
+
+    def _shared_result(self, key: CacheKey, data: Optional[bytes], request: Optional[Request]) -> Optional[Response]:
+        if data is None:
+            self._miss()
+            return None
+        entry = CachedResponse.decode(data)
+        # Promote into the memory tier, still guarded by the key's generations
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in key.tags) == key.generations:
+                self._entries[key.text] = (time.monotonic() + self.memory_ttl, key.tags, entry)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+        return self._hit(key, entry, request, "shared_hits")
+
+    def _hit(self, key: CacheKey, entry: CachedResponse, request: Optional[Request], tier: str) -> Response:
+        etag = entry.headers.get(ETAG_HEADER)
+        if request is not None and etag and etag_matches(request, etag):
+            response = Response(status_code=304, headers=entry.headers)
+            self.stats["not_modified"] += 1
+        else:
+            response = self._response(entry)
+        elapsed = time.perf_counter() - key.started
+        with self._lock:
+            self.stats[tier] += 1
+            self.stats["hit_seconds_total"] += elapsed
+            self.stats["hit_seconds_max"] = max(self.stats["hit_seconds_max"], elapsed)
+        return response
+
+    def _miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def _shared_error(self, error: Exception):
+        with self._lock:
+            self.stats["shared_errors"] += 1
+        logger.warning(f"Shared response cache unavailable: {error}")
+
+    def _response(self, entry: CachedResponse) -> Response:
+        # A Content-Type stored with the entry (e.g. vector tiles) takes precedence
+        return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            entries = len(self._entries)
+        hits = stats["memory_hits"] + stats["shared_hits"]
+        lookups = hits + stats["misses"]
+        fills = stats["stores"] + stats["stale_stores_skipped"]
+        return {
+            "enabled": self.enabled,
+            "shared": self.shared is not None,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_hits": stats["memory_hits"],
+            "shared_hits": stats["shared_hits"],
+            "misses": stats["misses"],
+            "not_modified": stats["not_modified"],
+            "stores": stats["stores"],
+            "stale_stores_skipped": stats["stale_stores_skipped"],
+            "invalidations": stats["invalidations"],
+            "evictions": stats["evictions"],
+            "shared_errors": stats["shared_errors"],
+            "hit_ms_avg": stats["hit_seconds_total"] / hits * 1000 if hits else 0.0,
+            "hit_ms_max": stats["hit_seconds_max"] * 1000,
+            "miss_ms_avg": stats["miss_seconds_total"] / fills * 1000 if fills else 0.0,
+            "miss_ms_max": stats["miss_seconds_max"] * 1000,
+        }
+
+response_cache = ResponseCache(
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    memory_ttl=settings.RESPONSE_CACHE_MEMORY_TTL_SECONDS,
+    shared_ttl=settings.RESPONSE_CACHE_SHARED_TTL_SECONDS,
+    grid_degrees=settings.RESPONSE_CACHE_GRID_DEGREES,
+    redis_url=settings.RESPONSE_CACHE_REDIS_URL
+)
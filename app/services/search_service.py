@@ -0,0 +1,95 @@
+# app/services/search_service.py
+from typing import Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import func, literal_column, select
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.models.ngo import NGO, SEARCH_CONFIG
+from app.services.nearby_service import DEFAULT_RADIUS_KM, user_geography
+from app.services.projections import DONATION_COLUMNS, NGO_COLUMNS, project_donation, project_ngo
+
+def search_query(q: str):
+    """
+    Parse user input with ``websearch_to_tsquery``: quoted phrases, ``or``
+    and ``-word`` work as in web search engines, and malformed input never
+    raises.
+    """
+    # The configuration is a constant, rendered inline
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+
+def validate_point(lat: Optional[float], lng: Optional[float]):
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be given together")
+
+def _search_statement(
+    model,
+    columns: Sequence,
+    q: str,
+    filters: list,
+    lat: Optional[float],
+    lng: Optional[float],
+    radius_km: Optional[float],
+    limit: int
+):
+    """
+    Rows matching ``q``, best match first: the given columns, then rank and,
+    for a spatial search, distance_meters.
+
+    The text match is answered from the GIN index on search_vector and the
+    radius filter from the geography GIST index; Postgres combines both in
+    one plan (a BitmapAnd, or whichever index is more selective followed by
+    a recheck of the other condition).
+    """
+    query = search_query(q)
+    rank = func.ts_rank_cd(model.search_vector, query).label("rank")
+    stmt = select(*columns, rank).where(model.search_vector.op("@@")(query), *filters)
+
+    if lat is not None:
+        geog = func.geography(model.location)
+        point = user_geography(lat, lng)
+        radius_km = radius_km or DEFAULT_RADIUS_KM
+        stmt = stmt.add_columns(func.ST_Distance(geog, point).label("distance_meters"))
+        stmt = stmt.where(func.ST_DWithin(geog, point, radius_km * 1000))
+
+    # id breaks ties so equal ranks come back in a stable order
+    return stmt.order_by(rank.desc(), model.id).limit(limit)
+
+def ngo_search_statement(
+    q: str,
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    available_only: bool = False,
+    limit: int = 20
+):
+    """Ranked NGO search over name (weighted higher) and description"""
+    filters = [NGO.is_available == True] if available_only else []
+    return _search_statement(NGO, NGO_COLUMNS, q, filters, lat, lng, radius_km, limit)
+
+def donation_search_statement(
+    q: str,
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    limit: int = 20
+):
+    """Ranked donation search over title (weighted higher) and description"""
+    filters = []
+    if status is not None:
+        filters.append(Donation.status == status)
+    if donation_type is not None:
+        filters.append(Donation.donation_type == donation_type)
+    return _search_statement(Donation, DONATION_COLUMNS, q, filters, lat, lng, radius_km, limit)
+
+def _search_result(record: dict, row) -> dict:
+    record["rank"] = row.rank
+    if "distance_meters" in row._fields:
+        record["distance_km"] = row.distance_meters / 1000
+    return record
+
+def project_ngo_result(row) -> dict:
+    return _search_result(project_ngo(row), row)
+
+def project_donation_result(row) -> dict:
+    return _search_result(project_donation(row), row)
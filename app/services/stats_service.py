@@ -0,0 +1,371 @@
+# app/services/stats_service.py
+"""
+Donation counts kept in summary tables instead of aggregated per request.
+
+Every write that creates a donation or changes its status, type or NGO
+appends +1/-1 rows to donation_stats_deltas in the same transaction. Appends
+never conflict, so concurrent writes do not queue behind each other on the
+few hot counter rows. A rollup periodically moves the deltas into
+donation_stats (current totals) and donation_daily_stats (donations created
+per day); readers add whatever is still pending, so counts stay exact.
+
+The rollup must run for reads to stay cheap, since every read scans the
+pending deltas. Each API process runs it every
+DONATION_STATS_ROLLUP_INTERVAL_SECONDS (``stats_rollup``, started with the
+app; an advisory lock lets one process at a time do the work). With the
+interval set to 0, run ``python -m app.services.stats_service --rollup
+--interval 10`` as a separate process instead (without ``--interval`` it
+runs once). ``--rebuild`` recomputes both summaries from the donations
+table, e.g. after rows were changed by hand.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, Integer, cast, column, delete, func, literal_column, select, text, union_all, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.models.stats import DonationDailyStats, DonationStats, DonationStatsDelta, UNASSIGNED_NGO_ID
+
+logger = logging.getLogger(__name__)
+
+# (created day, status, donation_type, ngo_id): everything the summaries count by
+StatsKey = Tuple[date, DonationStatus, DonationType, Optional[int]]
+
+# Buckets returned when the caller gives no start date
+DEFAULT_SERIES_LENGTH = {"day": 30, "week": 12}
+
+# pg_advisory_xact_lock key serializing rollups and rebuilds
+ROLLUP_LOCK_KEY = 7_220_601
+
+def stats_key(donation: Donation) -> StatsKey:
+    return donation.created_at.date(), donation.status, donation.donation_type, donation.ngo_id
+
+def stats_upserts(deltas) -> tuple:
+    """
+    INSERT ... ON CONFLICT statements adding ``deltas`` to both summary tables.
+
+    ``deltas`` is any selectable with day, status, donation_type, ngo_id and
+    delta columns. Deltas are summed per key first, since ON CONFLICT may only
+    touch each row once per statement; keys that net to zero are skipped.
+    Rows are written in key order, so two statements locking overlapping
+    counter rows take the locks in the same order and cannot deadlock.
+    """
+    # Rendered inline so GROUP BY sees the same expression as the select list
+    ngo_id = func.coalesce(deltas.c.ngo_id, literal_column(str(UNASSIGNED_NGO_ID)))
+    total = func.sum(deltas.c.delta)
+
+    totals = insert(DonationStats).from_select(
+        ["status", "donation_type", "ngo_id", "count"],
+        select(deltas.c.status, deltas.c.donation_type, ngo_id, total)
+        .group_by(deltas.c.status, deltas.c.donation_type, ngo_id)
+        .having(total != 0)
+        .order_by(deltas.c.status, deltas.c.donation_type, ngo_id)
+    )
+    totals = totals.on_conflict_do_update(
+        index_elements=["status", "donation_type", "ngo_id"],
+        set_={"count": DonationStats.count + totals.excluded["count"]}
+    )
+
+    daily = insert(DonationDailyStats).from_select(
+        ["day", "status", "donation_type", "count"],
+        select(deltas.c.day, deltas.c.status, deltas.c.donation_type, total)
+        .group_by(deltas.c.day, deltas.c.status, deltas.c.donation_type)
+        .having(total != 0)
+        .order_by(deltas.c.day, deltas.c.status, deltas.c.donation_type)
+    )
+    daily = daily.on_conflict_do_update(
+        index_elements=["day", "status", "donation_type"],
+        set_={"count": DonationDailyStats.count + daily.excluded["count"]}
+    )
+    return totals, daily
+
+def delta_insert(deltas):
+    """
+    INSERT appending ``deltas`` (same columns as for ``stats_upserts``) to
+    donation_stats_deltas, summed per key; keys that net to zero and rows
+    without a status (which are not counted) are skipped.
+    """
+    key = (deltas.c.day, deltas.c.status, deltas.c.donation_type, deltas.c.ngo_id)
+    total = func.sum(deltas.c.delta)
+    return insert(DonationStatsDelta).from_select(
+        ["day", "status", "donation_type", "ngo_id", "delta"],
+        select(*key, total).where(deltas.c.status.isnot(None)).group_by(*key).having(total != 0)
+    )
+
+def inserted_deltas(ids: Sequence[int]):
+    """+1 for each of the given (just inserted) donations"""
+    return (
+        select(
+            cast(Donation.created_at, Date).label("day"),
+            Donation.status,
+            Donation.donation_type,
+            Donation.ngo_id,
+            literal_column("1").label("delta")
+        )
+        .where(Donation.id.in_(list(ids)))
+        .subquery("deltas")
+    )
+
+def record_inserted(db: Session, ids: Sequence[int]):
+    """Count new donations; call in the transaction that inserted them"""
+    if not ids:
+        return
+    db.execute(delta_insert(inserted_deltas(ids)))
+
+def record_change(db: Session, before: StatsKey, after: StatsKey):
+    """Move one donation between keys; call in the transaction that changed it"""
+    # Rows without a status are not counted (see rebuild)
+    changes = [(*key, delta) for key, delta in ((before, -1), (after, 1)) if key[1] is not None]
+    if before == after or not changes:
+        return
+    table = Donation.__table__.c
+    rows = values(
+        column("day", Date),
+        column("status", table.status.type),
+        column("donation_type", table.donation_type.type),
+        column("ngo_id", Integer),
+        column("delta", Integer),
+        name="changes"
+    ).data(changes)
+    # VALUES columns come back untyped; cast so they insert into the enum columns
+    deltas = select(
+        rows.c.day,
+        cast(rows.c.status, table.status.type).label("status"),
+        cast(rows.c.donation_type, table.donation_type.type).label("donation_type"),
+        rows.c.ngo_id,
+        rows.c.delta
+    ).subquery("deltas")
+    db.execute(delta_insert(deltas))
+
+def rollup(db: Session) -> int:
+    """
+    Move the pending deltas into both summary tables in one statement;
+    returns how many delta rows were applied. Rows appended by transactions
+    that commit meanwhile stay for the next run. Returns 0 without waiting if
+    another rollup or a rebuild is in progress.
+    """
+    if not db.execute(select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_KEY))).scalar():
+        db.rollback()
+        return 0
+    # Target the Core table: an ORM-enabled DELETE drops the add_cte() upserts below
+    moved = (
+        delete(DonationStatsDelta.__table__)
+        .returning(
+            DonationStatsDelta.day,
+            DonationStatsDelta.status,
+            DonationStatsDelta.donation_type,
+            DonationStatsDelta.ngo_id,
+            DonationStatsDelta.delta
+        )
+        .cte("moved")
+    )
+    totals, daily = stats_upserts(moved)
+    applied = db.execute(
+        select(func.count()).select_from(moved)
+        .add_cte(totals.cte("counted"))
+        .add_cte(daily.cte("counted_daily"))
+    ).scalar()
+    db.commit()
+    return applied
+
+class StatsRollup:
+    """Runs ``rollup`` every ``interval`` seconds on a worker thread while the app is up"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def run_once(self) -> int:
+        from app.core.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            return rollup(db)
+        finally:
+            db.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                applied = await asyncio.to_thread(self.run_once)
+                if applied:
+                    logger.debug(f"Rolled up {applied} donation stats deltas")
+            except Exception:
+                logger.exception("Donation stats rollup failed")
+
+stats_rollup = StatsRollup(settings.DONATION_STATS_ROLLUP_INTERVAL_SECONDS)
+
+def summary(db: Session, ngo_id: Optional[int] = None) -> dict:
+    """Totals by status, by type and by NGO, from donation_stats plus pending deltas"""
+    pending_ngo_id = func.coalesce(DonationStatsDelta.ngo_id, literal_column(str(UNASSIGNED_NGO_ID)))
+    totals = select(DonationStats.status, DonationStats.donation_type, DonationStats.ngo_id, DonationStats.count)
+    pending = select(
+        DonationStatsDelta.status,
+        DonationStatsDelta.donation_type,
+        pending_ngo_id.label("ngo_id"),
+        DonationStatsDelta.delta
+    )
+    if ngo_id is not None:
+        totals = totals.where(DonationStats.ngo_id == ngo_id)
+        pending = pending.where(pending_ngo_id == ngo_id)
+    rows = union_all(totals, pending).subquery("counts")
+    count = func.sum(rows.c.count)
+    query = (
+        select(rows.c.status, rows.c.donation_type, rows.c.ngo_id, count)
+        .group_by(rows.c.status, rows.c.donation_type, rows.c.ngo_id)
+        .having(count != 0)
+    )
+
+    by_status: Dict[str, int] = defaultdict(int)
+    by_type: Dict[str, int] = defaultdict(int)
+    by_ngo: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for status, donation_type, row_ngo_id, count in db.execute(query):
+        by_status[status.value] += count
+        by_type[donation_type.value] += count
+        by_ngo[row_ngo_id][status.value] += count
+    return {
+        "total": sum(by_status.values()),
+        "by_status": dict(by_status),
+        "by_type": dict(by_type),
+        "by_ngo": [
+            {
+                "ngo_id": None if key == UNASSIGNED_NGO_ID else key,
+                "total": sum(counts.values()),
+                "by_status": dict(counts),
+            }
+            for key, counts in sorted(by_ngo.items())
+        ],
+    }
+
+def series(
+    db: Session,
+    bucket: str = "day",
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None
+) -> List[dict]:
+    """
+    Donations created per day or week (weeks start on Monday), broken down by
+    current status and type. ``created_to`` is exclusive. Empty buckets are
+    omitted.
+    """
+    if created_from is None:
+        length = DEFAULT_SERIES_LENGTH[bucket]
+        created_from = date.today() - (timedelta(days=length - 1) if bucket == "day" else timedelta(weeks=length - 1))
+        if bucket == "week":
+            created_from -= timedelta(days=created_from.weekday())
+
+    rows = union_all(
+        select(DonationDailyStats.day, DonationDailyStats.status, DonationDailyStats.donation_type, DonationDailyStats.count),
+        select(DonationStatsDelta.day, DonationStatsDelta.status, DonationStatsDelta.donation_type, DonationStatsDelta.delta)
+    ).subquery("daily")
+    day = rows.c.day
+    if bucket == "week":
+        start = cast(func.date_trunc(literal_column("'week'"), day), Date).label("bucket")
+    else:
+        start = day.label("bucket")
+    count = func.sum(rows.c.count)
+    query = (
+        select(start, rows.c.status, rows.c.donation_type, count)
+        .where(day >= created_from)
+        .group_by(start, rows.c.status, rows.c.donation_type)
+        .having(count != 0)
+        .order_by(start)
+    )
+    if created_to is not None:
+        query = query.where(day < created_to)
+    if status is not None:
+        query = query.where(rows.c.status == status)
+    if donation_type is not None:
+        query = query.where(rows.c.donation_type == donation_type)
+
+    points: Dict[date, dict] = {}
+    for bucket_start, row_status, row_type, count in db.execute(query):
+        point = points.setdefault(bucket_start, {"bucket": bucket_start, "total": 0, "by_status": {}, "by_type": {}})
+        point["total"] += count
+        point["by_status"][row_status.value] = point["by_status"].get(row_status.value, 0) + count
+        point["by_type"][row_type.value] = point["by_type"].get(row_type.value, 0) + count
+    return list(points.values())
+
+def rebuild(db: Session):
+    """Recompute both summary tables from the donations table and drop pending deltas"""
+    db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+    # SHARE mode lets readers through but holds writers until the new counts are in
+    db.execute(text("LOCK TABLE donations IN SHARE MODE"))
+    db.execute(delete(DonationStatsDelta))
+    db.execute(delete(DonationStats))
+    db.execute(delete(DonationDailyStats))
+    everything = select(
+        cast(Donation.created_at, Date).label("day"),
+        Donation.status,
+        Donation.donation_type,
+        Donation.ngo_id,
+        literal_column("1").label("delta")
+    ).where(Donation.status.isnot(None)).subquery("deltas")
+    for stmt in stats_upserts(everything):
+        db.execute(stmt)
+    db.commit()
+
+def main(argv=None):
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Maintain the donation summary tables")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the summaries from the donations table")
+    parser.add_argument("--rollup", action="store_true", help="Fold pending deltas into the summaries")
+    parser.add_argument("--interval", type=float, help="With --rollup, repeat every INTERVAL seconds")
+    args = parser.parse_args(argv)
+    if not args.rebuild and not args.rollup:
+        parser.print_help()
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            rebuild(db)
+            logger.info(f"Rebuilt donation stats: {summary(db)['total']} donations")
+            return
+        while True:
+            try:
+                applied = rollup(db)
+                if applied:
+                    logger.info(f"Rolled up {applied} donation stats deltas")
+            except Exception:
+                if args.interval is None:
+                    raise
+                # Keep the loop alive through e.g. a database restart
+                logger.exception("Donation stats rollup failed")
+                db.rollback()
+            if args.interval is None:
+                return
+            time.sleep(args.interval)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
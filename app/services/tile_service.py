@@ -0,0 +1,114 @@
+# app/services/tile_service.py
+import hashlib
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import Text, cast, func, literal_column, or_, select
+from app.core.config import settings
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.models.ngo import NGO
+from app.services.response_cache import DONATIONS, NGOS
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# Layer name -> response cache tag invalidated by writes to it
+LAYERS = {"donations": DONATIONS, "ngos": NGOS}
+
+def parse_layers(layers: str) -> List[str]:
+    names = [name.strip() for name in layers.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LAYERS]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"layers must be a comma-separated subset of {', '.join(LAYERS)}")
+    # Fixed order, so equivalent requests share a cache key and produce the same bytes
+    return [name for name in LAYERS if name in names]
+
+def validate_tile(z: int, x: int, y: int):
+    if not 0 <= z <= settings.TILE_MAX_ZOOM:
+        raise HTTPException(status_code=400, detail=f"Zoom must be between 0 and {settings.TILE_MAX_ZOOM}")
+    if not (0 <= x < 1 << z and 0 <= y < 1 << z):
+        raise HTTPException(status_code=404, detail="Tile is outside the map")
+
+def tile_etag(tile: bytes) -> str:
+    return f'"{hashlib.blake2b(tile, digest_size=12).hexdigest()}"'
+
+def _layer(name: str, model, properties: list, filters: list, z: int, x: int, y: int):
+    """
+    One MVT layer as a scalar subquery.
+
+    Rows are found with ``location && <tile bounds in 4326>``, which the GIST
+    index on the geometry column answers directly; the bounds are widened by
+    the buffer so markers just outside the tile are still drawn.
+
+    Tiles are truncated: at most TILE_MAX_FEATURES rows are encoded per
+    layer, taken in id order, so a dense tile always shows the same (oldest)
+    features and its bytes and ETag do not change between requests while the
+    data does not.
+    """
+    envelope = func.ST_TileEnvelope(z, x, y)
+    margin = 360.0 / (1 << z) * settings.TILE_BUFFER / settings.TILE_EXTENT
+    bounds = func.ST_Expand(func.ST_Transform(envelope, 4326), margin)
+    features = (
+        select(
+            func.ST_AsMVTGeom(
+                func.ST_Transform(model.location, 3857), envelope, settings.TILE_EXTENT, settings.TILE_BUFFER, True
+            ).label("geom"),
+            *properties
+        )
+        .where(model.location.op("&&")(bounds), *filters)
+        .order_by(model.id)
+        .limit(settings.TILE_MAX_FEATURES)
+        .subquery(name)
+    )
+    # Layer and column names are constants, rendered inline
+    mvt = func.ST_AsMVT(features.table_valued(), literal_column(f"'{name}'"), settings.TILE_EXTENT, literal_column("'geom'"))
+    return select(func.coalesce(mvt, literal_column("''::bytea"))).scalar_subquery()
+
+def tile_statement(
+    z: int,
+    x: int,
+    y: int,
+    layers: List[str],
+    status: Optional[DonationStatus] = None,
+    donation_type: Optional[DonationType] = None,
+    ngo_id: Optional[int] = None,
+    available: Optional[bool] = None,
+    verified: Optional[bool] = None,
+    accepts: Optional[DonationType] = None
+):
+    """
+    One row with a bytea column per requested layer; concatenated in order
+    they form the tile. Only map-safe properties are encoded: donor details
+    never leave the database.
+    """
+    columns = []
+    if "donations" in layers:
+        filters = []
+        if status is not None:
+            filters.append(Donation.status == status)
+        if donation_type is not None:
+            filters.append(Donation.donation_type == donation_type)
+        if ngo_id is not None:
+            filters.append(Donation.ngo_id == ngo_id)
+        properties = [
+            Donation.id,
+            # Enum labels are stored upper case; tiles carry the API's lower-case values
+            func.lower(cast(Donation.status, Text)).label("status"),
+            func.lower(cast(Donation.donation_type, Text)).label("donation_type"),
+            Donation.ngo_id,
+        ]
+        columns.append(_layer("donations", Donation, properties, filters, z, x, y))
+    if "ngos" in layers:
+        filters = []
+        if available is not None:
+            filters.append(NGO.is_available.is_(available))
+        if verified is not None:
+            filters.append(NGO.verified.is_(verified))
+        if accepts is not None:
+            # NULL accepts every type, as in auto-matching
+            filters.append(or_(NGO.accepted_donation_types.is_(None), NGO.accepted_donation_types.any(accepts.value)))
+        properties = [NGO.id, NGO.name, NGO.is_available, NGO.verified]
+        columns.append(_layer("ngos", NGO, properties, filters, z, x, y))
+    return select(*columns)
+
+def join_tile(row) -> bytes:
+    # psycopg2 returns bytea as memoryview, asyncpg as bytes
+    return b"".join(bytes(part) for part in row if part)
@@ -0,0 +1,148 @@
+# app/workers/outbox_worker.py
+"""
+Deliver notifications from the outbox table.
+
+    python -m app.workers.outbox_worker [--once]
+
+Run as many copies as needed; rows are claimed with FOR UPDATE SKIP LOCKED,
+so workers never block on or double-send each other's rows.
+"""
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.mail_delivery import MailDeliveryEngine, PooledSMTPConnection
+from app.services.notification_service import build_ngo_digest, build_ngo_notification
+from app.services.outbox_service import NGO_ASSIGNMENT, claim_batch, digest_key, record_results
+
+logger = logging.getLogger(__name__)
+
+BUILDERS = {
+    NGO_ASSIGNMENT: lambda payload: build_ngo_notification(
+        payload["ngo_email"], payload["ngo_name"], payload["donation_id"],
+        payload["donation_title"], payload["donor_name"]
+    ),
+}
+
+class OutboxWorker:
+    """Claims due outbox rows and delivers them over a pool of SMTP connections, optionally as per-NGO digests"""
+
+    def __init__(self, batch_size: int, concurrency: int, poll_interval: float, digest_window: float):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.digest_window = digest_window
+        # Failed rows are retried by the outbox on a longer schedule, so only
+        # retry in-process once to ride out a dropped connection
+        self.engine = MailDeliveryEngine.from_settings(max_retries=1)
+        self._local = threading.local()
+        self._connections: List[PooledSMTPConnection] = []
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="outbox")
+
+    def _connection(self) -> PooledSMTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = PooledSMTPConnection(self.engine)
+            self._connections.append(connection)
+        return connection
+
+    def _group(self, rows: List[dict]) -> List[List[dict]]:
+        """One group per email: assignment rows for the same NGO share a digest"""
+        if self.digest_window <= 0:
+            return [[row] for row in rows]
+        groups: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            groups.setdefault(digest_key(row), []).append(row)
+        return list(groups.values())
+
+    def _build(self, group: List[dict]):
+        first = group[0]
+        if len(group) == 1:
+            return BUILDERS[first["kind"]](first["payload"])
+        return build_ngo_digest(first["recipient"], first["payload"]["ngo_name"], [row["payload"] for row in group])
+
+    def _deliver(self, groups: List[List[dict]]) -> List[Tuple[dict, bool, str]]:
+        results = []
+        ready, messages = [], []
+        for group in groups:
+            try:
+                messages.append(self._build(group))
+                ready.append(group)
+            except Exception as e:
+                results.extend((row, False, f"Could not build message: {e}") for row in group)
+        if not settings.EMAIL_ENABLED:
+            for group, message in zip(ready, messages):
+                logger.info(f"Email notification would be sent to {group[0]['recipient']}: {message['Subject']}")
+            return results + [(row, True, None) for group in ready for row in group]
+        outcomes = self.engine.send_batch(self._connection(), messages)
+        for group, ok in zip(ready, outcomes):
+            results.extend((row, ok, None if ok else "SMTP delivery failed") for row in group)
+        return results
+
+    def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows claimed"""
+        db = SessionLocal()
+        try:
+            rows = claim_batch(db, self.batch_size, settings.OUTBOX_LEASE_SECONDS, self.digest_window)
+            if not rows:
+                return 0
+            # Round-robin the emails so each thread sends its share over one connection
+            groups = self._group(rows)
+            chunks = [groups[i::self.concurrency] for i in range(self.concurrency)]
+            results = []
+            for chunk_results in self._executor.map(self._deliver, [chunk for chunk in chunks if chunk]):
+                results.extend(chunk_results)
+            record_results(
+                db, results, settings.OUTBOX_MAX_ATTEMPTS,
+                settings.OUTBOX_BACKOFF_BASE_SECONDS, settings.OUTBOX_BACKOFF_MAX_SECONDS
+            )
+            sent = sum(1 for _, ok, _ in results if ok)
+            logger.info(f"Outbox batch: {len(groups)} emails for {len(rows)} rows, {sent} rows sent, {len(results) - sent} failed")
+            return len(rows)
+        finally:
+            db.close()
+
+    def run(self):
+        while True:
+            try:
+                claimed = self.run_once()
+            except Exception:
+                logger.exception("Outbox batch failed")
+                claimed = 0
+            # Keep draining while there is a backlog; poll only when idle
+            if claimed < self.batch_size:
+                time.sleep(self.poll_interval)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for connection in self._connections:
+            connection.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deliver queued notifications")
+    parser.add_argument("--once", action="store_true", help="Deliver one batch and exit")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.OUTBOX_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=settings.OUTBOX_POLL_INTERVAL_SECONDS)
+    parser.add_argument("--digest-window", type=float, default=settings.NOTIFICATION_DIGEST_WINDOW_SECONDS,
+                        help="Seconds to gather an NGO's notifications into one email; 0 disables digests")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = OutboxWorker(args.batch_size, args.concurrency, args.poll_interval, args.digest_window)
+    try:
+        if args.once:
+            worker.run_once()
+        else:
+            worker.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.close()
+
+if __name__ == "__main__":
+    main()
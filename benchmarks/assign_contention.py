@@ -0,0 +1,132 @@
+# benchmarks/assign_contention.py
+"""
+Race several workers assigning the same pending donations and count double
+assignments, for the old read-check-write path and the single conditional
+UPDATE.
+
+    python -m benchmarks.assign_contention --donations 500 --workers 8
+
+Every worker walks the same donations in the same order, each trying to
+hand them to its own NGO, so almost every assignment is contended. Runs
+against DATABASE_URL and deletes the rows it created afterwards.
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import Integer
+
+from app.core.database import SessionLocal
+from app.models.donation import Donation, DonationStatus, DonationType
+from app.models.ngo import NGO
+from app.models.outbox import NotificationOutbox
+from app.services.assignment_service import assignment_statement
+
+POINT = "SRID=4326;POINT(-122.42 37.77)"
+
+def setup(donations: int, workers: int) -> tuple:
+    db = SessionLocal()
+    try:
+        ngos = [
+            NGO(name=f"Contention NGO {i}", address="1 Bench St", email=f"bench{i}@example.org", location=POINT)
+            for i in range(workers)
+        ]
+        items = [
+            Donation(
+                title=f"Contended donation {i}", donation_type=DonationType.OTHER, donor_name="Bench Donor",
+                donor_email="bench@example.com", address="1 Bench St", location=POINT, status=DonationStatus.PENDING
+            )
+            for i in range(donations)
+        ]
+        db.add_all(ngos + items)
+        db.commit()
+        return [ngo.id for ngo in ngos], [item.id for item in items]
+    finally:
+        db.close()
+
+def reset(donation_ids: list):
+    db = SessionLocal()
+    try:
+        db.query(Donation).filter(Donation.id.in_(donation_ids)).update(
+            {Donation.status: DonationStatus.PENDING, Donation.ngo_id: None}, synchronize_session=False
+        )
+        db.query(NotificationOutbox).filter(
+            NotificationOutbox.payload["donation_id"].astext.cast(Integer).in_(donation_ids)
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def teardown(ngo_ids: list, donation_ids: list):
+    reset(donation_ids)
+    db = SessionLocal()
+    try:
+        db.query(Donation).filter(Donation.id.in_(donation_ids)).delete(synchronize_session=False)
+        db.query(NGO).filter(NGO.id.in_(ngo_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def assign_read_check_write(db, donation_id: int, ngo_id: int) -> bool:
+    """The previous assign_donation: SELECT, SELECT, check, UPDATE, commit"""
+    donation = db.query(Donation).filter(Donation.id == donation_id).first()
+    if donation is None or donation.status != DonationStatus.PENDING:
+        return False
+    ngo = db.query(NGO).filter(NGO.id == ngo_id).first()
+    if ngo is None or not ngo.is_available:
+        return False
+    donation.ngo_id = ngo.id
+    donation.status = DonationStatus.ASSIGNED
+    db.commit()
+    return True
+
+def assign_atomic(db, donation_id: int, ngo_id: int) -> bool:
+    row = db.execute(assignment_statement([(donation_id, ngo_id)])).first()
+    db.commit()
+    return row is not None
+
+def race(assign, ngo_ids: list, donation_ids: list) -> tuple:
+    wins = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(ngo_ids))
+
+    def worker(ngo_id: int):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            for donation_id in donation_ids:
+                if assign(db, donation_id, ngo_id):
+                    with lock:
+                        wins[donation_id] += 1
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker, args=(ngo_id,)) for ngo_id in ngo_ids]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, wins
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--donations", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    ngo_ids, donation_ids = setup(args.donations, args.workers)
+    try:
+        for name, assign in (("read-check-write", assign_read_check_write), ("atomic", assign_atomic)):
+            reset(donation_ids)
+            elapsed, wins = race(assign, ngo_ids, donation_ids)
+            attempts = args.donations * args.workers
+            doubles = sum(1 for count in wins.values() if count > 1)
+            print(
+                f"{name:>16}: {attempts} attempts in {elapsed:.2f} s ({attempts / elapsed:,.0f}/s), "
+                f"{sum(wins.values())} reported successes, {len(wins)} donations assigned, "
+                f"{doubles} double-assigned"
+            )
+    finally:
+        teardown(ngo_ids, donation_ids)
@@ -0,0 +1,78 @@
+# benchmarks/bulk_create.py
+"""
+Compare per-row ORM inserts with the bulk create path for a batch of donations.
+
+    python -m benchmarks.bulk_create --rows 10000
+
+Runs against DATABASE_URL and deletes the rows it created afterwards. No
+reference numbers are recorded here; take them on the target database.
+"""
+import argparse
+import random
+import time
+
+from app.core.database import SessionLocal
+from app.models.donation import Donation
+from app.routers.donations import donation_values
+from app.schemas.donation import DonationCreate
+from app.services.bulk_service import bulk_insert, validate_items
+
+def make_items(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"Benchmark donation {i}",
+            "donation_type": rng.choice(["clothing", "food", "books", "toys"]),
+            "donor_name": "Bench Donor",
+            "donor_email": "bench@example.com",
+            "address": f"{i} Benchmark St",
+            "location": {"type": "Point", "coordinates": [-122.4 + rng.random() * 0.2, 37.7 + rng.random() * 0.2]},
+        }
+        for i in range(count)
+    ]
+
+def run_per_row(items: list) -> tuple:
+    db = SessionLocal()
+    ids = []
+    start = time.perf_counter()
+    try:
+        for item in items:
+            donation = Donation(**donation_values(DonationCreate.parse_obj(item)))
+            db.add(donation)
+            db.commit()
+            db.refresh(donation)
+            ids.append(donation.id)
+    finally:
+        elapsed = time.perf_counter() - start
+        db.query(Donation).filter(Donation.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+    return elapsed, len(ids)
+
+def run_bulk(items: list) -> tuple:
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        rows, errors = validate_items(items, DonationCreate, donation_values)
+        result = bulk_insert(db, Donation, rows, errors)
+    finally:
+        elapsed = time.perf_counter() - start
+    ids = [item["id"] for item in result["results"] if item.get("id")]
+    db.query(Donation).filter(Donation.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    db.close()
+    return elapsed, result["created"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--skip-per-row", action="store_true", help="Only time the bulk path")
+    args = parser.parse_args()
+
+    items = make_items(args.rows)
+    runs = [("bulk", run_bulk)]
+    if not args.skip_per_row:
+        runs.insert(0, ("per-row", run_per_row))
+    for name, run in runs:
+        elapsed, created = run(items)
+        print(f"{name:>8}: {created} rows in {elapsed:.2f} s ({created / elapsed:,.0f} rows/s)")
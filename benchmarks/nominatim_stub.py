@@ -0,0 +1,62 @@
+# benchmarks/nominatim_stub.py
+"""
+Minimal stand-in for Nominatim's /reverse and /search endpoints.
+
+    python -m benchmarks.nominatim_stub --port 8089 --latency-ms 50
+    NOMINATIM_BASE_URL=http://localhost:8089 uvicorn app.main:app
+
+Responses are synthesized from the coordinates so repeated lookups are
+stable. /stats reports how many upstream calls actually arrived, which is
+what the cache and request coalescing are meant to reduce.
+"""
+import argparse
+import asyncio
+from aiohttp import web
+
+def build_app(latency: float) -> web.Application:
+    counters = {"reverse": 0, "search": 0}
+
+    async def reverse(request: web.Request):
+        counters["reverse"] += 1
+        await asyncio.sleep(latency)
+        lat = float(request.query["lat"])
+        lon = float(request.query["lon"])
+        return web.json_response({
+            "lat": str(lat),
+            "lon": str(lon),
+            "display_name": f"{abs(int(lat * 1000)) % 999} Stub Street, Stubville",
+            "address": {
+                "house_number": str(abs(int(lat * 1000)) % 999),
+                "road": "Stub Street",
+                "city": "Stubville",
+                "postcode": f"{abs(int(lon * 100)) % 99999:05d}",
+                "country": "Stubland",
+            },
+        })
+
+    async def search(request: web.Request):
+        counters["search"] += 1
+        await asyncio.sleep(latency)
+        q = request.query.get("q", "")
+        seed = sum(map(ord, q))
+        return web.json_response([{
+            "lat": str(37.0 + (seed % 1000) / 1000),
+            "lon": str(-122.0 - (seed % 997) / 1000),
+            "display_name": q,
+        }])
+
+    async def stats(request: web.Request):
+        return web.json_response(counters)
+
+    app = web.Application()
+    app.router.add_get("/reverse", reverse)
+    app.router.add_get("/search", search)
+    app.router.add_get("/stats", stats)
+    return app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    web.run_app(build_app(args.latency_ms / 1000), port=args.port)
@@ -0,0 +1,62 @@
+# benchmarks/smtp_delivery.py
+"""
+Compare one SMTP connection per email with the delivery engine over one pooled connection.
+
+    python -m aiosmtpd -n -l localhost:8025 &
+    SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_TLS=False python -m benchmarks.smtp_delivery --messages 1000
+
+Uses the SMTP_* settings, so it can also be pointed at a staging relay.
+"""
+import argparse
+import smtplib
+import time
+
+from app.core.config import settings
+from app.services.mail_delivery import MailDeliveryEngine, PooledSMTPConnection
+from app.services.notification_service import build_ngo_notification
+
+def make_messages(count: int) -> list:
+    return [
+        build_ngo_notification(f"ngo{i}@example.org", f"Bench NGO {i}", i, f"Benchmark donation {i}", "Bench Donor")
+        for i in range(count)
+    ]
+
+def run_per_message(messages: list) -> float:
+    """What send_ngo_notification used to do: connect, STARTTLS and log in for every email"""
+    start = time.perf_counter()
+    for message in messages:
+        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
+            if settings.SMTP_TLS:
+                server.starttls()
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+            server.send_message(message)
+    return time.perf_counter() - start
+
+engine = MailDeliveryEngine.from_settings()
+
+def run_pooled(messages: list) -> float:
+    """What the outbox worker does per thread: one connection, messages sent in batches"""
+    connection = PooledSMTPConnection(engine)
+    start = time.perf_counter()
+    try:
+        for i in range(0, len(messages), settings.OUTBOX_BATCH_SIZE):
+            engine.send_batch(connection, messages[i:i + settings.OUTBOX_BATCH_SIZE])
+    finally:
+        connection.close()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--skip-per-message", action="store_true", help="Only time the pooled connection")
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    runs = [("pooled", run_pooled)]
+    if not args.skip_per_message:
+        runs.insert(0, ("per-message", run_per_message))
+    for name, run in runs:
+        elapsed = run(messages)
+        print(f"{name:>11}: {len(messages)} emails in {elapsed:.2f} s ({len(messages) / elapsed:,.0f} emails/s)")
+    print(f"engine stats: {engine.stats}")
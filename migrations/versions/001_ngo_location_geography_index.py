@@ -0,0 +1,36 @@
+"""Geography GIST index for nearby NGO search
+
+Revision ID: 001_ngo_geog_index
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '001_ngo_geog_index'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expression index matching geography(location) in the nearby queries,
+    # so ST_DWithin and <-> KNN ordering are answered from the index
+    op.create_index(
+        'idx_ngo_location_geography',
+        'ngos',
+        [sa.text('geography(location)')],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_ngo_location_geography', table_name='ngos')
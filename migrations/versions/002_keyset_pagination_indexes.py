@@ -0,0 +1,31 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 002_keyset_indexes
+Revises: 001_ngo_geog_index
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_keyset_indexes'
+down_revision: Union[str, None] = '001_ngo_geog_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_donations_created_at_id', 'donations', ['created_at', 'id'], unique=False)
+    op.create_index('ix_donations_status_created_at_id', 'donations', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_ngos_created_at_id', 'ngos', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ngos_created_at_id', table_name='ngos')
+    op.drop_index('ix_donations_status_created_at_id', table_name='donations')
+    op.drop_index('ix_donations_created_at_id', table_name='donations')
@@ -0,0 +1,32 @@
+"""Geocoding verification columns on donations and NGOs
+
+Revision ID: 003_geocode_columns
+Revises: 002_keyset_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_geocode_columns'
+down_revision: Union[str, None] = '002_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('donations', 'ngos'):
+        op.add_column(table, sa.Column('geocode_status', sa.String(length=20), nullable=True))
+        op.add_column(table, sa.Column('geocoded_address', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('donations', 'ngos'):
+        op.drop_column(table, 'geocoded_address')
+        op.drop_column(table, 'geocode_status')
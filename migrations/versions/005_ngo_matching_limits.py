@@ -0,0 +1,31 @@
+"""NGO capacity and accepted donation types for auto-matching
+
+Revision ID: 005_ngo_matching_limits
+Revises: 004_notification_outbox
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_ngo_matching_limits'
+down_revision: Union[str, None] = '004_notification_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ngos', sa.Column('capacity', sa.Integer(), nullable=True))
+    op.add_column('ngos', sa.Column('accepted_donation_types', postgresql.ARRAY(sa.String(length=20)), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('ngos', 'accepted_donation_types')
+    op.drop_column('ngos', 'capacity')
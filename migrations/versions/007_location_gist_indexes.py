@@ -0,0 +1,32 @@
+"""Plain geometry GIST indexes for vector tile bounding-box queries
+
+Revision ID: 007_location_gist_indexes
+Revises: 006_donation_stats
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_location_gist_indexes'
+down_revision: Union[str, None] = '006_donation_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tiles filter with location && <bounds>, which the geography expression
+    # index cannot answer. Names match the ones geoalchemy2 gives these
+    # indexes in create_all, so databases created that way are left as is.
+    op.execute("CREATE INDEX IF NOT EXISTS idx_donations_location ON donations USING gist (location)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_ngos_location ON ngos USING gist (location)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_ngos_location")
+    op.execute("DROP INDEX IF EXISTS idx_donations_location")
@@ -0,0 +1,57 @@
+"""Generated tsvector columns and GIN indexes for full-text search
+
+Revision ID: 008_full_text_search
+Revises: 007_location_gist_indexes
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_full_text_search'
+down_revision: Union[str, None] = '007_location_gist_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SEARCH_CONFIG and the Computed expressions in app/models
+SEARCH_VECTORS = {
+    'ngos': ('name', 'description'),
+    'donations': ('title', 'description'),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated columns (Postgres 12+) are filled for existing rows by the
+    # table rewrite and kept in sync on every insert and update
+    for table, (primary, secondary) in SEARCH_VECTORS.items():
+        expression = (
+            f"setweight(to_tsvector('english'::regconfig, coalesce({primary}, '')), 'A') || "
+            f"setweight(to_tsvector('english'::regconfig, coalesce({secondary}, '')), 'B')"
+        )
+        op.add_column(
+            table,
+            sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True)
+        )
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin')
+    # Radius filter of the donation search
+    op.create_index(
+        'idx_donation_location_geography',
+        'donations',
+        [sa.text('geography(location)')],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_donation_location_geography', table_name='donations')
+    for table in reversed(list(SEARCH_VECTORS)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,55 @@
+"""Append-only deltas for the donation summary tables
+
+Revision ID: 009_donation_stats_deltas
+Revises: 008_full_text_search
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_donation_stats_deltas'
+down_revision: Union[str, None] = '008_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The enum types already exist for the donations table
+donation_status = postgresql.ENUM(name='donationstatus', create_type=False)
+donation_type = postgresql.ENUM(name='donationtype', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'donation_stats_deltas',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', donation_status, nullable=False),
+        sa.Column('donation_type', donation_type, nullable=False),
+        sa.Column('ngo_id', sa.Integer(), nullable=True),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold anything still pending into the summaries before dropping it
+    op.execute(
+        "INSERT INTO donation_stats (status, donation_type, ngo_id, count) "
+        "SELECT status, donation_type, coalesce(ngo_id, 0), sum(delta) FROM donation_stats_deltas "
+        "GROUP BY 1, 2, 3 "
+        "ON CONFLICT (status, donation_type, ngo_id) DO UPDATE SET count = donation_stats.count + excluded.count"
+    )
+    op.execute(
+        "INSERT INTO donation_daily_stats (day, status, donation_type, count) "
+        "SELECT day, status, donation_type, sum(delta) FROM donation_stats_deltas "
+        "GROUP BY 1, 2, 3 "
+        "ON CONFLICT (day, status, donation_type) DO UPDATE SET count = donation_daily_stats.count + excluded.count"
+    )
+    op.drop_table('donation_stats_deltas')
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.models.donation import DonationStatus, DonationType
+from app.schemas.donation import DonationUpdate
+from app.services.stats_service import StatsRollup, record_change, rollup
+
+DAY = date(2026, 10, 17)
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def scalar(self):
+        return 1
+
+    def commit(self):
+        pass
+
+@pytest.mark.parametrize("field", ["status", "donation_type"])
+def test_update_rejects_null_status_and_type(field):
+    with pytest.raises(ValidationError):
+        DonationUpdate(**{field: None})
+
+def test_update_allows_omitting_status_and_type():
+    update = DonationUpdate(title="Winter coats")
+    assert update.dict(exclude_unset=True) == {"title": "Winter coats"}
+
+def test_record_change_ignores_rows_without_status():
+    db = RecordingSession()
+    record_change(db, (DAY, None, DonationType.FOOD, None), (DAY, None, DonationType.FOOD, 3))
+    assert db.statements == []
+
+def test_record_change_counts_the_side_with_status():
+    db = RecordingSession()
+    record_change(db, (DAY, None, DonationType.FOOD, None), (DAY, DonationStatus.PENDING, DonationType.FOOD, None))
+    assert len(db.statements) == 1
+
+def test_record_change_skips_unchanged_keys():
+    db = RecordingSession()
+    key = (DAY, DonationStatus.ASSIGNED, DonationType.BOOKS, 7)
+    record_change(db, key, key)
+    assert db.statements == []
+
+def test_rollup_applies_the_deltas_it_deletes():
+    db = RecordingSession()
+    assert rollup(db) == 1
+    sql = str(db.statements[-1].compile(dialect=postgresql.dialect()))
+    assert "counted AS" in sql
+    assert "counted_daily AS" in sql
+
+def test_stats_rollup_runs_until_stopped():
+    rollup = StatsRollup(0.01)
+    calls = []
+    rollup.run_once = lambda: calls.append(1) or 1
+
+    async def scenario():
+        await rollup.start()
+        await asyncio.sleep(0.1)
+        await rollup.stop()
+
+    asyncio.run(scenario())
+    assert len(calls) >= 2
+    stopped_at = len(calls)
+    asyncio.run(asyncio.sleep(0.03))
+    assert len(calls) == stopped_at
+
+def test_stats_rollup_disabled_with_zero_interval():
+    rollup = StatsRollup(0)
+    asyncio.run(rollup.start())
+    assert rollup._task is None
@@ -0,0 +1,46 @@
+import math
+import random
+
+from app.services.gazetteer import EARTH_RADIUS_KM, Gazetteer
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def gazetteer(places, max_distance_km=50):
+    built = Gazetteer(path=None, max_distance_km=max_distance_km)
+    built._build(places)
+    return built
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(17)
+    places = [
+        (rng.uniform(-90, 90), rng.uniform(-180, 180), f"Place {i}", {"city": f"Place {i}"})
+        for i in range(2000)
+    ]
+    built = gazetteer(places)
+    for _ in range(300):
+        lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        position, distance_km = built.nearest(lat, lng)
+        expected = min(places, key=lambda place: haversine_km(lat, lng, place[0], place[1]))
+        assert built._names[position] == expected[2]
+        assert math.isclose(distance_km, haversine_km(lat, lng, expected[0], expected[1]), abs_tol=1e-6)
+
+def test_nearest_across_the_antimeridian():
+    built = gazetteer([(-17.7, 178.4, "Suva", {"city": "Suva"}), (-17.7, 170.0, "Far", {"city": "Far"})])
+    position, distance_km = built.nearest(-17.7, -179.9)
+    assert built._names[position] == "Suva"
+    assert distance_km < 300
+
+def test_reverse_formats_the_address_and_respects_max_distance():
+    built = gazetteer([(50.85, 4.35, "", {"city": "Brussels", "country": "Belgium", "country_code": "be"})])
+    assert built.reverse(50.86, 4.36) == {
+        "display_name": "Brussels, Belgium",
+        "address": {"city": "Brussels", "country": "Belgium", "country_code": "be"},
+    }
+    assert built.reverse(48.85, 2.35) is None
+    assert (built.stats["hits"], built.stats["low_confidence"]) == (1, 1)
+
+def test_empty_gazetteer_has_no_nearest_place():
+    assert gazetteer([]).nearest(0, 0) is None
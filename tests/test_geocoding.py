@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import geocoding_cache as geocoding_cache_module, geocoding_service
+from app.services.geocoding_cache import CachedFailure, GeocodingCache
+from app.services.geocoding_client import NominatimClient, TokenBucket, UpstreamError
+
+ADDRESS = "1 Main Street"
+ADDRESS_KEY = "search:1 main street"
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = GeocodingCache(precision=4, max_entries=100, ttl=60, negative_ttl=30)
+    monkeypatch.setattr(geocoding_service, "geocoding_cache", cache)
+    return cache
+
+def search_raising(error):
+    async def search(query, background=False):
+        raise error
+    return search
+
+@pytest.mark.parametrize("error", [
+    HTTPException(status_code=503, detail="Geocoding service is busy, try again later"),
+    HTTPException(status_code=504, detail="Geocoding service timed out"),
+    HTTPException(status_code=502, detail="Geocoding service unavailable"),
+    UpstreamError(status_code=429, detail="Too many requests"),
+])
+def test_local_and_transient_failures_are_not_cached(cache, monkeypatch, error):
+    monkeypatch.setattr(geocoding_service.nominatim_client, "search", search_raising(error))
+    with pytest.raises(HTTPException):
+        asyncio.run(geocoding_service.forward_geocode(ADDRESS))
+    assert asyncio.run(cache.get(ADDRESS_KEY)) is None
+
+def test_upstream_errors_are_cached(cache, monkeypatch):
+    error = UpstreamError(status_code=400, detail="Failed to retrieve coordinates for address")
+    monkeypatch.setattr(geocoding_service.nominatim_client, "search", search_raising(error))
+    with pytest.raises(HTTPException):
+        asyncio.run(geocoding_service.forward_geocode(ADDRESS))
+    cached = asyncio.run(cache.get(ADDRESS_KEY))
+    assert isinstance(cached, CachedFailure)
+    assert cached.status_code == 400
+
+def client(max_wait=0.05, timeout=0.05):
+    return NominatimClient(
+        base_url="http://nominatim.invalid",
+        user_agent="tests",
+        timeout=timeout,
+        max_connections=1,
+        max_concurrency=1,
+        rate_limiter=TokenBucket(0, 1),
+        max_wait=max_wait
+    )
+
+def test_interactive_caller_joining_a_background_lookup_is_bounded():
+    nominatim = client()
+
+    async def scenario():
+        stalled = asyncio.get_running_loop().create_future()
+        background = asyncio.ensure_future(nominatim._single_flight("search:x", lambda: stalled, True))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await nominatim._single_flight("search:x", lambda: stalled, False)
+        assert error.value.status_code == 503
+        # The shared lookup keeps going for the background caller
+        assert not background.done()
+        stalled.set_result([{"lat": "1", "lon": "2"}])
+        assert await background == [{"lat": "1", "lon": "2"}]
+
+    asyncio.run(scenario())
+    assert nominatim.stats["coalesced"] == 1
+
+def test_callers_share_one_lookup():
+    nominatim = client()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"display_name": "Somewhere"}
+
+    async def scenario():
+        return await asyncio.gather(*(nominatim._single_flight("reverse:1,2", fetch, False) for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [{"display_name": "Somewhere"}] * 3
+    assert len(calls) == 1
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(geocoding_cache_module, "time", clock)
+    return clock
+
+def test_cache_entries_expire_after_ttl(cache, clock):
+    asyncio.run(cache.set("1.0000,2.0000", {"display_name": "Somewhere"}))
+    clock.now += 59
+    assert asyncio.run(cache.get("1.0000,2.0000")) == {"display_name": "Somewhere"}
+    clock.now += 2
+    assert asyncio.run(cache.get("1.0000,2.0000")) is None
+    assert cache.stats["expirations"] == 1
+
+def test_failures_expire_after_negative_ttl(cache, clock):
+    cache.set_failure(ADDRESS_KEY, 400, "Failed to retrieve coordinates for address")
+    clock.now += 29
+    assert isinstance(asyncio.run(cache.get(ADDRESS_KEY)), CachedFailure)
+    clock.now += 2
+    assert asyncio.run(cache.get(ADDRESS_KEY)) is None
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = GeocodingCache(precision=4, max_entries=2, ttl=60, negative_ttl=30)
+
+    async def scenario():
+        await cache.set("a", {"n": 1})
+        await cache.set("b", {"n": 2})
+        await cache.get("a")
+        await cache.set("c", {"n": 3})
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [{"n": 1}, None, {"n": 3}]
+    assert cache.stats["evictions"] == 1
+
+def test_cache_key_quantizes_coordinates(cache):
+    assert cache.key(50.850012, 4.351709) == cache.key(50.849996, 4.351694) == "50.8500,4.3517"
+
+def test_token_bucket_serves_interactive_callers_first():
+    bucket = TokenBucket(rate=50, capacity=1)
+    order = []
+
+    async def take(name, background):
+        await bucket.acquire(background=background)
+        order.append(name)
+
+    async def scenario():
+        await bucket.acquire()
+        # The backlog is already waiting when the user request arrives
+        backlog = [asyncio.ensure_future(take("background", True)) for _ in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.gather(take("interactive", False), *backlog)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "background", "background", "background"]
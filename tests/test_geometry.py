@@ -0,0 +1,46 @@
+import struct
+
+import pytest
+
+from app.core.geometry import EWKB_SRID_FLAG, EWKB_Z_FLAG, GeometryDecodeError, decode_point, point_to_geojson
+
+def wkb(geom_type, *coords, endian="<", srid=None):
+    data = struct.pack(endian + "BI", 1 if endian == "<" else 0, geom_type)
+    if srid is not None:
+        data += struct.pack(endian + "I", srid)
+    return data + struct.pack(endian + "d" * len(coords), *coords)
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_decode_point_in_either_byte_order(endian):
+    assert decode_point(wkb(1, 4.35, 50.85, endian=endian)) == (4.35, 50.85)
+
+def test_decode_point_skips_the_ewkb_srid():
+    assert decode_point(wkb(1 | EWKB_SRID_FLAG, 4.35, 50.85, srid=4326)) == (4.35, 50.85)
+
+@pytest.mark.parametrize("geom_type", [1001, 1 | EWKB_Z_FLAG])
+def test_decode_point_ignores_z(geom_type):
+    assert decode_point(wkb(geom_type, 4.35, 50.85, 12.0)) == (4.35, 50.85)
+
+def test_decode_point_accepts_hex_and_memoryview():
+    data = wkb(1 | EWKB_SRID_FLAG, -73.98, 40.75, srid=4326)
+    assert decode_point(data.hex()) == (-73.98, 40.75)
+    assert decode_point(memoryview(data)) == (-73.98, 40.75)
+
+def test_empty_and_null_points_decode_to_none():
+    assert decode_point(wkb(1, float("nan"), float("nan"))) is None
+    assert decode_point(None) is None
+    assert point_to_geojson(wkb(1, float("nan"), float("nan"))) is None
+
+def test_point_to_geojson():
+    assert point_to_geojson(wkb(1, 4.35, 50.85)) == {"type": "Point", "coordinates": [4.35, 50.85]}
+
+@pytest.mark.parametrize("value", [
+    wkb(2, 0.0, 0.0, 1.0, 1.0),
+    wkb(1, 4.35),
+    b"\x01\x01",
+    "not hex",
+    42,
+])
+def test_invalid_geometries_are_rejected(value):
+    with pytest.raises(GeometryDecodeError):
+        decode_point(value)
@@ -0,0 +1,84 @@
+import math
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.donation import DonationType
+from app.services.assignment_service import assignment_statement
+from app.services.matching_service import DONATION_TYPES, plan_assignments
+from app.services.ngo_catalog import EARTH_RADIUS_KM
+
+FOOD = DONATION_TYPES.index(DonationType.FOOD)
+BOOKS = DONATION_TYPES.index(DonationType.BOOKS)
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def accepts(*rows):
+    matrix = np.zeros((len(rows), len(DONATION_TYPES)), dtype=bool)
+    for ngo, types in enumerate(rows):
+        matrix[ngo, types] = True
+    return matrix
+
+def plan(donations, ngos, capacity, ngo_accepts, max_distance_km=25, candidates=4):
+    donation_lat, donation_lng, donation_type = (np.array(column) for column in zip(*donations))
+    ngo_lat, ngo_lng = (np.array(column) for column in zip(*ngos))
+    rows, cols, distances = plan_assignments(
+        donation_lat, donation_lng, donation_type,
+        ngo_lat, ngo_lng, np.array(capacity), ngo_accepts,
+        max_distance_km, candidates
+    )
+    return dict(zip(rows.tolist(), cols.tolist())), distances
+
+def test_assignment_statement_queues_notifications_and_stats():
+    sql = compiled(assignment_statement([(1, 7), (2, 8)]))
+    assert "queued AS" in sql
+    assert "counted AS" in sql
+
+def test_full_ngos_overflow_to_the_next_nearest():
+    donations = [(50.850, 4.350, FOOD), (50.851, 4.351, FOOD), (50.852, 4.352, FOOD)]
+    ngos = [(50.850, 4.351), (50.900, 4.400)]
+    matches, _ = plan(donations, ngos, [2, -1], accepts([FOOD], [FOOD]))
+    assert matches == {0: 0, 1: 0, 2: 1}
+
+def test_donations_only_go_to_ngos_that_accept_their_type():
+    donations = [(50.850, 4.350, FOOD), (50.850, 4.350, BOOKS)]
+    ngos = [(50.850, 4.350), (50.870, 4.370)]
+    matches, _ = plan(donations, ngos, [-1, -1], accepts([FOOD], [BOOKS]))
+    assert matches == {0: 0, 1: 1}
+
+def test_donations_out_of_range_stay_unmatched():
+    donations = [(50.850, 4.350, FOOD), (48.850, 2.350, FOOD)]
+    matches, distances = plan(donations, [(50.850, 4.351)], [-1], accepts([FOOD]))
+    assert matches == {0: 0}
+    assert distances.tolist() == pytest.approx([haversine_km(50.850, 4.350, 50.850, 4.351)])
+
+def test_plan_matches_greedy_nearest_first():
+    rng = random.Random(17)
+    donations = [(rng.uniform(50.7, 51.0), rng.uniform(4.2, 4.5), rng.choice([FOOD, BOOKS])) for _ in range(60)]
+    ngos = [(rng.uniform(50.7, 51.0), rng.uniform(4.2, 4.5)) for _ in range(8)]
+    capacity = [rng.randint(1, 8) for _ in ngos]
+    ngo_accepts = accepts(*(rng.choice([[FOOD], [BOOKS], [FOOD, BOOKS]]) for _ in ngos))
+
+    # With every NGO a candidate, one round is the plain greedy matching
+    edges = sorted(
+        (haversine_km(d[0], d[1], n[0], n[1]), i, j)
+        for i, d in enumerate(donations)
+        for j, n in enumerate(ngos)
+        if ngo_accepts[j, d[2]]
+    )
+    expected, remaining = {}, list(capacity)
+    for distance, i, j in edges:
+        if distance <= 25 and i not in expected and remaining[j] > 0:
+            expected[i] = j
+            remaining[j] -= 1
+
+    matches, _ = plan(donations, ngos, capacity, ngo_accepts, candidates=len(ngos))
+    assert matches == expected
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from app.models.outbox import OutboxStatus
+from app.services.outbox_service import NGO_ASSIGNMENT, digest_key, record_results, retry_delay
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement):
+        self.statements.append(statement.compile().params)
+
+    def commit(self):
+        self.commits += 1
+
+def assignment(row_id, ngo_id, recipient="ngo@example.org", attempts=1):
+    payload = {"ngo_id": ngo_id, "ngo_email": recipient, "ngo_name": "Food Bank", "donation_id": row_id}
+    return {"id": row_id, "kind": NGO_ASSIGNMENT, "recipient": recipient, "payload": payload, "attempts": attempts}
+
+def test_digest_key_groups_assignments_by_ngo():
+    # Two NGOs sharing a contact address still get separate digests
+    assert digest_key(assignment(1, 7)) == digest_key(assignment(2, 7, "new@example.org"))
+    assert digest_key(assignment(1, 7)) != digest_key(assignment(2, 8))
+
+def test_digest_key_keeps_other_kinds_apart():
+    first = {"id": 1, "kind": "donor_receipt", "recipient": "donor@example.org", "payload": {}}
+    second = {**first, "id": 2}
+    assert digest_key(first) != digest_key(second)
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert [retry_delay(attempts, 30, 3600) for attempts in range(1, 10)] == [
+        30, 60, 120, 240, 480, 960, 1920, 3600, 3600
+    ]
+
+def test_record_results_marks_sent_rows_in_one_statement():
+    db = RecordingSession()
+    record_results(db, [(assignment(1, 7), True, None), (assignment(2, 8), True, None)], 8, 30, 3600)
+    (params,) = db.statements
+    assert params["status"] == OutboxStatus.SENT
+    assert [1, 2] in params.values()
+    assert db.commits == 1
+
+def test_record_results_reschedules_failures_with_backoff():
+    db = RecordingSession()
+    record_results(db, [(assignment(1, 7, attempts=3), False, "SMTP delivery failed")], 8, 30, 3600)
+    (params,) = db.statements
+    assert "status" not in params
+    assert params["last_error"] == "SMTP delivery failed"
+    assert timedelta(seconds=120) in params.values()
+
+def test_record_results_gives_up_after_max_attempts():
+    db = RecordingSession()
+    record_results(db, [(assignment(1, 7, attempts=8), False, "SMTP delivery failed")], 8, 30, 3600)
+    (params,) = db.statements
+    assert params["status"] == OutboxStatus.FAILED
+    assert not any(isinstance(value, timedelta) for value in params.values())
@@ -0,0 +1,29 @@
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+def encoded(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encoded(b"not json"),
+    encoded(b'{"c":"2026-10-17T09:30:15"}'),
+    encoded(b'{"c":"yesterday","i":1}'),
+    encoded(b'{"c":"2026-10-17T09:30:15","i":"x"}'),
+    encoded(b'["2026-10-17T09:30:15",1]'),
+])
+def test_tampered_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
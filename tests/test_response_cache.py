@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from app.services import response_cache as response_cache_module
+from app.services.response_cache import DONATIONS, NGOS, ResponseCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache_module, "time", clock)
+    return clock
+
+def cache(max_entries=100, grid_degrees=0.0):
+    return ResponseCache(enabled=True, max_entries=max_entries, memory_ttl=5, shared_ttl=60, grid_degrees=grid_degrees)
+
+def test_stored_responses_are_served_until_they_expire(clock):
+    responses = cache()
+    responses.store(responses.key("ngos", [NGOS], skip=0, limit=10), [{"id": 1}])
+    hit = responses.get(responses.key("ngos", [NGOS], limit=10, skip=0))
+    assert hit.body == b'[{"id":1}]'
+    clock.now += 6
+    assert responses.get(responses.key("ngos", [NGOS], skip=0, limit=10)) is None
+    assert (responses.stats["memory_hits"], responses.stats["misses"]) == (1, 1)
+
+def test_none_parameters_are_left_out_of_the_key():
+    responses = cache()
+    assert responses.key("ngos", [NGOS], q=None, limit=10).text == responses.key("ngos", [NGOS], limit=10).text
+
+def test_least_recently_used_entries_are_evicted(clock):
+    responses = cache(max_entries=2)
+    responses.store(responses.key("ngos", [NGOS], page=0), [0])
+    responses.store(responses.key("ngos", [NGOS], page=1), [1])
+    responses.get(responses.key("ngos", [NGOS], page=0))
+    responses.store(responses.key("ngos", [NGOS], page=2), [2])
+    assert responses.get(responses.key("ngos", [NGOS], page=1)) is None
+    assert responses.get(responses.key("ngos", [NGOS], page=0)).body == b"[0]"
+    assert responses.stats["evictions"] == 1
+
+def test_invalidation_only_drops_entries_with_the_tag(clock):
+    responses = cache()
+    responses.store(responses.key("ngos", [NGOS]), [])
+    responses.store(responses.key("donations", [DONATIONS]), [])
+    responses.store(responses.key("nearby", [NGOS, DONATIONS]), [])
+    responses.invalidate([DONATIONS])
+    assert responses.get(responses.key("ngos", [NGOS])) is not None
+    assert responses.get(responses.key("donations", [DONATIONS])) is None
+    assert responses.get(responses.key("nearby", [NGOS, DONATIONS])) is None
+
+def test_a_read_that_raced_a_write_is_not_stored(clock):
+    responses = cache()
+    key = responses.key("ngos", [NGOS])
+    responses.invalidate([NGOS])
+    responses.store(key, [{"id": 1, "name": "before the write"}])
+    assert responses.get(responses.key("ngos", [NGOS])) is None
+    assert responses.stats["stale_stores_skipped"] == 1
+
+def test_disabled_cache_never_hits():
+    responses = ResponseCache(enabled=False, max_entries=100, memory_ttl=5, shared_ttl=60, grid_degrees=0)
+    key = responses.key("ngos", [NGOS])
+    responses.store(key, [])
+    assert responses.get(key) is None
+
+def test_snap():
+    assert cache().snap(50.850123) == 50.850123
+    assert cache(grid_degrees=0.001).snap(50.850623) == 50.851